@@ -0,0 +1,219 @@
+"""
+Analyse des séries temporelles - Dashboard Démographique Bénin
+Auteur: Freud GUEDOU
+
+Indicateurs dérivés de séries annuelles : taux de croissance d'une année
+sur l'autre, taux de croissance annuel moyen (TCAM), temps de doublement,
+décomposition de la croissance entre populations urbaine et rurale, et
+prévisions par tendance log-linéaire ou lissage exponentiel de Holt.
+
+Les fonctions opèrent sur des tableaux (..., année) : tout un lot de séries
+(départements × indicateurs, scénarios...) est traité d'un bloc, sans boucle
+Python par série ; seul le lissage de Holt boucle sur les années, pour
+toutes les séries et tous les paramètres candidats à la fois.
+"""
+
+import numpy as np
+import pandas as pd
+
+from cube_kpi import INDEX_CUBE, serie_nationale
+
+HORIZON_DEFAUT = 6  # années de prévision (2024 -> 2030)
+
+# Paramètres de lissage (alpha, beta) candidats : le couple de plus faible erreur
+# de prévision à un an est retenu pour chaque série
+GRILLE_HOLT = np.linspace(0.1, 0.9, 5)
+
+# Indicateurs du cube prévus : colonne -> tendance multiplicative (prévue en logarithme)
+INDICATEURS_PREVISION = {
+    'Population': True,
+    'Densite_km2': True,
+    'Pct_Population_Nationale': False,
+    'Taux_Urbanisation_%': False,
+    'Age_Median_Ans': False,
+}
+
+METHODES_PREVISION = ('holt', 'log_lineaire')
+
+def taux_croissance(valeurs, annees=None):
+    """
+    Taux de croissance (%) depuis l'année précédente, annualisé si des années
+    manquent ; NaN la première année
+    """
+    valeurs = np.asarray(valeurs, dtype=np.float64)
+    ecarts = 1.0 if annees is None else np.diff(np.asarray(annees, dtype=np.float64))
+    taux = np.full(valeurs.shape, np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        taux[..., 1:] = ((valeurs[..., 1:] / valeurs[..., :-1]) ** (1 / ecarts) - 1) * 100
+    return taux
+
+def tcam(valeurs, annees):
+    """
+    Taux de croissance annuel moyen (%) entre la première et la dernière année ;
+    NaN si la période couvre moins de deux années
+    """
+    valeurs = np.asarray(valeurs, dtype=np.float64)
+    duree = float(annees[-1] - annees[0]) if len(annees) >= 2 else 0.0
+    if duree == 0:
+        return np.full(valeurs.shape[:-1], np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return ((valeurs[..., -1] / valeurs[..., 0]) ** (1 / duree) - 1) * 100
+
+def temps_doublement(taux):
+    """
+    Années nécessaires pour doubler à taux annuel constant (%) ; infini si le taux
+    est nul ou négatif
+    """
+    taux = np.asarray(taux, dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(taux > 0, np.log(2) / np.log1p(taux / 100), np.inf)
+
+def decomposer_croissance(urbaine, rurale):
+    """
+    Décompose la croissance annuelle de la population totale (urbaine + rurale) :
+    contributions des populations urbaine et rurale (points de %, leur somme est le
+    taux total) et écart de croissance urbain-rural (points de %).
+    Retourne un dictionnaire de tableaux (NaN la première année)
+    """
+    urbaine = np.asarray(urbaine, dtype=np.float64)
+    rurale = np.asarray(rurale, dtype=np.float64)
+    precedente = (urbaine + rurale)[..., :-1]
+    contributions = {}
+    for nom, serie in (('Contribution_Urbaine_pts', urbaine), ('Contribution_Rurale_pts', rurale)):
+        contribution = np.full(serie.shape, np.nan)
+        contribution[..., 1:] = np.diff(serie, axis=-1) / precedente * 100
+        contributions[nom] = contribution
+    return {
+        'Croissance_Totale_%': taux_croissance(urbaine + rurale),
+        **contributions,
+        'Ecart_Urbain_Rural_pts': taux_croissance(urbaine) - taux_croissance(rurale),
+    }
+
+def _transformer(valeurs, log):
+    """
+    Passe en logarithme les séries à tendance multiplicative (`log` : booléen
+    ou tableau d'une valeur par série) ; celles qui ne sont pas strictement
+    positives restent sur l'échelle linéaire. Retourne les valeurs transformées et le masque
+    """
+    valeurs = np.asarray(valeurs, dtype=np.float64)
+    log = np.asarray(log, dtype=bool) & (valeurs > 0).all(axis=-1)
+    log = np.broadcast_to(log[..., None], valeurs.shape)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(log, np.log(valeurs), valeurs), log[..., :1]
+
+def _retransformer(valeurs, log):
+    """
+    Inverse de _transformer
+    """
+    return np.where(log, np.exp(valeurs), valeurs)
+
+def prevoir_log_lineaire(valeurs, annees, horizon=HORIZON_DEFAUT, log=True):
+    """
+    Prolonge la droite des moindres carrés de chaque série (de son logarithme si
+    log=True : croissance exponentielle à taux constant) sur `horizon` années.
+    Retourne un tableau (..., horizon)
+    """
+    y, log = _transformer(valeurs, log)
+    t = np.asarray(annees, dtype=np.float64)
+    centre = t.mean()
+    # Pente nulle (prévision constante) pour une série d'une seule année
+    dispersion = ((t - centre) ** 2).sum()
+    pente = (y * (t - centre)).sum(axis=-1) / dispersion if dispersion else np.zeros(y.shape[:-1])
+    futur = t[-1] + np.arange(1, horizon + 1) - centre
+    return _retransformer(y.mean(axis=-1)[..., None] + pente[..., None] * futur, log)
+
+def prevoir_holt(valeurs, horizon=HORIZON_DEFAUT, log=True, alpha=None, beta=None):
+    """
+    Lissage exponentiel double de Holt (niveau + tendance), sur le logarithme des
+    séries si log=True. Sans alpha/beta, chaque couple de GRILLE_HOLT est évalué
+    pour toutes les séries à la fois et le meilleur (erreur quadratique des
+    prévisions à un an) est retenu série par série. Retourne un tableau (..., horizon)
+    """
+    y, log = _transformer(valeurs, log)
+    if alpha is None or beta is None:
+        alpha, beta = (grille.ravel() for grille in np.meshgrid(GRILLE_HOLT, GRILLE_HOLT, indexing='ij'))
+    alpha, beta = np.atleast_1d(alpha), np.atleast_1d(beta)
+
+    # États (..., candidat) : niveau initial = première valeur, tendance initiale = première variation
+    niveau = np.repeat(y[..., :1], len(alpha), axis=-1)
+    tendance = np.repeat(y[..., 1:2] - y[..., :1] if y.shape[-1] > 1 else np.zeros_like(y[..., :1]),
+                         len(alpha), axis=-1)
+    erreurs = np.zeros(niveau.shape)
+    for k in range(1, y.shape[-1]):
+        prevu = niveau + tendance
+        erreur = y[..., k, None] - prevu
+        erreurs += erreur ** 2
+        nouveau = prevu + alpha * erreur
+        tendance = beta * (nouveau - niveau) + (1 - beta) * tendance
+        niveau = nouveau
+
+    meilleur = np.argmin(erreurs, axis=-1)[..., None]
+    niveau = np.take_along_axis(niveau, meilleur, axis=-1)
+    tendance = np.take_along_axis(tendance, meilleur, axis=-1)
+    return _retransformer(niveau + tendance * np.arange(1, horizon + 1), log)
+
+def prevoir(valeurs, annees, horizon=HORIZON_DEFAUT, log=True, methode='holt'):
+    """
+    Prévision par la méthode demandée (holt ou log_lineaire). Retourne un tableau (..., horizon)
+    """
+    if methode == 'holt':
+        return prevoir_holt(valeurs, horizon, log)
+    if methode == 'log_lineaire':
+        return prevoir_log_lineaire(valeurs, annees, horizon, log)
+    raise ValueError(f"méthode de prévision inconnue : {methode} "
+                     f"(disponibles: {', '.join(METHODES_PREVISION)})")
+
+def series_cube(cube, indicateurs):
+    """
+    Indicateurs du cube sous forme de tableau (unité, indicateur, année), avec les
+    noms des unités (ligne nationale comprise) et les années
+    """
+    large = cube[list(indicateurs)].unstack('Annee')
+    annees = large.columns.get_level_values('Annee').unique().to_numpy()
+    tableau = large.to_numpy(dtype=np.float64).reshape(len(large), len(indicateurs), len(annees))
+    return tableau, large.index, annees
+
+def prevoir_cube(cube, horizon=HORIZON_DEFAUT, methode='holt', indicateurs=None):
+    """
+    Prévoit d'un bloc tous les indicateurs de toutes les unités du cube (départements
+    et ligne nationale) sur `horizon` années. Retourne un DataFrame indexé comme le
+    cube (Departement, Annee), limité aux années prévues
+    """
+    indicateurs = dict(indicateurs or INDICATEURS_PREVISION)
+    tableau, unites, annees = series_cube(cube, indicateurs)
+    log = np.broadcast_to(np.array(list(indicateurs.values())), tableau.shape[:-1])
+    previsions = prevoir(tableau, annees, horizon, log, methode)  # (unité, indicateur, horizon)
+    futur = annees[-1] + np.arange(1, horizon + 1)
+    resultat = pd.DataFrame({
+        'Departement': unites.repeat(horizon),
+        'Annee': np.tile(futur, len(unites)).astype(np.int16),
+        **{nom: previsions[:, k, :].reshape(-1) for k, nom in enumerate(indicateurs)},
+    })
+    return resultat.set_index(INDEX_CUBE)
+
+def indicateurs_cles(cube, horizon=HORIZON_DEFAUT, methode='holt'):
+    """
+    KPIs nationaux calculés à partir du cube (série nationale) : population et
+    croissance de la dernière année, TCAM sur la période, temps de doublement au
+    rythme actuel, contributions urbaine/rurale à la croissance et prévision de
+    la population. Retourne un dictionnaire
+    """
+    serie = serie_nationale(cube)
+    annees = serie.index.to_numpy()
+    population = serie['Population'].to_numpy(dtype=np.float64)
+    urbaine = population * serie['Taux_Urbanisation_%'].to_numpy(dtype=np.float64) / 100
+    croissance = taux_croissance(population, annees)
+    decomposition = decomposer_croissance(urbaine, population - urbaine)
+    return {
+        'annee': int(annees[-1]),
+        'premiere_annee': int(annees[0]),
+        'population': population[-1],
+        'croissance_%': croissance[-1],
+        'tcam_%': float(tcam(population, annees)),
+        'doublement_ans': float(temps_doublement(croissance[-1])),
+        'contribution_urbaine_pts': decomposition['Contribution_Urbaine_pts'][-1],
+        'contribution_rurale_pts': decomposition['Contribution_Rurale_pts'][-1],
+        'ecart_urbain_rural_pts': decomposition['Ecart_Urbain_Rural_pts'][-1],
+        'annees_prevision': annees[-1] + np.arange(1, horizon + 1),
+        'prevision_population': prevoir(population, annees, horizon, True, methode),
+    }
@@ -0,0 +1,166 @@
+"""
+Animations démographiques - Bénin
+Auteur: Freud GUEDOU
+
+Rendu de séquences d'images (pyramides par année, évolution de la
+population) : la figure est construite une seule fois, puis seules les
+largeurs de barres, les données des courbes et le titre sont mis à jour
+à chaque image. Le fond statique (axes, grille, légende) est mémorisé et
+restauré par blitting au lieu d'être redessiné.
+Sorties : séquence PNG (répertoire), GIF (Pillow) ou MP4 (ffmpeg).
+"""
+
+import os
+import shutil
+import subprocess
+
+import numpy as np
+from matplotlib import style
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from PIL import Image
+
+from pays import PAYS, PAYS_DEFAUT
+from stockage import REPERTOIRE_SORTIE
+
+STYLE = 'seaborn-v0_8-darkgrid'
+DPI_ANIMATION = 100
+
+def _images_blit(fig, artistes, mettre_a_jour, n_images):
+    """
+    Produit les images RGBA (n_images) d'une figure dont seuls `artistes` changent.
+    Le fond est dessiné une fois puis restauré avant chaque image.
+    """
+    canvas = FigureCanvasAgg(fig)
+    for artiste in artistes:
+        artiste.set_animated(True)
+    canvas.draw()
+    fond = canvas.copy_from_bbox(fig.bbox)
+    for i in range(n_images):
+        mettre_a_jour(i)
+        canvas.restore_region(fond)
+        for artiste in artistes:
+            fig.draw_artist(artiste)
+        yield np.asarray(canvas.buffer_rgba())
+
+def ecrire_images(images, sortie, fps=10):
+    """
+    Écrit une séquence d'images : répertoire de PNG, fichier .gif ou fichier .mp4.
+    Retourne le nombre d'images écrites
+    """
+    extension = os.path.splitext(sortie)[1].lower()
+    if extension == '.gif':
+        trames = [Image.fromarray(image).convert('RGB').quantize(colors=128) for image in images]
+        trames[0].save(sortie, save_all=True, append_images=trames[1:],
+                       duration=int(1000 / fps), loop=0, optimize=False)
+        return len(trames)
+
+    if extension == '.mp4':
+        ffmpeg = shutil.which('ffmpeg')
+        if ffmpeg is None:
+            raise RuntimeError("La sortie MP4 nécessite ffmpeg dans le PATH")
+        processus = None
+        n = 0
+        for image in images:
+            if processus is None:
+                hauteur, largeur = image.shape[:2]
+                processus = subprocess.Popen(
+                    [ffmpeg, '-y', '-loglevel', 'error', '-f', 'rawvideo', '-pix_fmt', 'rgba',
+                     '-s', f'{largeur}x{hauteur}', '-r', str(fps), '-i', '-',
+                     '-vf', 'pad=ceil(iw/2)*2:ceil(ih/2)*2', '-pix_fmt', 'yuv420p', sortie],
+                    stdin=subprocess.PIPE
+                )
+            processus.stdin.write(image.tobytes())
+            n += 1
+        if processus is not None:
+            processus.stdin.close()
+            processus.wait()
+        return n
+
+    # Séquence PNG (compression rapide : le coût d'encodage domine sinon)
+    os.makedirs(sortie, exist_ok=True)
+    n = 0
+    for n, image in enumerate(images, start=1):
+        Image.fromarray(image).save(os.path.join(sortie, f'image_{n:04d}.png'), compress_level=1)
+    return n
+
+def animer_pyramides(df_pyramides, sortie=None, fps=10, dpi=DPI_ANIMATION, pays=PAYS_DEFAUT):
+    """
+    Anime les pyramides d'un DataFrame long (sortie de projection.pyramides_par_annee)
+    du pays `pays` (code ISO3, pour le titre). Retourne le nombre d'images écrites
+    """
+    de = PAYS[pays]['de']
+    sortie = sortie or os.path.join(REPERTOIRE_SORTIE, 'animation_pyramides.gif')
+    annees = np.sort(df_pyramides['Annee'].unique())
+    groupes = df_pyramides.loc[df_pyramides['Annee'] == annees[0], 'Groupe_Age'].to_numpy()
+    tableau = df_pyramides.sort_values('Annee', kind='stable').loc[:, ['Hommes', 'Femmes']].to_numpy()
+    tableau = tableau.reshape(len(annees), len(groupes), 2) / 1000  # en milliers
+    limite_x = tableau.max() * 1.1
+
+    with style.context(STYLE):
+        fig = Figure(figsize=(12, 10), dpi=dpi)
+        ax = fig.add_subplot()
+        y_pos = np.arange(len(groupes))
+        barres_h = ax.barh(y_pos, -tableau[0, :, 0], color='#3498db', label='Hommes', height=0.8)
+        barres_f = ax.barh(y_pos, tableau[0, :, 1], color='#e74c3c', label='Femmes', height=0.8)
+        ax.set_yticks(y_pos)
+        ax.set_yticklabels(groupes)
+        ax.set_xlabel('Population (milliers)', fontsize=12)
+        ax.axvline(0, color='black', linewidth=0.8)
+        ax.legend(loc='upper right', fontsize=11)
+        ax.grid(True, alpha=0.3, axis='x')
+        ax.set_xlim(-limite_x, limite_x)
+        ticks = ax.get_xticks()
+        ax.set_xticks(ticks)
+        ax.set_xticklabels([f'{abs(int(x))}' for x in ticks])
+        ax.set_xlim(-limite_x, limite_x)
+        titre = ax.set_title(f'Pyramide des Âges {de} ({annees[0]})',
+                             fontsize=16, fontweight='bold', pad=20)
+        fig.tight_layout()
+
+    def mettre_a_jour(i):
+        for barre, valeur in zip(barres_h, tableau[i, :, 0]):
+            barre.set_width(-valeur)
+        for barre, valeur in zip(barres_f, tableau[i, :, 1]):
+            barre.set_width(valeur)
+        titre.set_text(f'Pyramide des Âges {de} ({annees[i]})')
+
+    artistes = [*barres_h, *barres_f, titre]
+    return ecrire_images(_images_blit(fig, artistes, mettre_a_jour, len(annees)), sortie, fps)
+
+def animer_evolution_population(df_pop, sortie=None, fps=10, dpi=DPI_ANIMATION, pays=PAYS_DEFAUT):
+    """
+    Anime la courbe de population totale, urbaine et rurale du pays `pays`, une
+    année par image. Retourne le nombre d'images écrites
+    """
+    de = PAYS[pays]['de']
+    sortie = sortie or os.path.join(REPERTOIRE_SORTIE, 'animation_evolution_population.gif')
+    annees = df_pop['Annee'].to_numpy()
+    series = {nom: df_pop[nom].to_numpy() / 1e6
+              for nom in ('Population_Totale', 'Population_Urbaine', 'Population_Rurale')}
+
+    with style.context(STYLE):
+        fig = Figure(figsize=(14, 7), dpi=dpi)
+        ax = fig.add_subplot()
+        courbes = {
+            'Population_Totale': ax.plot([], [], linewidth=3, color='#2c3e50', label='Totale')[0],
+            'Population_Urbaine': ax.plot([], [], linewidth=2.5, color='#e74c3c', label='Urbaine')[0],
+            'Population_Rurale': ax.plot([], [], linewidth=2.5, color='#27ae60', label='Rurale')[0],
+        }
+        ax.set_xlim(annees[0], annees[-1])
+        ax.set_ylim(0, series['Population_Totale'].max() * 1.05)
+        ax.set_xlabel('Année', fontsize=12)
+        ax.set_ylabel('Population (millions)', fontsize=12)
+        ax.legend(loc='upper left', fontsize=11)
+        ax.grid(True, alpha=0.3)
+        titre = ax.set_title(f'Évolution de la Population {de} ({annees[0]})',
+                             fontsize=16, fontweight='bold', pad=20)
+        fig.tight_layout()
+
+    def mettre_a_jour(i):
+        for nom, courbe in courbes.items():
+            courbe.set_data(annees[:i + 1], series[nom][:i + 1])
+        titre.set_text(f'Évolution de la Population {de} ({annees[i]})')
+
+    artistes = [*courbes.values(), titre]
+    return ecrire_images(_images_blit(fig, artistes, mettre_a_jour, len(annees)), sortie, fps)
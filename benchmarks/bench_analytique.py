@@ -0,0 +1,77 @@
+"""
+Benchmark - Analyse des séries temporelles
+Prévisions (Holt avec choix des paramètres, log-linéaire), taux de
+croissance et décomposition urbain/rural sur toutes les séries région ×
+indicateur d'une grille synthétique : d'un bloc (analytique.py) contre une
+boucle Python série par série.
+
+Usage: python benchmarks/bench_analytique.py [--regions 546] [--annees 35]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analytique import decomposer_croissance, prevoir_holt, prevoir_log_lineaire, taux_croissance  # noqa: E402
+from bench_generation_population import chronometrer, regions_synthetiques  # noqa: E402
+from generer_donnees_demographiques import generer_population_grille  # noqa: E402
+
+# Indicateurs prévus : colonne -> tendance multiplicative
+INDICATEURS = {
+    'Population_Totale': True, 'Population_Urbaine': True, 'Population_Rurale': True,
+    'Pct_Urbain': False, 'Esperance_Vie_Ans': False, 'Taux_Fertilite': False,
+}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--regions', type=int, default=546)
+    parser.add_argument('--annees', type=int, default=35)
+    parser.add_argument('--horizon', type=int, default=6)
+    args = parser.parse_args()
+
+    annees = np.arange(1990, 1990 + args.annees)
+    grille = generer_population_grille(regions_synthetiques(args.regions), annees)
+    # (région, indicateur, année) : la grille est triée par région puis par année
+    tableau = grille[list(INDICATEURS)].to_numpy(dtype=np.float64)
+    tableau = tableau.reshape(args.regions, args.annees, len(INDICATEURS)).transpose(0, 2, 1)
+    log = np.broadcast_to(np.array(list(INDICATEURS.values())), tableau.shape[:-1])
+    series = tableau.reshape(-1, args.annees)
+    log_series = log.reshape(-1)
+
+    print("\n" + "="*70)
+    print(f"  BENCHMARK - ANALYTIQUE ({len(series):,} séries × {args.annees} années, "
+          f"horizon {args.horizon})")
+    print("="*70 + "\n")
+    mesures = {
+        'Holt (25 couples alpha/beta)': (
+            lambda: prevoir_holt(tableau, args.horizon, log),
+            lambda: [prevoir_holt(serie, args.horizon, flag) for serie, flag in zip(series, log_series)]),
+        'Log-linéaire': (
+            lambda: prevoir_log_lineaire(tableau, annees, args.horizon, log),
+            lambda: [prevoir_log_lineaire(serie, annees, args.horizon, flag)
+                     for serie, flag in zip(series, log_series)]),
+        'Croissance + décomposition': (
+            lambda: (taux_croissance(tableau, annees),
+                     decomposer_croissance(tableau[:, 1], tableau[:, 2])),
+            lambda: [(taux_croissance(serie, annees), decomposer_croissance(urbaine, rurale))
+                     for serie, urbaine, rurale in zip(series, tableau[:, 1], tableau[:, 2])]),
+    }
+    print(f"{'Calcul':<30} {'Par série (ms)':>15} {'En bloc (ms)':>13} {'Gain':>7}")
+    for nom, (bloc, boucle) in mesures.items():
+        t_bloc, t_boucle = chronometrer(bloc), chronometrer(boucle)
+        print(f"{nom:<30} {t_boucle * 1000:>15.1f} {t_bloc * 1000:>13.1f} {t_boucle / t_bloc:>6.0f}x")
+
+    # Les deux chemins donnent les mêmes prévisions
+    ecart = np.nanmax(np.abs(prevoir_holt(tableau, args.horizon, log).reshape(len(series), -1)
+                             - np.array([prevoir_holt(serie, args.horizon, flag)
+                                         for serie, flag in zip(series, log_series)]))
+                      / np.abs(series[:, -1:]))
+    print(f"\nÉcart relatif maximal bloc / par série : {ecart:.1e}\n")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmark - Rendu de séquences d'images
+Compare, pour une projection de pyramides année par année, le rendu naïf
+(une figure complète par image : subplots, barh, tight_layout, savefig)
+au moteur d'animation (figure construite une fois, mise à jour + blitting).
+
+Usage: python benchmarks/bench_animation.py [--annees 50] [--dpi 100]
+"""
+
+import argparse
+import io
+import os
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import matplotlib  # noqa: E402
+matplotlib.use('Agg')
+
+import creer_visualisations as viz  # noqa: E402
+from animation import animer_evolution_population, animer_pyramides  # noqa: E402
+from generer_donnees_demographiques import (  # noqa: E402
+    generer_donnees_population_annuelle, generer_donnees_structure_age
+)
+from projection import population_depuis_pyramide, projeter_cohortes, pyramides_par_annee  # noqa: E402
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark des animations")
+    parser.add_argument('--annees', type=int, default=50)
+    parser.add_argument('--dpi', type=int, default=100)
+    parser.add_argument('--naif', type=int, default=10,
+                        help="nombre d'images rendues avec la méthode naïve (extrapolé)")
+    args = parser.parse_args()
+
+    with redirect_stdout(io.StringIO()):
+        df_age = generer_donnees_structure_age()
+        df_pop = generer_donnees_population_annuelle()
+    projection = projeter_cohortes(population_depuis_pyramide(df_age), args.annees - 1,
+                                   taux_fertilite=np.linspace(5.7, 3.5, args.annees - 1))
+    df_pyr = pyramides_par_annee(projection, df_age['Groupe_Age'])
+    annees = sorted(df_pyr['Annee'].unique())
+
+    print("\n" + "="*70)
+    print(f"  BENCHMARK - ANIMATIONS ({args.annees} images, {args.dpi} dpi)")
+    print("="*70 + "\n")
+    print(f"{'Méthode':<36} {'Images':>7} {'Durée (s)':>10} {'Images/min':>11}")
+
+    def afficher(methode, n, duree):
+        print(f"{methode:<36} {n:>7} {duree:>10.2f} {n / duree * 60:>11,.0f}")
+
+    viz.DPI = args.dpi
+    viz.configurer_style()
+    with tempfile.TemporaryDirectory() as rep:
+        n_naif = min(args.naif, len(annees))
+        debut = time.perf_counter()
+        with redirect_stdout(io.StringIO()):
+            viz.visualiser_pyramides_projetees(df_pyr, annees[:n_naif], rep)
+        afficher("Pyramides naïves (figure par image)", n_naif, time.perf_counter() - debut)
+
+        for nom, sortie in (("Pyramides blit → PNG", os.path.join(rep, 'png')),
+                            ("Pyramides blit → GIF", os.path.join(rep, 'pyr.gif'))):
+            debut = time.perf_counter()
+            n = animer_pyramides(df_pyr, sortie, dpi=args.dpi)
+            afficher(nom, n, time.perf_counter() - debut)
+
+        debut = time.perf_counter()
+        n = animer_evolution_population(df_pop, os.path.join(rep, 'evo'), dpi=args.dpi)
+        afficher("Évolution population blit → PNG", n, time.perf_counter() - debut)
+    print()
+
+if __name__ == "__main__":
+    main()
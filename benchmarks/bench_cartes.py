@@ -0,0 +1,124 @@
+"""
+Benchmark - Cartes choroplèthes
+Rend la grille année × indicateur des départements à partir d'un GeoJSON
+synthétique (contours très détaillés) et compare :
+  - naïf : GeoJSON relu, projeté et une figure complète redessinée par carte ;
+  - cartes.py : géométries simplifiées en cache disque, PolyCollection
+    persistante recolorée par blitting.
+
+Usage: python benchmarks/bench_cartes.py [--sommets 20000] [--annees 35]
+"""
+
+import argparse
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from matplotlib.collections import PolyCollection  # noqa: E402
+from matplotlib.figure import Figure  # noqa: E402
+
+from cartes import (INDICATEURS_CARTE, charger_geometries, lire_geojson, projeter,  # noqa: E402
+                    rendre_grille_cartes, tranches_departements, valeurs_par_anneau)
+from cube_kpi import avec_cube  # noqa: E402
+from generer_donnees_demographiques import creer_generateur, generer_datasets  # noqa: E402
+
+# Emprise approximative du Bénin (lon, lat)
+EMPRISE = (0.77, 6.2, 3.85, 12.4)
+
+def geojson_synthetique(chemin, noms, n_sommets, graine=2024):
+    """
+    Écrit un GeoJSON de polygones en grille (2 colonnes) couvrant l'emprise du pays,
+    chacun avec `n_sommets` sommets au total (contours bruités)
+    """
+    rng = creer_generateur(graine)
+    lon0, lat0, lon1, lat1 = EMPRISE
+    lignes = int(np.ceil(len(noms) / 2))
+    largeur, hauteur = (lon1 - lon0) / 2, (lat1 - lat0) / lignes
+    par_cote = max(n_sommets // (4 * len(noms)), 2)
+    t = np.linspace(0, 1, par_cote, endpoint=False)
+    entites = []
+    for i, nom in enumerate(noms):
+        x0, y0 = lon0 + (i % 2) * largeur, lat0 + (i // 2) * hauteur
+        coins = np.array([[x0, y0], [x0 + largeur, y0], [x0 + largeur, y0 + hauteur], [x0, y0 + hauteur]])
+        contour = np.concatenate([a + t[:, None] * (b - a) for a, b in zip(coins, np.roll(coins, -1, axis=0))])
+        contour += rng.normal(0, 0.004, contour.shape)
+        contour = np.vstack([contour, contour[:1]])
+        entites.append({'type': 'Feature', 'properties': {'NAME_1': nom.upper()},
+                        'geometry': {'type': 'Polygon', 'coordinates': [contour.round(6).tolist()]}})
+    with open(chemin, 'w', encoding='utf-8') as f:
+        json.dump({'type': 'FeatureCollection', 'features': entites}, f)
+
+def rendre_naif(chemin, tranches, indicateurs):
+    """
+    Référence : chaque carte relit le GeoJSON et redessine une figure complète
+    """
+    for indicateur in indicateurs:
+        for annee, tranche in tranches.items():
+            unites = lire_geojson(chemin)
+            anneaux = [projeter(anneau, 9.3) for _, contours in unites for anneau in contours]
+            geometries = {'noms': [nom for nom, _ in unites], 'unites': np.arange(len(anneaux))}
+            valeurs = valeurs_par_anneau(geometries, tranche, indicateur)
+            fig = Figure(figsize=(5, 5.6), dpi=100)
+            ax = fig.add_subplot()
+            collection = PolyCollection(anneaux, array=valeurs, cmap=INDICATEURS_CARTE[indicateur][1])
+            ax.add_collection(collection)
+            ax.autoscale_view()
+            ax.set_aspect('equal')
+            fig.colorbar(collection, ax=ax)
+            ax.set_title(f'{indicateur} - {annee}')
+            fig.savefig(io.BytesIO(), format='png')
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sommets', type=int, default=20_000, help="sommets du GeoJSON (total)")
+    parser.add_argument('--annees', type=int, default=35)
+    args = parser.parse_args()
+
+    cube = avec_cube(generer_datasets())['cube']
+    tranches = tranches_departements(cube)
+    tranches = dict(list(tranches.items())[-args.annees:])
+    indicateurs = list(INDICATEURS_CARTE)
+    noms = list(tranches[next(iter(tranches))].index)
+
+    print("\n" + "="*70)
+    print(f"  BENCHMARK - CARTES ({len(tranches)} années × {len(indicateurs)} indicateurs, "
+          f"{args.sommets:,} sommets)")
+    print("="*70 + "\n")
+    with tempfile.TemporaryDirectory() as repertoire:
+        chemin = os.path.join(repertoire, 'departements.geojson')
+        geojson_synthetique(chemin, noms, args.sommets)
+
+        debut = time.perf_counter()
+        geometries = charger_geometries(chemin, repertoire_cache=repertoire)
+        froid = time.perf_counter() - debut
+        debut = time.perf_counter()
+        geometries = charger_geometries(chemin, repertoire_cache=repertoire)
+        chaud = time.perf_counter() - debut
+        sommets = sum(len(anneau) for anneau in geometries['anneaux'])
+        print(f"Géométries : {froid * 1000:.0f} ms (lecture + simplification), "
+              f"{chaud * 1000:.0f} ms (cache) ; {args.sommets:,} -> {sommets:,} sommets")
+
+        debut = time.perf_counter()
+        rendre_grille_cartes(geometries, tranches, indicateurs, repertoire_sortie=repertoire)
+        grille = time.perf_counter() - debut
+        n_cartes = len(tranches) * len(indicateurs)
+        print(f"Grille (cache + PolyCollection persistante) : {grille:.2f} s "
+              f"({grille / n_cartes * 1000:.0f} ms/carte)")
+
+        # Référence naïve sur un échantillon, extrapolée à la grille
+        echantillon = dict(list(tranches.items())[-3:])
+        debut = time.perf_counter()
+        rendre_naif(chemin, echantillon, indicateurs)
+        naif = (time.perf_counter() - debut) / (len(echantillon) * len(indicateurs))
+        print(f"Naïf (relecture + figure complète)          : {naif * n_cartes:.2f} s estimés "
+              f"({naif * 1000:.0f} ms/carte) -> accélération x{naif * n_cartes / grille:.1f}\n")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Benchmark - Temps de démarrage
+Lance chaque commande dans un nouveau processus avec `python -X importtime`
+et mesure le temps total (meilleur de N) et le temps d'import, en signalant
+si pandas, numpy, matplotlib ou openpyxl ont été chargés. Compare la ligne
+de commande unifiée (dashboard.py, imports paresseux) aux scripts historiques.
+
+Usage: python benchmarks/bench_demarrage.py [--repetitions 5]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULES_LOURDS = ('pandas', 'numpy', 'matplotlib', 'openpyxl')
+
+def commandes(repertoire):
+    """
+    Commandes comparées : nom -> arguments de l'interpréteur
+    """
+    return {
+        'dashboard.py --help': ['dashboard.py', '--help'],
+        'dashboard.py rendre --help': ['dashboard.py', 'rendre', '--help'],
+        'dashboard.py stats': ['dashboard.py', 'stats', '--sortie', repertoire, '--json'],
+        'generer_donnees... --help': ['generer_donnees_demographiques.py', '--help'],
+        'creer_visualisations --help': ['creer_visualisations.py', '--help'],
+    }
+
+def analyser_importtime(sortie_erreur):
+    """
+    Temps d'import cumulé des modules de premier niveau (µs) et modules lourds chargés
+    """
+    total, lourds = 0, set()
+    for ligne in sortie_erreur.splitlines():
+        if not ligne.startswith('import time:') or 'self [us]' in ligne:
+            continue
+        _, cumul, module = ligne[len('import time:'):].split('|')
+        if not module.startswith('  '):
+            total += int(cumul)
+        racine = module.strip().split('.')[0]
+        if racine in MODULES_LOURDS:
+            lourds.add(racine)
+    return total, lourds
+
+def mesurer(arguments, repetitions):
+    """
+    Meilleur temps total d'exécution (s), temps d'import (s) et modules lourds chargés
+    """
+    meilleur, imports, lourds = float('inf'), 0, set()
+    for _ in range(repetitions):
+        debut = time.perf_counter()
+        resultat = subprocess.run([sys.executable, '-X', 'importtime', *arguments], cwd=RACINE,
+                                  capture_output=True, text=True, check=True)
+        duree = time.perf_counter() - debut
+        if duree < meilleur:
+            meilleur = duree
+            imports, lourds = analyser_importtime(resultat.stderr)
+    return meilleur, imports / 1e6, lourds
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repetitions', type=int, default=5)
+    args = parser.parse_args()
+
+    print("\n" + "="*70)
+    print("  BENCHMARK - TEMPS DE DÉMARRAGE (python -X importtime)")
+    print("="*70 + "\n")
+    with tempfile.TemporaryDirectory() as repertoire:
+        # Données pour la commande stats
+        subprocess.run([sys.executable, 'dashboard.py', 'generer', '--sortie', repertoire],
+                       cwd=RACINE, capture_output=True, check=True)
+        print(f"{'Commande':<30} {'Total (s)':>10} {'Imports (s)':>12}  Modules lourds")
+        for nom, arguments in commandes(repertoire).items():
+            total, imports, lourds = mesurer(arguments, args.repetitions)
+            print(f"{nom:<30} {total:>10.3f} {imports:>12.3f}  {', '.join(sorted(lourds)) or '-'}")
+    print()
+
+if __name__ == "__main__":
+    main()
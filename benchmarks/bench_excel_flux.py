@@ -0,0 +1,96 @@
+"""
+Benchmark - Export Excel standard vs flux
+Mesure le pic de mémoire résidente (RSS) et le débit d'écriture du classeur
+(quatre feuilles de données plus le cube d'indicateurs), en mode standard (pd.ExcelWriter/openpyxl) et en mode
+flux (openpyxl write_only). Chaque mesure tourne dans un sous-processus
+séparé pour que les pics de mémoire ne se mélangent pas.
+
+Usage: python benchmarks/bench_excel_flux.py [--lignes 50000 200000]
+"""
+
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def pic_rss_mo():
+    """
+    Pic de mémoire résidente du processus courant, en Mo (ru_maxrss est en Ko sous Linux)
+    """
+    pic = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return pic / 1024 if sys.platform != 'darwin' else pic / 1024 ** 2
+
+def mesurer(mode, lignes):
+    """
+    Exécuté dans le sous-processus : génère les données puis écrit le classeur
+    """
+    import pandas as pd
+    from bench_generation_population import regions_synthetiques
+    from cube_kpi import construire_cube
+    from generer_donnees_demographiques import (
+        FEUILLES_EXCEL, generer_donnees_departements, generer_donnees_population_annuelle,
+        generer_donnees_structure_age, generer_indicateurs_sociaux, generer_population_grille
+    )
+    from stockage import exporter_excel_flux
+
+    n_annees = 100
+    datasets = {
+        'population': generer_population_grille(
+            regions_synthetiques(max(1, lignes // n_annees)), range(1925, 1925 + n_annees), graine=42
+        ),
+        'structure_age': generer_donnees_structure_age(),
+        'departements': generer_donnees_departements(),
+        'indicateurs_sociaux': generer_indicateurs_sociaux(),
+    }
+    # Cube construit comme dans persister_datasets, sur la série nationale (la grille est synthétique)
+    datasets['cube'] = construire_cube({**datasets, 'population': generer_donnees_population_annuelle()}).reset_index()
+    rss_avant = pic_rss_mo()
+
+    with tempfile.TemporaryDirectory() as repertoire:
+        chemin = os.path.join(repertoire, 'classeur.xlsx')
+        debut = time.perf_counter()
+        if mode == 'flux':
+            exporter_excel_flux(datasets, chemin, FEUILLES_EXCEL)
+        else:
+            with pd.ExcelWriter(chemin, engine='openpyxl') as writer:
+                for nom, feuille in FEUILLES_EXCEL.items():
+                    datasets[nom].to_excel(writer, sheet_name=feuille, index=False)
+        duree = time.perf_counter() - debut
+
+    total = sum(len(df) for df in datasets.values())
+    print(f"{mode} {total} {duree:.4f} {rss_avant:.1f} {pic_rss_mo():.1f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de l'export Excel")
+    parser.add_argument('--lignes', type=int, nargs='+', default=[20000, 100000])
+    parser.add_argument('--mesurer', choices=['standard', 'flux'], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mesurer:
+        mesurer(args.mesurer, args.lignes[0])
+        return
+
+    print("\n" + "="*70)
+    print("  BENCHMARK - EXPORT EXCEL (pic RSS et débit)")
+    print("="*70 + "\n")
+    print(f"{'Mode':<10} {'Lignes':>10} {'Durée (s)':>10} {'Lignes/s':>10} "
+          f"{'RSS avant (Mo)':>15} {'Pic RSS (Mo)':>13} {'Surcoût (Mo)':>13}")
+    for lignes in args.lignes:
+        for mode in ('standard', 'flux'):
+            sortie = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), '--mesurer', mode, '--lignes', str(lignes)],
+                capture_output=True, text=True, check=True
+            ).stdout.strip().splitlines()[-1]
+            _, total, duree, avant, pic = sortie.split()
+            total, duree, avant, pic = int(total), float(duree), float(avant), float(pic)
+            print(f"{mode:<10} {total:>10,} {duree:>10.2f} {total / duree:>10,.0f} "
+                  f"{avant:>15.1f} {pic:>13.1f} {pic - avant:>13.1f}")
+    print()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Benchmark - Génération des séries de population
+Compare la boucle Python historique (une ligne par année) au moteur
+vectorisé `generer_population_grille` sur des grilles région × année.
+
+Usage: python benchmarks/bench_generation_population.py
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from generer_donnees_demographiques import (  # noqa: E402
+    POP_1990, POP_2024, SUPERFICIE_BENIN, generer_population_grille
+)
+
+def boucle_historique(annees):
+    """
+    Implémentation de référence : boucle Python par année (version d'origine)
+    """
+    donnees = []
+    for i, annee in enumerate(annees):
+        progression = i / (len(annees) - 1)
+        population = POP_1990 * ((POP_2024/POP_1990) ** progression)
+        taux_croissance = 3.2 - (progression * 0.5) + np.random.uniform(-0.1, 0.1)
+        pop_urbaine_pct = 25 + (progression * 23) + np.random.uniform(-0.5, 0.5)
+        pop_urbaine = population * (pop_urbaine_pct / 100)
+        pop_rurale = population - pop_urbaine
+        esperance_vie = 53 + (progression * 9) + np.random.uniform(-0.5, 0.5)
+        taux_fertilite = 6.7 - (progression * 1.0) + np.random.uniform(-0.1, 0.1)
+        mortalite_infantile = 115 - (progression * 40)
+        densite = population / SUPERFICIE_BENIN
+        donnees.append({
+            'Annee': annee,
+            'Population_Totale': int(population),
+            'Taux_Croissance_%': round(taux_croissance, 2),
+            'Population_Urbaine': int(pop_urbaine),
+            'Population_Rurale': int(pop_rurale),
+            'Pct_Urbain': round(pop_urbaine_pct, 1),
+            'Esperance_Vie_Ans': round(esperance_vie, 1),
+            'Taux_Fertilite': round(taux_fertilite, 2),
+            'Mortalite_Infantile_pour_1000': round(mortalite_infantile, 1),
+            'Densite_Pop_km2': round(densite, 1)
+        })
+    return pd.DataFrame(donnees)
+
+def regions_synthetiques(n_regions):
+    """
+    Crée n régions fictives dont la somme reproduit la population nationale
+    """
+    poids = np.random.default_rng(0).dirichlet(np.ones(n_regions))
+    return pd.DataFrame({
+        'Region': [f'Region_{i:04d}' for i in range(n_regions)],
+        'Pop_Initiale': POP_1990 * poids,
+        'Pop_Finale': POP_2024 * poids,
+        'Superficie_km2': SUPERFICIE_BENIN * poids,
+    })
+
+def chronometrer(fonction, repetitions=3):
+    """
+    Retourne le meilleur temps (secondes) sur plusieurs répétitions
+    """
+    meilleur = float('inf')
+    for _ in range(repetitions):
+        debut = time.perf_counter()
+        fonction()
+        meilleur = min(meilleur, time.perf_counter() - debut)
+    return meilleur
+
+def main():
+    print("\n" + "="*70)
+    print("  BENCHMARK - GÉNÉRATION DE LA POPULATION (lignes/seconde)")
+    print("="*70 + "\n")
+
+    grilles = [(1, 35), (77, 35), (546, 35), (546, 200), (5000, 200)]
+    print(f"{'Régions':>8} {'Années':>7} {'Lignes':>10} {'Boucle (l/s)':>14} "
+          f"{'Vectorisé (l/s)':>16} {'Gain':>8}")
+    for n_regions, n_annees in grilles:
+        annees = list(range(1990, 1990 + n_annees))
+        regions = regions_synthetiques(n_regions)
+        lignes = n_regions * n_annees
+
+        # La boucle ne traite qu'une région à la fois : on l'extrapole à partir d'un
+        # échantillon pour les grandes grilles afin de garder un temps raisonnable
+        echantillon = min(n_regions, 50)
+        t_boucle = chronometrer(
+            lambda: [boucle_historique(annees) for _ in range(echantillon)], 1
+        ) * n_regions / echantillon
+        t_vect = chronometrer(lambda: generer_population_grille(regions, annees, graine=42))
+
+        print(f"{n_regions:>8} {n_annees:>7} {lignes:>10,} {lignes/t_boucle:>14,.0f} "
+              f"{lignes/t_vect:>16,.0f} {t_boucle/t_vect:>7.0f}x")
+    print()
+
+if __name__ == "__main__":
+    main()
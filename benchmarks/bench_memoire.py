@@ -0,0 +1,72 @@
+"""
+Benchmark - Types compacts
+Compare la mémoire et le temps d'agrégation (groupby) d'un extrait de
+population au niveau communal, multi-pays, avec les types par défaut
+(int64/float64, chaînes objet) et avec les types compacts du schéma
+(catégories, int16/int32, float32).
+
+Usage: python benchmarks/bench_memoire.py [--regions 546] [--annees 100] [--pays 15]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_generation_population import regions_synthetiques  # noqa: E402
+from generer_donnees_demographiques import generer_population_grille  # noqa: E402
+from pays import CEDEAO  # noqa: E402
+from stockage import appliquer_schema, memoire_octets  # noqa: E402
+
+def extrait_multi_pays(n_regions, n_annees, n_pays):
+    """
+    Grille commune × année répétée pour n_pays pays, aux types par défaut
+    """
+    grille = generer_population_grille(regions_synthetiques(n_regions),
+                                       range(1950, 1950 + n_annees), graine=42)
+    df = pd.concat([grille] * n_pays, ignore_index=True)
+    codes = np.array(CEDEAO)[np.arange(n_pays) % len(CEDEAO)]
+    df.insert(0, 'Pays', np.repeat(codes, len(grille)))
+    return df.astype({'Pays': object, 'Region': object, 'Annee': 'int64'})
+
+def chronometrer_groupby(df, repetitions=5):
+    """
+    Meilleur temps d'une agrégation pays × année (somme et moyenne)
+    """
+    meilleur = float('inf')
+    for _ in range(repetitions):
+        debut = time.perf_counter()
+        df.groupby(['Pays', 'Annee'], observed=True).agg(
+            {'Population_Totale': 'sum', 'Pct_Urbain': 'mean'})
+        meilleur = min(meilleur, time.perf_counter() - debut)
+    return meilleur
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--regions', type=int, default=546)
+    parser.add_argument('--annees', type=int, default=100)
+    parser.add_argument('--pays', type=int, default=len(CEDEAO))
+    args = parser.parse_args()
+
+    larges = extrait_multi_pays(args.regions, args.annees, args.pays)
+    compacts = appliquer_schema(larges, 'population').astype({'Pays': 'category', 'Region': 'category'})
+
+    print("\n" + "="*70)
+    print(f"  BENCHMARK - TYPES COMPACTS ({len(larges):,} lignes × {larges.shape[1]} colonnes)")
+    print("="*70 + "\n")
+    print(f"{'Types':<10} {'Mémoire (Mo)':>13} {'groupby (ms)':>13}")
+    resultats = {}
+    for nom, df in (('défaut', larges), ('compacts', compacts)):
+        resultats[nom] = (memoire_octets(df), chronometrer_groupby(df))
+        print(f"{nom:<10} {resultats[nom][0] / 1e6:>13.1f} {resultats[nom][1] * 1000:>13.1f}")
+    (m_larges, t_larges), (m_compacts, t_compacts) = resultats.values()
+    print(f"\nMémoire : -{(1 - m_compacts / m_larges) * 100:.0f}%   "
+          f"groupby : x{t_larges / t_compacts:.1f}\n")
+
+if __name__ == "__main__":
+    main()
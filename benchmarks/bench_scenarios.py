@@ -0,0 +1,44 @@
+"""
+Benchmark - Moteur de scénarios Monte-Carlo
+Mesure le temps et le pic de mémoire Python (tracemalloc) pour générer
+10 000 trajectoires et leurs bandes P5/P50/P95, selon la taille des blocs.
+
+Usage: python benchmarks/bench_scenarios.py [--scenarios 10000]
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scenarios import bandes_percentiles, generer_trajectoires  # noqa: E402
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark du moteur de scénarios")
+    parser.add_argument('--scenarios', type=int, default=10000)
+    args = parser.parse_args()
+
+    print("\n" + "="*70)
+    print(f"  BENCHMARK - {args.scenarios:,} SCÉNARIOS MONTE-CARLO (1990-2024)")
+    print("="*70 + "\n")
+    print(f"{'Bloc':>8} {'Trajectoires (s)':>17} {'Percentiles (s)':>16} "
+          f"{'Scénarios/s':>12} {'Résultat (Mo)':>14} {'Pic (Mo)':>9}")
+    for taille_bloc in (500, 2000, args.scenarios):
+        tracemalloc.start()
+        debut = time.perf_counter()
+        trajectoires = generer_trajectoires(args.scenarios, taille_bloc=taille_bloc, graine=1)
+        t_traj = time.perf_counter() - debut
+        debut = time.perf_counter()
+        bandes_percentiles(trajectoires)
+        t_pct = time.perf_counter() - debut
+        _, pic = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{taille_bloc:>8,} {t_traj:>17.3f} {t_pct:>16.3f} {args.scenarios / t_traj:>12,.0f} "
+              f"{trajectoires.nbytes / 1e6:>14.1f} {pic / 1e6:>9.1f}")
+    print()
+
+if __name__ == "__main__":
+    main()
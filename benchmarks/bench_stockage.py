@@ -0,0 +1,81 @@
+"""
+Benchmark - Formats de stockage
+Compare le temps d'écriture, la taille des fichiers et le temps de chargement
+des formats CSV, Excel (openpyxl), Parquet et Feather sur un extrait de
+population au niveau communal.
+
+Usage: python benchmarks/bench_stockage.py [--regions 546] [--annees 100]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_generation_population import regions_synthetiques  # noqa: E402
+from generer_donnees_demographiques import generer_population_grille  # noqa: E402
+from stockage import ecrire_dataset, lire_dataset  # noqa: E402
+
+def chronometrer(fonction):
+    """
+    Exécute la fonction et retourne (résultat, durée en secondes)
+    """
+    debut = time.perf_counter()
+    resultat = fonction()
+    return resultat, time.perf_counter() - debut
+
+def mesurer_excel(df, repertoire):
+    """
+    Écriture/lecture d'une feuille Excel via openpyxl (chemin actuel du générateur)
+    """
+    chemin = os.path.join(repertoire, 'extrait.xlsx')
+    _, t_ecriture = chronometrer(
+        lambda: df.to_excel(chemin, sheet_name='Population_Annuelle', index=False, engine='openpyxl')
+    )
+    _, t_lecture = chronometrer(lambda: pd.read_excel(chemin, engine='openpyxl'))
+    return t_ecriture, os.path.getsize(chemin), t_lecture
+
+def mesurer_format(df, repertoire, format):
+    """
+    Écriture/lecture typée d'un jeu de données via le module stockage
+    """
+    chemin, t_ecriture = chronometrer(lambda: ecrire_dataset(df, 'population', repertoire, format))
+    _, t_lecture = chronometrer(lambda: lire_dataset('population', repertoire, format))
+    return t_ecriture, os.path.getsize(chemin), t_lecture
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--regions', type=int, default=546)
+    parser.add_argument('--annees', type=int, default=100)
+    parser.add_argument('--sans-excel', action='store_true', help="ignorer Excel (lent)")
+    args = parser.parse_args()
+
+    df = generer_population_grille(regions_synthetiques(args.regions),
+                                   range(1950, 1950 + args.annees), graine=42)
+
+    print("\n" + "="*70)
+    print(f"  BENCHMARK - STOCKAGE ({len(df):,} lignes × {df.shape[1]} colonnes)")
+    print("="*70 + "\n")
+    print(f"{'Format':<10} {'Écriture (s)':>13} {'Taille (Mo)':>12} {'Lecture (s)':>12}")
+
+    with tempfile.TemporaryDirectory() as repertoire:
+        resultats = {}
+        for format in ('csv', 'parquet', 'feather'):
+            try:
+                resultats[format] = mesurer_format(df, repertoire, format)
+            except ImportError as erreur:
+                print(f"{format:<10} ignoré ({erreur})")
+        if not args.sans_excel:
+            resultats['xlsx'] = mesurer_excel(df, repertoire)
+
+        for format, (t_ecriture, taille, t_lecture) in resultats.items():
+            print(f"{format:<10} {t_ecriture:>13.3f} {taille / 1e6:>12.2f} {t_lecture:>12.3f}")
+    print()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,297 @@
+"""
+Benchmark - Suite de référence et détection des régressions
+Mesure, sur des données à graine fixe et à plusieurs échelles, chaque
+fonction generer_*, l'écriture CSV et Excel des jeux de données (chemin de
+sauvegarder_donnees), leur relecture (charger_donnees) et le rendu de chaque
+figure du catalogue. Les résultats (meilleur temps et médiane de N
+répétitions, environnement) sont enregistrés en JSON ; la commande comparer
+signale les étapes plus lentes que la référence au-delà d'un seuil.
+
+Échelles :
+  national    le Bénin tel que généré par défaut (12 départements, 35 ans)
+  communes    les 77 communes à la place des départements (cube et figures à 77 unités)
+  multi_pays  les 15 pays de la CEDEAO sur 100 ans (format long, un répertoire par pays)
+
+Usage:
+  python benchmarks/bench_suite.py mesurer [--echelle national] [--sortie resultats.json]
+  python benchmarks/bench_suite.py mesurer --sortie benchmarks/references/reference.json
+  python benchmarks/bench_suite.py comparer reference.json resultats.json [--seuil 0.15]
+
+`mesurer` compare aussi à la référence (benchmarks/references/reference.json
+par défaut) et sort avec le code 1 en cas de régression.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import matplotlib  # noqa: E402
+
+matplotlib.use('Agg')
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+import creer_visualisations as viz  # noqa: E402
+from cube_kpi import avec_cube  # noqa: E402
+from generer_donnees_demographiques import (  # noqa: E402
+    GRAINE_DEFAUT, generer_datasets, generer_datasets_pays, generer_donnees_departements,
+    generer_donnees_population_annuelle, generer_donnees_structure_age, generer_indicateurs_sociaux,
+    persister_datasets, separer_pays,
+)
+from hierarchie import avec_hierarchie, generer_hierarchie, tranche_niveau  # noqa: E402
+from pays import CEDEAO, PAYS  # noqa: E402
+from stockage import appliquer_schema, lire_dataset  # noqa: E402
+
+REFERENCE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'references', 'reference.json')
+VERSION_FORMAT = 1
+SEUIL_DEFAUT = 0.15  # ralentissement relatif toléré
+PLANCHER_S = 0.005  # écart absolu en dessous duquel une variation n'est pas signalée
+ANNEES_MULTI_PAYS = range(1925, 2025)
+
+def datasets_communes(graine=GRAINE_DEFAUT):
+    """
+    Jeux de données nationaux dont les « départements » sont les 77 communes
+    (agrégats de la hiérarchie, âge médian du département parent)
+    """
+    datasets = generer_datasets(graine)
+    communes = tranche_niveau(avec_hierarchie(datasets, graine=graine)['hierarchie'], 'commune')
+    age = datasets['departements'].set_index(datasets['departements']['Departement'].astype(str))
+    departements = pd.DataFrame({
+        'Departement': communes.index,
+        'Population': communes['Population'].to_numpy(),
+        'Superficie_km2': communes['Superficie_km2'].round().to_numpy(),
+        'Chef_lieu': communes.index,
+        'Densite_km2': communes['Densite_km2'].round(1).to_numpy(),
+        'Pct_Population_Nationale': communes['Pct_Population_Nationale'].round(2).to_numpy(),
+        'Taux_Urbanisation_%': communes['Taux_Urbanisation_%'].round(1).to_numpy(),
+        'Age_Median_Ans': age.loc[communes['Departement'], 'Age_Median_Ans'].to_numpy(),
+    })
+    return {**datasets, 'departements': appliquer_schema(departements, 'departements')}
+
+def donnees_rendu(datasets, graine=GRAINE_DEFAUT):
+    """
+    Données des figures : cube et hiérarchie construits une fois (à l'échelle communes,
+    la hiérarchie est celle des vrais départements)
+    """
+    donnees = avec_cube(datasets)
+    if len(datasets['departements']) == len(PAYS['BEN']['subdivisions']):
+        return avec_hierarchie(donnees, graine=graine)
+    return {**donnees, 'hierarchie': avec_hierarchie(generer_datasets(graine), graine=graine)['hierarchie']}
+
+def etapes_echelle(echelle, repertoire, graine=GRAINE_DEFAUT):
+    """
+    Étapes mesurées d'une échelle : liste de (nom, fonction sans argument)
+    """
+    repertoire = os.path.join(repertoire, echelle)
+    if echelle == 'multi_pays':
+        datasets = generer_datasets_pays(CEDEAO, graine, ANNEES_MULTI_PAYS)
+        par_pays = separer_pays(datasets)
+
+        def ecrire(excel):
+            for code, datasets_pays in par_pays.items():
+                persister_datasets(datasets_pays, os.path.join(repertoire, code), ('csv',), excel, forcer=True,
+                                   pays=code)
+
+        def charger():
+            return {code: {nom: lire_dataset(nom, os.path.join(repertoire, code), pays=code)
+                           for nom in datasets_pays}
+                    for code, datasets_pays in par_pays.items()}
+
+        return [
+            ('generer_datasets_pays', lambda: generer_datasets_pays(CEDEAO, graine, ANNEES_MULTI_PAYS)),
+            ('sauvegarde_csv_excel_flux', lambda: ecrire('flux')),
+            ('charger_donnees', charger),
+        ]
+
+    if echelle == 'communes':
+        datasets = datasets_communes(graine)
+        generation = [
+            ('generer_hierarchie', lambda: generer_hierarchie(
+                generer_datasets(graine)['departements'], PAYS['BEN']['communes'],
+                PAYS['BEN']['arrondissements'], graine)),
+            ('generer_datasets_communes', lambda: datasets_communes(graine)),
+        ]
+    else:
+        datasets = generer_datasets(graine)
+        generation = [
+            ('generer_donnees_population_annuelle', lambda: generer_donnees_population_annuelle(graine)),
+            ('generer_donnees_structure_age', generer_donnees_structure_age),
+            ('generer_donnees_departements', lambda: generer_donnees_departements(graine)),
+            ('generer_indicateurs_sociaux', generer_indicateurs_sociaux),
+            ('generer_datasets', lambda: generer_datasets(graine)),
+        ]
+    donnees = donnees_rendu(datasets, graine)
+    return [
+        *generation,
+        ('sauvegarde_csv', lambda: persister_datasets(datasets, repertoire, ('csv',), 'flux', forcer=True)),
+        ('sauvegarde_excel', lambda: persister_datasets(datasets, repertoire, (), 'standard', forcer=True)),
+        ('sauvegarde_excel_flux', lambda: persister_datasets(datasets, repertoire, (), 'flux', forcer=True)),
+        ('charger_donnees', lambda: viz.charger_donnees('csv', repertoire)),
+        *((f'rendu_{nom}', lambda nom=nom: viz._rendre_figure(nom, repertoire, donnees))
+          for nom in viz.figures_disponibles(donnees)),
+    ]
+
+def chronometrer(fonction, repetitions):
+    """
+    Temps (secondes) de chaque répétition, sorties console de la fonction masquées
+    """
+    temps = []
+    for _ in range(repetitions):
+        with contextlib.redirect_stdout(io.StringIO()):
+            debut = time.perf_counter()
+            fonction()
+            temps.append(time.perf_counter() - debut)
+    return temps
+
+def environnement():
+    """
+    Versions et machine, pour juger si deux mesures sont comparables
+    """
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'matplotlib': matplotlib.__version__,
+        'plateforme': platform.platform(),
+        'processeur': platform.processor() or platform.machine(),
+        'coeurs': os.cpu_count(),
+    }
+
+def mesurer(echelles, repetitions=3, graine=GRAINE_DEFAUT, filtre=None):
+    """
+    Mesure toutes les étapes des échelles demandées. Retourne le document de résultats
+    """
+    mesures = {}
+    with tempfile.TemporaryDirectory() as repertoire:
+        for echelle in echelles:
+            print(f"\n📏 Échelle {echelle}")
+            with contextlib.redirect_stdout(io.StringIO()):
+                etapes = etapes_echelle(echelle, repertoire, graine)
+            for nom, fonction in etapes:
+                cle = f'{echelle}/{nom}'
+                if filtre and filtre not in cle:
+                    continue
+                temps = chronometrer(fonction, repetitions)
+                mesures[cle] = {'min_s': round(min(temps), 5), 'mediane_s': round(statistics.median(temps), 5),
+                                'repetitions': repetitions}
+                print(f"   {nom:<40} {min(temps) * 1000:>10.1f} ms")
+    return {
+        'version': VERSION_FORMAT,
+        'date': datetime.now().isoformat(timespec='seconds'),
+        'graine': graine,
+        'environnement': environnement(),
+        'mesures': mesures,
+    }
+
+def comparer(reference, courant, seuil=SEUIL_DEFAUT, plancher=PLANCHER_S):
+    """
+    Compare deux documents de résultats étape par étape (meilleurs temps).
+    Retourne un DataFrame : Etape, Reference_s, Courant_s, Rapport, Statut
+    """
+    lignes = []
+    for etape in sorted(set(reference['mesures']) | set(courant['mesures'])):
+        avant = reference['mesures'].get(etape, {}).get('min_s')
+        apres = courant['mesures'].get(etape, {}).get('min_s')
+        if avant is None or apres is None:
+            statut, rapport = ('nouvelle' if avant is None else 'absente'), np.nan
+        else:
+            rapport = apres / avant if avant else np.inf
+            if rapport > 1 + seuil and apres - avant > plancher:
+                statut = 'régression'
+            elif rapport < 1 - seuil and avant - apres > plancher:
+                statut = 'amélioration'
+            else:
+                statut = 'stable'
+        lignes.append({'Etape': etape, 'Reference_s': avant, 'Courant_s': apres,
+                       'Rapport': rapport, 'Statut': statut})
+    return pd.DataFrame(lignes, columns=['Etape', 'Reference_s', 'Courant_s', 'Rapport', 'Statut'])
+
+def afficher_comparaison(comparaison, reference, courant, seuil):
+    """
+    Affiche la comparaison et retourne le nombre de régressions
+    """
+    symboles = {'régression': '🔴', 'amélioration': '🟢', 'stable': '  ', 'nouvelle': '🆕', 'absente': '❔'}
+    if reference.get('environnement') != courant.get('environnement'):
+        print("⚠️  Environnements différents : les écarts peuvent venir de la machine ou des versions")
+    print(f"\n{'Étape':<50} {'Réf. (ms)':>10} {'Actuel (ms)':>12} {'Rapport':>8}")
+    for ligne in comparaison.itertuples():
+        avant = f'{ligne.Reference_s * 1000:.1f}' if pd.notna(ligne.Reference_s) else '-'
+        apres = f'{ligne.Courant_s * 1000:.1f}' if pd.notna(ligne.Courant_s) else '-'
+        rapport = f'x{ligne.Rapport:.2f}' if pd.notna(ligne.Rapport) else '-'
+        print(f"{symboles[ligne.Statut]} {ligne.Etape:<47} {avant:>10} {apres:>12} {rapport:>8}")
+    regressions = int((comparaison['Statut'] == 'régression').sum())
+    ameliorations = int((comparaison['Statut'] == 'amélioration').sum())
+    print(f"\n{regressions} régression(s), {ameliorations} amélioration(s) au seuil de {seuil:.0%}\n")
+    return regressions
+
+def lire_resultats(chemin):
+    """
+    Document de résultats enregistré
+    """
+    with open(chemin, encoding='utf-8') as f:
+        return json.load(f)
+
+def ecrire_resultats(resultats, chemin):
+    """
+    Enregistre un document de résultats (JSON indenté, stable pour les diffs)
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(chemin)), exist_ok=True)
+    with open(chemin, 'w', encoding='utf-8') as f:
+        json.dump(resultats, f, ensure_ascii=False, indent=2, sort_keys=True)
+        f.write('\n')
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    sous_commandes = parser.add_subparsers(dest='commande', required=True)
+
+    commande_mesurer = sous_commandes.add_parser('mesurer', help="mesurer les étapes et comparer à la référence")
+    commande_mesurer.add_argument('--echelle', action='append', dest='echelles',
+                                  choices=['national', 'communes', 'multi_pays'],
+                                  help="échelle mesurée (répétable, défaut: toutes)")
+    commande_mesurer.add_argument('--repetitions', type=int, default=3)
+    commande_mesurer.add_argument('--graine', type=int, default=GRAINE_DEFAUT)
+    commande_mesurer.add_argument('--etape', default=None, help="ne mesurer que les étapes contenant ce texte")
+    commande_mesurer.add_argument('--sortie', default=None, help="fichier JSON des résultats")
+    commande_mesurer.add_argument('--reference', default=REFERENCE, help="résultats de référence (JSON)")
+    commande_mesurer.add_argument('--seuil', type=float, default=SEUIL_DEFAUT)
+
+    commande_comparer = sous_commandes.add_parser('comparer', help="comparer deux fichiers de résultats")
+    commande_comparer.add_argument('reference')
+    commande_comparer.add_argument('courant')
+    commande_comparer.add_argument('--seuil', type=float, default=SEUIL_DEFAUT)
+    args = parser.parse_args()
+
+    print("\n" + "="*70)
+    print("  BENCHMARK - SUITE DE RÉFÉRENCE")
+    print("="*70)
+    if args.commande == 'comparer':
+        reference, courant = lire_resultats(args.reference), lire_resultats(args.courant)
+    else:
+        courant = mesurer(args.echelles or ['national', 'communes', 'multi_pays'],
+                          args.repetitions, args.graine, args.etape)
+        if args.sortie:
+            ecrire_resultats(courant, args.sortie)
+            print(f"\n✅ Résultats enregistrés : {args.sortie}")
+        if not os.path.exists(args.reference) or os.path.abspath(args.reference) == os.path.abspath(args.sortie or ''):
+            return
+        reference = lire_resultats(args.reference)
+    comparaison = comparer(reference, courant, args.seuil)
+    if args.commande == 'mesurer':
+        # Étapes non mesurées cette fois (--echelle, --etape) : pas de statut « absente »
+        comparaison = comparaison[comparaison['Statut'] != 'absente']
+    if afficher_comparaison(comparaison, reference, courant, args.seuil):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Benchmark - Validation des données
+Mesure le temps d'évaluation de toutes les règles de validation sur un
+extrait multi-pays au niveau communal de plusieurs millions de lignes
+(séries Pays × Region), avec quelques incohérences injectées.
+
+Usage: python benchmarks/bench_validation.py [--regions 546] [--annees 250] [--pays 15]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_memoire import extrait_multi_pays  # noqa: E402
+from stockage import appliquer_schema  # noqa: E402
+from validation import REGLES, afficher_violations, valider  # noqa: E402
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--regions', type=int, default=546)
+    parser.add_argument('--annees', type=int, default=250)
+    parser.add_argument('--pays', type=int, default=15)
+    parser.add_argument('--repetitions', type=int, default=5)
+    args = parser.parse_args()
+
+    population = extrait_multi_pays(args.regions, args.annees, args.pays)
+    population = appliquer_schema(population, 'population').astype({'Pays': 'category', 'Region': 'category'})
+    # Incohérences injectées : identité, plage et tendance
+    population.loc[population.index[::100_000], 'Population_Rurale'] += 1
+    population.loc[population.index[7], 'Pct_Urbain'] = 140.0
+    datasets = {'population': population}
+
+    print("\n" + "="*70)
+    print(f"  BENCHMARK - VALIDATION ({len(population):,} lignes, {len(REGLES)} règles)")
+    print("="*70 + "\n")
+    meilleur = float('inf')
+    for _ in range(args.repetitions):
+        debut = time.perf_counter()
+        rapport = valider(datasets)
+        meilleur = min(meilleur, time.perf_counter() - debut)
+    afficher_violations(rapport)
+    print(f"Meilleur temps : {meilleur * 1000:.0f} ms "
+          f"({len(population) / meilleur / 1e6:.1f} M lignes/s)\n")
+
+if __name__ == "__main__":
+    main()
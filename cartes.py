@@ -0,0 +1,292 @@
+"""
+Cartes choroplèthes - Dashboard Démographique Bénin
+Auteur: Freud GUEDOU
+
+Cartes des indicateurs par département (cube d'indicateurs, une carte par
+année) ou par commune (hiérarchie), à partir des limites administratives
+d'un fichier local GeoJSON ou shapefile (le shapefile nécessite le paquet
+optionnel `pyshp`).
+
+Les géométries sont lues une seule fois : les contours extérieurs sont
+projetés (équirectangulaire centrée sur le pays, en km), simplifiés
+(Douglas-Peucker) et mis en cache sur disque (cache_geometries/), sous une
+clé formée de l'empreinte du fichier source et des paramètres. La grille
+année × indicateur est rendue avec une seule PolyCollection : pour chaque
+carte, seules les couleurs des polygones et le titre changent, redessinés
+par blitting sur un fond (axes, barre de couleurs) dessiné une fois par
+indicateur. Les cartes sont assemblées en une mosaïque PNG.
+"""
+
+import json
+import os
+import unicodedata
+
+import numpy as np
+from matplotlib import colormaps, style
+from matplotlib.cm import ScalarMappable
+from matplotlib.collections import PolyCollection
+from matplotlib.colors import LogNorm, Normalize
+from matplotlib.figure import Figure
+from PIL import Image
+
+from animation import STYLE, _images_blit
+from cube_kpi import tranche_annee
+from hierarchie import tranche_niveau
+from manifeste import empreinte_fichier
+from stockage import REPERTOIRE_SORTIE
+
+REPERTOIRE_CACHE_GEOMETRIES = 'cache_geometries'
+VERSION_CACHE = 1  # à incrémenter si le format du cache change
+RAYON_TERRE_KM = 6371.0
+TOLERANCE_KM = 0.5  # tolérance de simplification des contours
+DPI_CARTE = 100
+COULEUR_ABSENTE = '#d0d0d0'  # unités sans valeur
+
+# Propriétés candidates pour le nom des unités (GADM, geoBoundaries, OCHA, saisie libre)
+CHAMPS_NOM = ('Departement', 'Commune', 'NAME_1', 'NAME_2', 'shapeName', 'ADM1_FR', 'ADM2_FR', 'nom', 'name')
+
+# Indicateurs cartographiables : colonne -> (libellé, palette, échelle logarithmique)
+INDICATEURS_CARTE = {
+    'Densite_km2': ('Densité (hab/km²)', 'YlOrRd', True),
+    'Taux_Urbanisation_%': ("Taux d'urbanisation (%)", 'Blues', False),
+    'Population': ('Population', 'viridis', True),
+    'Taux_Croissance_%': ('Croissance annuelle (%)', 'RdYlGn', False),
+    'Age_Median_Ans': ('Âge médian (ans)', 'PuBu', False),
+}
+
+def cle_nom(nom):
+    """
+    Clé de rapprochement d'un nom d'unité : sans accents, casse ni séparateurs
+    (Ouémé, OUEME et Oueme donnent la même clé)
+    """
+    sans_accents = unicodedata.normalize('NFKD', str(nom)).encode('ascii', 'ignore').decode('ascii')
+    return ''.join(caractere for caractere in sans_accents.lower() if caractere.isalnum())
+
+def _champ_nom(proprietes, champ=None):
+    """
+    Nom d'une unité d'après ses propriétés (champ imposé ou premier champ connu)
+    """
+    if champ is not None:
+        return str(proprietes[champ])
+    for candidat in CHAMPS_NOM:
+        if proprietes.get(candidat) not in (None, ''):
+            return str(proprietes[candidat])
+    raise ValueError(f"aucun champ de nom parmi {', '.join(CHAMPS_NOM)} : préciser le champ")
+
+def lire_geojson(chemin, champ=None):
+    """
+    Lit les contours extérieurs (lon, lat) des polygones d'un GeoJSON.
+    Retourne une liste [(nom, [anneau, ...]), ...] ; les trous sont ignorés
+    """
+    with open(chemin, encoding='utf-8') as f:
+        collection = json.load(f)
+    unites = []
+    for entite in collection['features']:
+        geometrie = entite['geometry']
+        if geometrie['type'] == 'Polygon':
+            polygones = [geometrie['coordinates']]
+        elif geometrie['type'] == 'MultiPolygon':
+            polygones = geometrie['coordinates']
+        else:
+            continue
+        anneaux = [np.asarray(polygone[0], dtype=np.float64)[:, :2] for polygone in polygones]
+        unites.append((_champ_nom(entite.get('properties') or {}, champ), anneaux))
+    return unites
+
+def _aire_signee(anneau):
+    """
+    Aire signée d'un anneau (positive dans le sens trigonométrique)
+    """
+    x, y = anneau[:, 0], anneau[:, 1]
+    return 0.5 * (np.dot(x[:-1], y[1:]) - np.dot(x[1:], y[:-1]))
+
+def lire_shapefile(chemin, champ=None):
+    """
+    Lit les contours extérieurs (lon, lat) des polygones d'un shapefile (paquet pyshp).
+    Retourne une liste [(nom, [anneau, ...]), ...] ; les trous sont ignorés
+    """
+    try:
+        import shapefile
+    except ImportError:
+        raise ImportError("La lecture des shapefiles nécessite pyshp : pip install pyshp") from None
+    unites = []
+    with shapefile.Reader(chemin) as lecteur:
+        for forme, enregistrement in zip(lecteur.iterShapes(), lecteur.iterRecords()):
+            points = np.asarray(forme.points, dtype=np.float64)
+            bornes = list(forme.parts) + [len(points)]
+            # Contours extérieurs dans le sens horaire, trous dans le sens trigonométrique
+            anneaux = [points[debut:fin] for debut, fin in zip(bornes[:-1], bornes[1:])
+                       if _aire_signee(points[debut:fin]) < 0]
+            unites.append((_champ_nom(enregistrement.as_dict(), champ), anneaux))
+    return unites
+
+def projeter(anneau, latitude_origine):
+    """
+    Projection équirectangulaire (km) centrée sur la latitude d'origine :
+    déformation négligeable à l'échelle d'un pays comme le Bénin
+    """
+    facteur = np.pi / 180 * RAYON_TERRE_KM
+    return np.column_stack([anneau[:, 0] * facteur * np.cos(np.radians(latitude_origine)),
+                            anneau[:, 1] * facteur])
+
+def simplifier(points, tolerance):
+    """
+    Simplifie une ligne ou un anneau fermé (algorithme de Douglas-Peucker) :
+    retire les sommets à moins de `tolerance` de la corde qui les entoure
+    """
+    n = len(points)
+    if n <= 4 or tolerance <= 0:
+        return points
+    garder = np.zeros(n, dtype=bool)
+    garder[[0, -1]] = True
+    pile = [(0, n - 1)]
+    while pile:
+        debut, fin = pile.pop()
+        if fin - debut < 2:
+            continue
+        a, b = points[debut], points[fin]
+        segment = points[debut + 1:fin]
+        ab = b - a
+        longueur = np.hypot(ab[0], ab[1])
+        if longueur == 0:
+            # Anneau fermé : distance au point de départ
+            distances = np.hypot(segment[:, 0] - a[0], segment[:, 1] - a[1])
+        else:
+            distances = np.abs(ab[0] * (segment[:, 1] - a[1]) - ab[1] * (segment[:, 0] - a[0])) / longueur
+        i = int(np.argmax(distances))
+        if distances[i] > tolerance:
+            milieu = debut + 1 + i
+            garder[milieu] = True
+            pile += [(debut, milieu), (milieu, fin)]
+    resultat = points[garder]
+    return resultat if len(resultat) >= 4 else points
+
+def preparer_geometries(unites, tolerance=TOLERANCE_KM):
+    """
+    Projette et simplifie des unités [(nom, [anneau, ...]), ...].
+    Retourne un dictionnaire : noms des unités, anneaux projetés (km) et unité de chaque anneau
+    """
+    latitudes = np.concatenate([anneau[:, 1] for _, anneaux in unites for anneau in anneaux])
+    origine = (latitudes.min() + latitudes.max()) / 2
+    anneaux, indices = [], []
+    for i, (_, contours) in enumerate(unites):
+        for anneau in contours:
+            anneaux.append(simplifier(projeter(anneau, origine), tolerance).astype(np.float32))
+            indices.append(i)
+    return {'noms': [nom for nom, _ in unites], 'anneaux': anneaux,
+            'unites': np.asarray(indices, dtype=np.int32)}
+
+def charger_geometries(chemin, champ=None, tolerance=TOLERANCE_KM, repertoire_cache=None):
+    """
+    Géométries simplifiées et projetées d'un fichier GeoJSON ou shapefile, lues dans
+    le cache disque si le fichier source et les paramètres n'ont pas changé
+    (voir preparer_geometries)
+    """
+    repertoire_cache = os.path.join(repertoire_cache or REPERTOIRE_SORTIE, REPERTOIRE_CACHE_GEOMETRIES)
+    cle = empreinte_fichier(chemin)[:16]
+    base = os.path.splitext(os.path.basename(chemin))[0]
+    fichier_cache = os.path.join(repertoire_cache,
+                                 f'{base}_{cle}_{champ or "auto"}_{tolerance:g}_v{VERSION_CACHE}.npz')
+    if os.path.exists(fichier_cache):
+        with np.load(fichier_cache) as cache:
+            return {'noms': cache['noms'].tolist(),
+                    'anneaux': np.split(cache['sommets'], cache['bornes']),
+                    'unites': cache['unites']}
+
+    lire = lire_shapefile if chemin.lower().endswith('.shp') else lire_geojson
+    geometries = preparer_geometries(lire(chemin, champ), tolerance)
+    os.makedirs(repertoire_cache, exist_ok=True)
+    longueurs = np.array([len(anneau) for anneau in geometries['anneaux']])
+    np.savez(fichier_cache, noms=np.array(geometries['noms']), unites=geometries['unites'],
+             sommets=np.concatenate(geometries['anneaux']), bornes=np.cumsum(longueurs)[:-1])
+    return geometries
+
+def valeurs_par_anneau(geometries, tranche, indicateur):
+    """
+    Valeur de l'indicateur pour chaque anneau des géométries (NaN si l'unité
+    n'existe pas dans la tranche), les noms étant rapprochés par cle_nom
+    """
+    positions = {cle_nom(nom): i for i, nom in enumerate(tranche.index)}
+    valeurs = tranche[indicateur].to_numpy(dtype=np.float64)
+    par_unite = np.array([valeurs[positions[cle]] if cle in positions else np.nan
+                          for cle in map(cle_nom, geometries['noms'])])
+    return par_unite[geometries['unites']]
+
+def unites_absentes(geometries, tranche):
+    """
+    Unités de la tranche sans géométrie (noms à corriger dans le fichier de limites)
+    """
+    cles = {cle_nom(nom) for nom in geometries['noms']}
+    return [nom for nom in tranche.index if cle_nom(nom) not in cles]
+
+def _norme(valeurs, logarithmique):
+    """
+    Normalisation commune à toutes les cartes d'un indicateur
+    """
+    valeurs = valeurs[np.isfinite(valeurs)]
+    if logarithmique and len(valeurs) and valeurs.min() > 0:
+        return LogNorm(valeurs.min(), valeurs.max())
+    return Normalize(valeurs.min() if len(valeurs) else 0, valeurs.max() if len(valeurs) else 1)
+
+def rendre_grille_cartes(geometries, tranches, indicateurs=None, repertoire_sortie=None,
+                         fichier='viz_cartes_departements.png', titre='{indicateur} - {tranche}',
+                         dpi=DPI_CARTE):
+    """
+    Grille de cartes choroplèthes : une ligne par tranche (année...), une colonne par
+    indicateur. `tranches` associe un libellé à un DataFrame indexé par nom d'unité.
+    Chaque indicateur a une échelle de couleurs commune à toutes ses cartes ; par défaut,
+    tous les indicateurs de INDICATEURS_CARTE présents dans les tranches sont cartographiés.
+    Retourne le chemin de la mosaïque PNG
+    """
+    libelles = list(tranches)
+    indicateurs = list(indicateurs or [indicateur for indicateur in INDICATEURS_CARTE
+                                       if indicateur in tranches[libelles[0]].columns])
+    sommets = np.concatenate(geometries['anneaux'])
+    marge = 0.03 * np.ptp(sommets, axis=0)
+
+    with style.context(STYLE):
+        fig = Figure(figsize=(5, 5.6), dpi=dpi)
+        ax = fig.add_axes([0.02, 0.02, 0.74, 0.88])
+        cax = fig.add_axes([0.80, 0.12, 0.04, 0.7])
+        # Géométrie construite une seule fois : seules les couleurs changent ensuite
+        collection = PolyCollection(geometries['anneaux'], edgecolors='white', linewidths=0.4)
+        ax.add_collection(collection)
+        ax.set_xlim(sommets[:, 0].min() - marge[0], sommets[:, 0].max() + marge[0])
+        ax.set_ylim(sommets[:, 1].min() - marge[1], sommets[:, 1].max() + marge[1])
+        ax.set_aspect('equal')
+        ax.set_axis_off()
+        texte = fig.suptitle('', fontsize=12, fontweight='bold', y=0.97)
+
+    colonnes = []
+    for indicateur in indicateurs:
+        libelle, palette, logarithmique = INDICATEURS_CARTE.get(indicateur, (indicateur, 'viridis', False))
+        valeurs = np.array([valeurs_par_anneau(geometries, tranches[cle], indicateur) for cle in libelles])
+        norme = _norme(valeurs.ravel(), logarithmique)
+        cmap = colormaps[palette].with_extremes(bad=COULEUR_ABSENTE)
+        cax.clear()
+        fig.colorbar(ScalarMappable(norm=norme, cmap=cmap), cax=cax).set_label(libelle, fontsize=9)
+
+        def mettre_a_jour(i):
+            collection.set_facecolor(cmap(norme(np.ma.masked_invalid(valeurs[i]))))
+            texte.set_text(titre.format(indicateur=libelle.split(' (')[0], tranche=libelles[i]))
+
+        images = _images_blit(fig, [collection, texte], mettre_a_jour, len(libelles))
+        colonnes.append(np.concatenate([image[:, :, :3].copy() for image in images]))
+
+    chemin = os.path.join(repertoire_sortie or REPERTOIRE_SORTIE, fichier)
+    Image.fromarray(np.concatenate(colonnes, axis=1)).save(chemin, compress_level=1)
+    print(f"✅ Sauvegardé: {fichier}\n")
+    return chemin
+
+def tranches_departements(cube, annees=None):
+    """
+    Tranches annuelles du cube d'indicateurs (départements), pour rendre_grille_cartes
+    """
+    annees = annees or sorted(cube.index.get_level_values('Annee').unique())
+    return {annee: tranche_annee(cube, annee) for annee in annees}
+
+def tranches_niveau(hierarchie, niveau='commune'):
+    """
+    Tranche d'un niveau de la hiérarchie (année de référence), pour rendre_grille_cartes
+    """
+    return {'référence': tranche_niveau(hierarchie, niveau)}
@@ -4,33 +4,109 @@ Auteur: Freud GUEDOU
 Date: Octobre 2024
 
 Script de création de visualisations pour le dashboard démographique du Bénin
+(et des autres pays de la CEDEAO, voir rendre_pays)
 """
 
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
 import pandas as pd
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
 import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from PIL import Image
+
+import instrumentation
+from analytique import indicateurs_cles
+from cube_kpi import a_departements, avec_cube, ligne_nationale, ordonner, serie_nationale, tranche_annee
+from hierarchie import avec_hierarchie, ligne_nationale_hierarchie, tranche_niveau
+from instrumentation import instrumenter, mesurer
+from manifeste import (
+    charger_manifeste, empreinte_artefact, empreinte_dataframe, empreinte_fonction,
+    enregistrer_artefact, est_a_jour, sauvegarder_manifeste
+)
+from pays import PAYS, PAYS_DEFAUT
+from stockage import FORMATS, REPERTOIRE_SORTIE, lire_dataset, rapport_memoire
 
 # Configuration
-plt.rcParams['figure.figsize'] = (12, 7)
-plt.rcParams['font.size'] = 10
-plt.style.use('seaborn-v0_8-darkgrid')
+DPI = 300
+STYLE = 'seaborn-v0_8-darkgrid'
+
+# Profils de rendu : nom -> sorties (format, dpi, recadrage serré).
+# Les PNG d'une figure sont extraits d'un même rendu matriciel (rasteriser) ; preview garde la figure entière.
+PROFILS_RENDU = {
+    'preview': [('png', 40, False)],
+    'web': [('png', 110, True)],
+    'print': [('pdf', None, True), ('svg', None, True), ('png', DPI, True)],
+}
+REPERTOIRE_CACHE_RENDUS = 'cache_rendus'
+
+# Capture de figure : quand elle est active, _sauvegarder_figure garde la figure en mémoire
+_CAPTURE = {'actif': False, 'figure': None}
+
+# Pays des figures en cours de rendu (titres) et style déjà appliqué
+_CONTEXTE = {'pays': PAYS_DEFAUT, 'style': False}
+
+# Libellés des niveaux de la hiérarchie (analyse par département, commune, arrondissement)
+LIBELLES_NIVEAUX = {'departement': 'Département', 'commune': 'Commune', 'arrondissement': 'Arrondissement'}
+
+def configurer_style():
+    """
+    Applique le style et les tailles par défaut des figures, une fois par processus,
+    au premier rendu plutôt qu'à l'import du module
+    """
+    if _CONTEXTE.get('style'):
+        return
+    plt.rcParams['figure.figsize'] = (12, 7)
+    plt.rcParams['font.size'] = 10
+    plt.style.use(STYLE)
+    _CONTEXTE['style'] = True
+
+def _pays(forme='nom'):
+    """
+    Nom du pays courant pour les titres ('nom' : Bénin, 'de' : du Bénin)
+    """
+    return PAYS[_CONTEXTE['pays']][forme]
 
-def charger_donnees():
+def _sauvegarder_figure(fichier, repertoire_sortie=None, mise_en_page=True):
     """
-    Charge tous les fichiers de données
+    Met en page (tight_layout), enregistre puis ferme la figure courante
+    """
+    chemin = os.path.join(repertoire_sortie or REPERTOIRE_SORTIE, fichier)
+    if mise_en_page:
+        with mesurer('tight_layout'):
+            plt.tight_layout()
+    if _CAPTURE['actif']:
+        _CAPTURE['figure'] = plt.gcf()
+        return
+    with mesurer('savefig', [chemin]):
+        plt.savefig(chemin, dpi=DPI, bbox_inches='tight')
+    print(f"✅ Sauvegardé: {fichier}\n")
+    plt.close()
+
+@instrumenter
+def charger_donnees(format='csv', repertoire=None):
+    """
+    Charge tous les fichiers de données (csv, parquet ou feather)
     """
     print("📂 Chargement des données...")
+    repertoire = repertoire or REPERTOIRE_SORTIE
     
-    df_pop = pd.read_csv('/mnt/user-data/outputs/donnees_population_benin.csv')
-    df_age = pd.read_csv('/mnt/user-data/outputs/donnees_structure_age.csv')
-    df_dept = pd.read_csv('/mnt/user-data/outputs/donnees_departements.csv')
-    df_social = pd.read_csv('/mnt/user-data/outputs/donnees_indicateurs_sociaux.csv')
+    df_pop = lire_dataset('population', repertoire, format)
+    df_age = lire_dataset('structure_age', repertoire, format)
+    df_dept = lire_dataset('departements', repertoire, format)
+    df_social = lire_dataset('indicateurs_sociaux', repertoire, format)
     
     print("✅ Données chargées avec succès!\n")
+    rapport_memoire({'population': df_pop, 'structure_age': df_age,
+                     'departements': df_dept, 'indicateurs_sociaux': df_social})
     return df_pop, df_age, df_dept, df_social
 
-def visualiser_evolution_population(df_pop):
+@instrumenter
+def visualiser_evolution_population(df_pop, repertoire_sortie=None):
     """
     Graphique de l'évolution de la population totale
     """
@@ -43,7 +119,8 @@ def visualiser_evolution_population(df_pop):
              linewidth=3, color='#2c3e50', marker='o', markersize=4)
     ax1.fill_between(df_pop['Annee'], df_pop['Population_Totale']/1e6, 
                       alpha=0.3, color='#3498db')
-    ax1.set_title('Évolution de la Population du Bénin (1990-2024)', 
+    ax1.set_title(f"Évolution de la Population {_pays('de')} "
+                  f"({df_pop['Annee'].iloc[0]}-{df_pop['Annee'].iloc[-1]})", 
                   fontsize=16, fontweight='bold', pad=20)
     ax1.set_xlabel('Année', fontsize=12)
     ax1.set_ylabel('Population (millions)', fontsize=12)
@@ -69,16 +146,15 @@ def visualiser_evolution_population(df_pop):
     ax2.legend(loc='upper left', fontsize=11)
     ax2.grid(True, alpha=0.3)
     
-    plt.tight_layout()
-    plt.savefig('/mnt/user-data/outputs/viz_evolution_population.png', dpi=300, bbox_inches='tight')
-    print("✅ Sauvegardé: viz_evolution_population.png\n")
-    plt.close()
+    _sauvegarder_figure('viz_evolution_population.png', repertoire_sortie)
 
-def visualiser_pyramide_age(df_age):
+@instrumenter
+def visualiser_pyramide_age(df_age, repertoire_sortie=None, annee=2024,
+                            fichier='viz_pyramide_ages.png', limite_x=None):
     """
-    Pyramide des âges
+    Pyramide des âges (`limite_x`, en milliers, fixe l'échelle pour comparer plusieurs années)
     """
-    print("📊 Création: Pyramide des âges...")
+    print(f"📊 Création: Pyramide des âges ({annee})...")
     
     fig, ax = plt.subplots(figsize=(12, 10))
     
@@ -95,81 +171,107 @@ def visualiser_pyramide_age(df_age):
     ax.set_yticks(y_pos)
     ax.set_yticklabels(df_age['Groupe_Age'])
     ax.set_xlabel('Population (milliers)', fontsize=12)
-    ax.set_title('Pyramide des Âges du Bénin (2024)', 
+    ax.set_title(f"Pyramide des Âges {_pays('de')} ({annee})", 
                  fontsize=16, fontweight='bold', pad=20)
     ax.axvline(0, color='black', linewidth=0.8)
     ax.legend(loc='upper right', fontsize=11)
     ax.grid(True, alpha=0.3, axis='x')
     
     # Ajuster les limites x pour symétrie
-    max_val = max(abs(hommes).max(), femmes.max())
+    max_val = limite_x or max(abs(hommes).max(), femmes.max())
     ax.set_xlim(-max_val*1.1, max_val*1.1)
     
     # Formater les labels de l'axe x en valeurs absolues
     ax.set_xticklabels([f'{abs(int(x))}' for x in ax.get_xticks()])
     
-    plt.tight_layout()
-    plt.savefig('/mnt/user-data/outputs/viz_pyramide_ages.png', dpi=300, bbox_inches='tight')
-    print("✅ Sauvegardé: viz_pyramide_ages.png\n")
-    plt.close()
+    _sauvegarder_figure(fichier, repertoire_sortie)
 
-def visualiser_departements(df_dept):
+def visualiser_pyramides_projetees(df_pyramides, annees=None, repertoire_sortie=None):
     """
-    Visualisations par département
+    Une pyramide par année projetée (sortie de projection.pyramides_par_annee),
+    à échelle commune pour que les années restent comparables
     """
-    print("📊 Création: Analyse par département...")
+    annees = sorted(df_pyramides['Annee'].unique()) if annees is None else annees
+    limite_x = df_pyramides[['Hommes', 'Femmes']].to_numpy().max() / 1000
+    for annee in annees:
+        visualiser_pyramide_age(df_pyramides[df_pyramides['Annee'] == annee],
+                                repertoire_sortie, annee=annee,
+                                fichier=f'viz_pyramide_ages_{annee}.png', limite_x=limite_x)
+
+@instrumenter
+def visualiser_departements(cube, repertoire_sortie=None, niveau='departement', hierarchie=None, n=15):
+    """
+    Visualisations par département (lues dans le cube d'indicateurs, dernière année).
+    Avec niveau='commune' ou 'arrondissement', descend dans la hiérarchie : les
+    agrégats précalculés du niveau sont lus dans `hierarchie` et seules les `n`
+    unités en tête de chaque classement sont affichées
+    """
+    libelle = LIBELLES_NIVEAUX[niveau]
+    print(f"📊 Création: Analyse par {libelle.lower()}...")
     
     fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(16, 12))
-    
-    # Trier par population
-    df_sorted = df_dept.sort_values('Population', ascending=True)
-    
-    # 1. Population par département
+    if niveau == 'departement':
+        df_dept = tranche_annee(cube)
+        moyenne_nationale = ligne_nationale(cube)['Taux_Urbanisation_%']
+        n, suffixe = None, ''
+    else:
+        df_dept = tranche_niveau(hierarchie, niveau)
+        moyenne_nationale = ligne_nationale_hierarchie(hierarchie)['Taux_Urbanisation_%']
+        suffixe = f' (Top {n})'
+    
+    # Ordonner par population (rangs précalculés)
+    df_sorted = ordonner(df_dept, 'Rang_Population', n=n, croissant=True)
+    
+    # 1. Population par unité
     colors1 = plt.cm.viridis(np.linspace(0.3, 0.9, len(df_sorted)))
-    ax1.barh(df_sorted['Departement'], df_sorted['Population']/1000, color=colors1)
+    ax1.barh(df_sorted.index, df_sorted['Population']/1000, color=colors1)
     ax1.set_xlabel('Population (milliers)', fontsize=11)
-    ax1.set_title('Population par Département', fontsize=13, fontweight='bold')
+    ax1.set_title(f'Population par {libelle}{suffixe}', fontsize=13, fontweight='bold')
     ax1.grid(True, alpha=0.3, axis='x')
     
     # 2. Densité de population
-    df_density = df_dept.sort_values('Densite_km2', ascending=True)
+    df_density = ordonner(df_dept, 'Rang_Densite', n=n, croissant=True)
     colors2 = plt.cm.RdYlGn_r(np.linspace(0.2, 0.8, len(df_density)))
-    ax2.barh(df_density['Departement'], df_density['Densite_km2'], color=colors2)
+    ax2.barh(df_density.index, df_density['Densite_km2'], color=colors2)
     ax2.set_xlabel('Densité (hab/km²)', fontsize=11)
-    ax2.set_title('Densité de Population par Département', fontsize=13, fontweight='bold')
+    ax2.set_title(f'Densité de Population par {libelle}{suffixe}', fontsize=13, fontweight='bold')
     ax2.grid(True, alpha=0.3, axis='x')
     
     # 3. Part de la population nationale
-    top10 = df_dept.nlargest(10, 'Pct_Population_Nationale')
+    top10 = ordonner(df_dept, 'Rang_Population', n=10)
     colors3 = plt.cm.Set3(np.linspace(0, 1, len(top10)))
     wedges, texts, autotexts = ax3.pie(top10['Pct_Population_Nationale'], 
-                                         labels=top10['Departement'],
+                                         labels=top10.index,
                                          autopct='%1.1f%%',
                                          colors=colors3,
                                          startangle=90)
-    ax3.set_title('Répartition de la Population Nationale\n(Top 10 Départements)', 
+    ax3.set_title(f'Répartition de la Population Nationale\n(Top 10 {libelle}s)', 
                   fontsize=13, fontweight='bold')
     for autotext in autotexts:
         autotext.set_color('black')
         autotext.set_fontsize(9)
     
-    # 4. Taux d'urbanisation par département
-    df_urban = df_dept.sort_values('Taux_Urbanisation_%', ascending=True)
+    # 4. Taux d'urbanisation par unité
+    df_urban = ordonner(df_dept, 'Rang_Urbanisation', n=n, croissant=True)
     colors4 = plt.cm.coolwarm(np.linspace(0.2, 0.8, len(df_urban)))
-    ax4.barh(df_urban['Departement'], df_urban['Taux_Urbanisation_%'], color=colors4)
+    ax4.barh(df_urban.index, df_urban['Taux_Urbanisation_%'], color=colors4)
     ax4.set_xlabel('Taux d\'Urbanisation (%)', fontsize=11)
-    ax4.set_title('Taux d\'Urbanisation par Département', fontsize=13, fontweight='bold')
+    ax4.set_title(f'Taux d\'Urbanisation par {libelle}{suffixe}', fontsize=13, fontweight='bold')
     ax4.grid(True, alpha=0.3, axis='x')
-    ax4.axvline(df_dept['Taux_Urbanisation_%'].mean(), color='red', 
+    ax4.axvline(moyenne_nationale, color='red', 
                 linestyle='--', linewidth=2, label='Moyenne nationale')
     ax4.legend()
     
-    plt.tight_layout()
-    plt.savefig('/mnt/user-data/outputs/viz_analyse_departements.png', dpi=300, bbox_inches='tight')
-    print("✅ Sauvegardé: viz_analyse_departements.png\n")
-    plt.close()
+    _sauvegarder_figure(f'viz_analyse_{niveau}s.png', repertoire_sortie)
+
+def visualiser_communes(cube, hierarchie, repertoire_sortie=None):
+    """
+    Analyse par commune (niveau commune de la hiérarchie)
+    """
+    visualiser_departements(cube, repertoire_sortie, niveau='commune', hierarchie=hierarchie)
 
-def visualiser_indicateurs_sociaux(df_social):
+@instrumenter
+def visualiser_indicateurs_sociaux(df_social, repertoire_sortie=None):
     """
     Indicateurs sociaux
     """
@@ -212,19 +314,20 @@ def visualiser_indicateurs_sociaux(df_social):
     ax3.legend()
     ax3.grid(True, alpha=0.3)
     
-    # 4. Comparaison 2010 vs 2024
+    # 4. Comparaison première vs dernière année
     derniere_annee = df_social.iloc[-1]
     premiere_annee = df_social.iloc[0]
+    debut, fin = int(premiere_annee['Annee']), int(derniere_annee['Annee'])
     
     categories = ['Alphabétisation\n(Moyenne)', 'Scolarisation\nPrimaire', 
                   'Eau Potable', 'Électricité']
-    valeurs_2010 = [
+    valeurs_debut = [
         (premiere_annee['Taux_Alphabetisation_Hommes_%'] + premiere_annee['Taux_Alphabetisation_Femmes_%'])/2,
         premiere_annee['Taux_Scolarisation_Primaire_%'],
         premiere_annee['Acces_Eau_Potable_%'],
         premiere_annee['Acces_Electricite_%']
     ]
-    valeurs_2024 = [
+    valeurs_fin = [
         (derniere_annee['Taux_Alphabetisation_Hommes_%'] + derniere_annee['Taux_Alphabetisation_Femmes_%'])/2,
         derniere_annee['Taux_Scolarisation_Primaire_%'],
         derniere_annee['Acces_Eau_Potable_%'],
@@ -234,9 +337,9 @@ def visualiser_indicateurs_sociaux(df_social):
     x = np.arange(len(categories))
     width = 0.35
     
-    ax4.bar(x - width/2, valeurs_2010, width, label='2010', color='#95a5a6')
-    ax4.bar(x + width/2, valeurs_2024, width, label='2024', color='#2ecc71')
-    ax4.set_title('Progrès des Indicateurs Sociaux (2010 vs 2024)', 
+    ax4.bar(x - width/2, valeurs_debut, width, label=str(debut), color='#95a5a6')
+    ax4.bar(x + width/2, valeurs_fin, width, label=str(fin), color='#2ecc71')
+    ax4.set_title(f'Progrès des Indicateurs Sociaux ({debut} vs {fin})', 
                   fontsize=13, fontweight='bold')
     ax4.set_ylabel('Taux (%)', fontsize=11)
     ax4.set_xticks(x)
@@ -244,17 +347,24 @@ def visualiser_indicateurs_sociaux(df_social):
     ax4.legend()
     ax4.grid(True, alpha=0.3, axis='y')
     
-    plt.tight_layout()
-    plt.savefig('/mnt/user-data/outputs/viz_indicateurs_sociaux.png', dpi=300, bbox_inches='tight')
-    print("✅ Sauvegardé: viz_indicateurs_sociaux.png\n")
-    plt.close()
+    _sauvegarder_figure('viz_indicateurs_sociaux.png', repertoire_sortie)
 
-def creer_dashboard_resume(df_pop, df_age, df_dept):
+@instrumenter
+def creer_dashboard_resume(cube, repertoire_sortie=None):
     """
-    Crée un dashboard résumé avec les KPIs principaux
+    Crée un dashboard résumé avec les KPIs principaux : lus dans le cube d'indicateurs
+    ou calculés sur sa série nationale (croissance, TCAM, décomposition urbain/rural,
+    prévision de la population, voir analytique.indicateurs_cles).
+    Pour un pays sans subdivisions (cube réduit à la ligne nationale), le classement
+    des départements est remplacé par la répartition urbain/rural de la série nationale
     """
     print("📊 Création: Dashboard résumé...")
     
+    serie = serie_nationale(cube)
+    annee = serie.index[-1]
+    kpis = serie.iloc[-1]
+    calcules = indicateurs_cles(cube)
+    
     fig = plt.figure(figsize=(16, 10))
     gs = fig.add_gridspec(3, 3, hspace=0.3, wspace=0.3)
     
@@ -264,23 +374,24 @@ def creer_dashboard_resume(df_pop, df_age, df_dept):
     
     # KPI 1: Population actuelle
     ax1 = fig.add_subplot(gs[0, 0])
-    ax1.text(0.5, 0.7, f"{df_pop['Population_Totale'].iloc[-1]/1e6:.2f}M", 
+    ax1.text(0.5, 0.7, f"{kpis['Population']/1e6:.2f}M", 
              ha='center', va='center', fontsize=40, fontweight='bold', color=color_primary)
-    ax1.text(0.5, 0.3, 'Population Totale\n(2024)', 
+    ax1.text(0.5, 0.3, f'Population Totale\n({annee})', 
              ha='center', va='center', fontsize=14, color='gray')
     ax1.axis('off')
     
     # KPI 2: Taux de croissance
     ax2 = fig.add_subplot(gs[0, 1])
-    ax2.text(0.5, 0.7, f"+{df_pop['Taux_Croissance_%'].iloc[-1]:.1f}%", 
+    ax2.text(0.5, 0.7, f"{calcules['croissance_%']:+.1f}%", 
              ha='center', va='center', fontsize=40, fontweight='bold', color='#27ae60')
-    ax2.text(0.5, 0.3, 'Taux de Croissance\nAnnuel', 
+    ax2.text(0.5, 0.25, f"Taux de Croissance Annuel\n(urbain {calcules['contribution_urbaine_pts']:+.1f} pts, "
+             f"rural {calcules['contribution_rurale_pts']:+.1f} pts)", 
              ha='center', va='center', fontsize=14, color='gray')
     ax2.axis('off')
     
     # KPI 3: Âge médian
     ax3 = fig.add_subplot(gs[0, 2])
-    ax3.text(0.5, 0.7, '18 ans', 
+    ax3.text(0.5, 0.7, f"{kpis['Age_Median_Ans']:.0f} ans", 
              ha='center', va='center', fontsize=40, fontweight='bold', color='#e74c3c')
     ax3.text(0.5, 0.3, 'Âge Médian\n(Population jeune)', 
              ha='center', va='center', fontsize=14, color='gray')
@@ -288,27 +399,41 @@ def creer_dashboard_resume(df_pop, df_age, df_dept):
     
     # Graphique: Évolution population (petit)
     ax4 = fig.add_subplot(gs[1, :])
-    ax4.plot(df_pop['Annee'], df_pop['Population_Totale']/1e6, 
+    ax4.plot(serie.index, serie['Population']/1e6, 
              linewidth=3, color=color_accent)
-    ax4.fill_between(df_pop['Annee'], df_pop['Population_Totale']/1e6, alpha=0.3, color=color_accent)
-    ax4.set_title('Croissance de la Population (1990-2024)', fontsize=14, fontweight='bold')
+    ax4.fill_between(serie.index, serie['Population']/1e6, alpha=0.3, color=color_accent)
+    annees_prevision = np.concatenate([[annee], calcules['annees_prevision']])
+    ax4.plot(annees_prevision, np.concatenate([[kpis['Population']], calcules['prevision_population']])/1e6,
+             linewidth=2.5, linestyle='--', color=color_primary,
+             label=f"Prévision {annees_prevision[-1]} : {calcules['prevision_population'][-1]/1e6:.1f}M")
+    ax4.legend(loc='upper left', fontsize=11)
+    ax4.set_title(f"Croissance de la Population ({serie.index[0]}-{annee}) : "
+                  f"TCAM {calcules['tcam_%']:+.2f}%, doublement en {calcules['doublement_ans']:.0f} ans "
+                  f"au rythme actuel", fontsize=14, fontweight='bold')
     ax4.set_ylabel('Population (millions)', fontsize=11)
     ax4.grid(True, alpha=0.3)
     
-    # Top 5 départements
+    # Top 5 départements (ou population urbaine / rurale sans subdivisions)
     ax5 = fig.add_subplot(gs[2, :2])
-    top5 = df_dept.nlargest(5, 'Population')
-    colors = plt.cm.viridis(np.linspace(0.3, 0.9, len(top5)))
-    ax5.barh(top5['Departement'], top5['Population']/1000, color=colors)
-    ax5.set_xlabel('Population (milliers)', fontsize=11)
-    ax5.set_title('Top 5 Départements les Plus Peuplés', fontsize=12, fontweight='bold')
-    ax5.grid(True, alpha=0.3, axis='x')
+    if a_departements(cube):
+        top5 = ordonner(tranche_annee(cube), 'Rang_Population', n=5)
+        colors = plt.cm.viridis(np.linspace(0.3, 0.9, len(top5)))
+        ax5.barh(top5.index, top5['Population']/1000, color=colors)
+        ax5.set_xlabel('Population (milliers)', fontsize=11)
+        ax5.set_title('Top 5 Départements les Plus Peuplés', fontsize=12, fontweight='bold')
+        ax5.grid(True, alpha=0.3, axis='x')
+    else:
+        urbaine = serie['Population'] * serie['Taux_Urbanisation_%'] / 100
+        ax5.stackplot(serie.index, urbaine/1e6, (serie['Population'] - urbaine)/1e6,
+                      labels=['Urbaine', 'Rurale'], colors=['#3498db', '#27ae60'], alpha=0.7)
+        ax5.set_ylabel('Population (millions)', fontsize=11)
+        ax5.set_title('Population Urbaine et Rurale', fontsize=12, fontweight='bold')
+        ax5.legend(loc='upper left', fontsize=10)
+        ax5.grid(True, alpha=0.3)
     
     # Répartition par genre (estimation)
     ax6 = fig.add_subplot(gs[2, 2])
-    total_hommes = df_age['Hommes'].sum()
-    total_femmes = df_age['Femmes'].sum()
-    sizes = [total_hommes, total_femmes]
+    sizes = [kpis['Pct_Hommes'], 100 - kpis['Pct_Hommes']]
     colors = ['#3498db', '#e74c3c']
     wedges, texts, autotexts = ax6.pie(sizes, labels=['Hommes', 'Femmes'], 
                                          autopct='%1.1f%%', colors=colors, startangle=90)
@@ -317,16 +442,335 @@ def creer_dashboard_resume(df_pop, df_age, df_dept):
         autotext.set_color('white')
         autotext.set_fontweight('bold')
     
-    plt.suptitle('DASHBOARD DÉMOGRAPHIQUE - BÉNIN 2024', 
+    plt.suptitle(f"DASHBOARD DÉMOGRAPHIQUE - {_pays().upper()} {annee}", 
                  fontsize=18, fontweight='bold', y=0.98)
     
-    plt.savefig('/mnt/user-data/outputs/viz_dashboard_resume.png', dpi=300, bbox_inches='tight')
-    print("✅ Sauvegardé: viz_dashboard_resume.png\n")
-    plt.close()
+    _sauvegarder_figure('viz_dashboard_resume.png', repertoire_sortie, mise_en_page=False)
+
+# Catalogue des figures : nom -> (fonction de rendu, jeux de données utilisés, fichier produit)
+FIGURES = {
+    'evolution_population': (visualiser_evolution_population, ('population',),
+                             'viz_evolution_population.png'),
+    'pyramide_ages': (visualiser_pyramide_age, ('structure_age',), 'viz_pyramide_ages.png'),
+    'analyse_departements': (visualiser_departements, ('cube',),
+                             'viz_analyse_departements.png'),
+    'analyse_communes': (visualiser_communes, ('cube', 'hierarchie'), 'viz_analyse_communes.png'),
+    'indicateurs_sociaux': (visualiser_indicateurs_sociaux, ('indicateurs_sociaux',),
+                            'viz_indicateurs_sociaux.png'),
+    'dashboard_resume': (creer_dashboard_resume, ('cube',), 'viz_dashboard_resume.png'),
+}
+
+# Figures qui nécessitent des subdivisions (le cube d'un pays sans subdivisions n'a que la ligne nationale)
+FIGURES_DEPARTEMENTALES = ('analyse_departements', 'analyse_communes')
+
+# Données partagées par les processus de rendu (chargées une seule fois par worker)
+_DONNEES_WORKER = {}
+
+def _initialiser_worker(donnees, instrumentation_active=False, pays=PAYS_DEFAUT):
+    """
+    Initialise un processus de rendu : backend Agg, données déjà chargées, pays
+    des titres et instrumentation si elle est active dans le processus principal
+    """
+    plt.switch_backend('Agg')
+    configurer_style()
+    _DONNEES_WORKER.update(donnees)
+    _CONTEXTE['pays'] = pays
+    if instrumentation_active:
+        instrumentation.activer(reinitialiser=True)
+
+def empreinte_figure(nom, donnees, empreintes=None, pays=None):
+    """
+    Empreinte d'une figure du catalogue : données utilisées, paramètres de rendu, code
+    et pays des titres (celui du rendu en cours par défaut).
+    Retourne (empreinte, entrees, parametres)
+    """
+    fonction, cles, _ = FIGURES[nom]
+    if empreintes is None:
+        empreintes = {cle: empreinte_dataframe(donnees[cle]) for cle in cles}
+    entrees = {cle: empreintes[cle] for cle in cles}
+    parametres = {'dpi': DPI, 'style': STYLE, 'fonction': fonction.__name__,
+                  'code': empreinte_fonction(fonction), 'pays': pays or _CONTEXTE['pays']}
+    return empreinte_artefact(entrees, parametres), entrees, parametres
+
+def construire_figure(nom, donnees):
+    """
+    Construit et met en page une figure du catalogue sans l'enregistrer.
+    Retourne l'objet Figure (à fermer par l'appelant avec plt.close)
+    """
+    configurer_style()
+    fonction, entrees, _ = FIGURES[nom]
+    _CAPTURE.update(actif=True, figure=None)
+    try:
+        fonction(*(donnees[cle] for cle in entrees))
+    finally:
+        _CAPTURE['actif'] = False
+    figure, _CAPTURE['figure'] = _CAPTURE['figure'], None
+    return figure
+
+def rasteriser(figure, sorties):
+    """
+    Produit toutes les sorties PNG d'une figure à partir d'un seul rendu matriciel.
+
+    La figure est dessinée une fois (Agg) à la plus haute résolution demandée ;
+    chaque sortie en est extraite (recadrée comme bbox_inches='tight' si demandé)
+    puis rééchantillonnée à sa résolution. `sorties` : liste de (chemin, dpi, serre)
+    """
+    dpi_max = max(dpi for _, dpi, _ in sorties)
+    figure.set_dpi(dpi_max)
+    canvas = FigureCanvasAgg(figure)
+    with mesurer(f'rendu_agg_{dpi_max}'):
+        canvas.draw()
+    image = Image.frombuffer('RGBA', canvas.get_width_height(), canvas.buffer_rgba(), 'raw', 'RGBA', 0, 1)
+    # Zone recadrée, en pixels (origine en haut à gauche), comme savefig(bbox_inches='tight')
+    cadre = figure.get_tightbbox(canvas.get_renderer()).padded(plt.rcParams['savefig.pad_inches'])
+    largeur, hauteur = figure.get_figwidth(), figure.get_figheight()
+    bornes = (max(cadre.x0, 0), max(hauteur - cadre.y1, 0), min(cadre.x1, largeur), min(hauteur - cadre.y0, hauteur))
+    zone = tuple(int(round(borne * dpi_max)) for borne in bornes)
+    for chemin, dpi, serre in sorties:
+        with mesurer(f'rasteriser_png_{dpi}', [chemin]):
+            sortie = image.crop(zone) if serre else image
+            if dpi != dpi_max:
+                taille = (max(1, round(sortie.width * dpi / dpi_max)), max(1, round(sortie.height * dpi / dpi_max)))
+                sortie = sortie.resize(taille, Image.BOX)
+            sortie.save(chemin, format='png', dpi=(dpi, dpi))
+
+def rendre_profils(nom, donnees, profils=('preview',), repertoire_cache=None):
+    """
+    Rend une figure pour plusieurs profils (preview / web / print).
+
+    La figure n'est construite qu'une fois. Les sorties vectorielles (PDF, SVG)
+    en sont exportées directement ; toutes les sorties PNG viennent d'un seul
+    rendu matriciel à la plus haute résolution demandée (voir rasteriser).
+    Chaque sortie est mise en cache sous l'empreinte de la figure ; une sortie
+    déjà en cache n'est pas redessinée. Retourne {profil: [chemins]}
+    """
+    repertoire_cache = repertoire_cache or os.path.join(REPERTOIRE_SORTIE, REPERTOIRE_CACHE_RENDUS)
+    os.makedirs(repertoire_cache, exist_ok=True)
+    empreinte = empreinte_figure(nom, donnees)[0][:16]
+
+    chemins, manquants = {}, []
+    for profil in profils:
+        chemins[profil] = []
+        for format, dpi, serre in PROFILS_RENDU[profil]:
+            suffixe = f'_{profil}.png' if format == 'png' else f'.{format}'
+            chemin = os.path.join(repertoire_cache, f'{nom}_{empreinte}{suffixe}')
+            chemins[profil].append(chemin)
+            if not os.path.exists(chemin) and chemin not in (m[0] for m in manquants):
+                manquants.append((chemin, format, dpi, serre))
 
-def main():
+    if manquants:
+        figure = construire_figure(nom, donnees)
+        try:
+            for chemin, format, dpi, serre in manquants:
+                if format == 'png':
+                    continue
+                with mesurer(f'savefig_{format}_vectoriel', [chemin]):
+                    figure.savefig(chemin, format=format, bbox_inches='tight' if serre else None)
+            matricielles = [(chemin, dpi, serre) for chemin, format, dpi, serre in manquants if format == 'png']
+            if matricielles:
+                rasteriser(figure, matricielles)
+        finally:
+            plt.close(figure)
+    return chemins
+
+def _rendre_figure(nom, repertoire_sortie, donnees=None, profils=None):
+    """
+    Rend une figure du catalogue (ou ses profils de rendu) et retourne (nom, durée en secondes, pid)
+    """
+    configurer_style()
+    donnees = _DONNEES_WORKER if donnees is None else donnees
+    fonction, entrees, _ = FIGURES[nom]
+    debut = time.perf_counter()
+    if profils:
+        rendre_profils(nom, donnees, profils, os.path.join(repertoire_sortie, REPERTOIRE_CACHE_RENDUS))
+    else:
+        fonction(*(donnees[cle] for cle in entrees), repertoire_sortie=repertoire_sortie)
+    return nom, time.perf_counter() - debut, os.getpid()
+
+def _rendre_figure_worker(nom, repertoire_sortie, profils=None):
+    """
+    Rend une figure dans un worker et renvoie aussi les mesures d'instrumentation
     """
-    Fonction principale
+    return _rendre_figure(nom, repertoire_sortie, profils=profils), instrumentation.extraire_mesures()
+
+def rendre_figures(donnees, jobs=1, figures=None, repertoire_sortie=None, profils=None):
+    """
+    Rend les figures demandées, en série (jobs=1) ou dans un pool de processus.
+    `donnees` associe chaque nom de jeu de données (population, structure_age,
+    departements, indicateurs_sociaux) à son DataFrame ; le cube d'indicateurs
+    et les agrégats de la hiérarchie sont construits s'ils manquent. Les DataFrames sont transmis une seule fois à
+    chaque worker à son démarrage.
+    Avec `profils`, les figures sont rendues dans le cache multi-résolution.
+    Retourne la liste des temps de rendu [(nom, durée, pid), ...]
+    """
+    donnees = avec_hierarchie(avec_cube(donnees))
+    figures = list(figures or figures_disponibles(donnees))
+    repertoire_sortie = repertoire_sortie or REPERTOIRE_SORTIE
+    if jobs <= 1:
+        return [_rendre_figure(nom, repertoire_sortie, donnees, profils) for nom in figures]
+
+    jobs = min(jobs, len(figures))
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_initialiser_worker,
+                             initargs=(donnees, instrumentation.est_actif(), _CONTEXTE['pays'])) as pool:
+        futures = [pool.submit(_rendre_figure_worker, nom, repertoire_sortie, profils)
+                   for nom in figures]
+        temps = []
+        for future in as_completed(futures):
+            resultat, mesures = future.result()
+            instrumentation.ajouter_mesures(mesures)
+            temps.append(resultat)
+        return temps
+
+def figures_disponibles(donnees, figures=None):
+    """
+    Figures du catalogue dont tous les jeux de données sont présents
+    (un pays sans subdivisions n'a pas de figures départementales)
+    """
+    return [nom for nom in figures or FIGURES if all(cle in donnees for cle in FIGURES[nom][1])
+            and ('departements' in donnees or nom not in FIGURES_DEPARTEMENTALES)]
+
+# Données de tous les pays, partagées par les processus de rendu multi-pays
+_DONNEES_PAYS = {}
+
+def _initialiser_worker_pays(donnees_par_pays, instrumentation_active=False):
+    """
+    Initialise un processus de rendu multi-pays : les données de tous les pays
+    sont transmises une seule fois, au démarrage du worker
+    """
+    plt.switch_backend('Agg')
+    configurer_style()
+    _DONNEES_PAYS.update(donnees_par_pays)
+    if instrumentation_active:
+        instrumentation.activer(reinitialiser=True)
+
+def _rendre_figure_pays(code, nom, repertoire_racine, donnees_par_pays=None):
+    """
+    Rend une figure d'un pays dans <racine>/<code>/ et retourne ((code, nom), durée, pid)
+    """
+    donnees_par_pays = _DONNEES_PAYS if donnees_par_pays is None else donnees_par_pays
+    _CONTEXTE['pays'] = code
+    try:
+        _, duree, pid = _rendre_figure(nom, os.path.join(repertoire_racine, code),
+                                       donnees_par_pays[code])
+    finally:
+        _CONTEXTE['pays'] = PAYS_DEFAUT
+    return f'{code}/{nom}', duree, pid
+
+def _rendre_figure_pays_worker(code, nom, repertoire_racine):
+    """
+    Rend une figure d'un pays dans un worker et renvoie aussi les mesures d'instrumentation
+    """
+    return _rendre_figure_pays(code, nom, repertoire_racine), instrumentation.extraire_mesures()
+
+@instrumenter
+def rendre_pays(donnees_par_pays, jobs=1, repertoire_racine=None, figures=None, forcer=False):
+    """
+    Rend les jeux de figures de plusieurs pays, chacun dans <racine>/<code>/.
+    `donnees_par_pays` associe un code ISO3 à ses jeux de données (voir
+    separer_pays) ; seules les figures dont les données existent et qui sont
+    obsolètes d'après le manifeste du répertoire du pays sont rendues (toutes si
+    forcer=True). Les tâches (pays, figure) sont réparties sur un même pool de processus.
+    Retourne la liste des temps de rendu [('CODE/figure', durée, pid), ...]
+    """
+    repertoire_racine = repertoire_racine or REPERTOIRE_SORTIE
+    donnees_par_pays = {code: avec_hierarchie(avec_cube(donnees, code), code)
+                        for code, donnees in donnees_par_pays.items()}
+    manifestes, obsoletes = {}, {}
+    for code, donnees in donnees_par_pays.items():
+        repertoire = os.path.join(repertoire_racine, code)
+        os.makedirs(repertoire, exist_ok=True)
+        manifestes[code] = charger_manifeste(repertoire)
+        disponibles = figures_disponibles(donnees, figures)
+        obsoletes[code] = figures_obsoletes(donnees, manifestes[code], repertoire, disponibles, forcer, code)
+        for nom in disponibles:
+            if nom not in obsoletes[code]:
+                print(f"⏭️  {code}/{FIGURES[nom][2]} inchangé")
+    taches = [(code, nom) for code, a_regenerer in obsoletes.items() for nom in a_regenerer]
+
+    if jobs <= 1 or len(taches) <= 1:
+        temps = [_rendre_figure_pays(code, nom, repertoire_racine, donnees_par_pays)
+                 for code, nom in taches]
+    else:
+        jobs = min(jobs, len(taches))
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_initialiser_worker_pays,
+                                 initargs=(donnees_par_pays, instrumentation.est_actif())) as pool:
+            futures = [pool.submit(_rendre_figure_pays_worker, code, nom, repertoire_racine)
+                       for code, nom in taches]
+            temps = []
+            for future in as_completed(futures):
+                resultat, mesures = future.result()
+                instrumentation.ajouter_mesures(mesures)
+                temps.append(resultat)
+
+    for code, a_regenerer in obsoletes.items():
+        if not a_regenerer:
+            continue
+        repertoire = os.path.join(repertoire_racine, code)
+        for nom, (empreinte, entrees, parametres) in a_regenerer.items():
+            enregistrer_artefact(manifestes[code], repertoire, FIGURES[nom][2], empreinte, entrees, parametres)
+        sauvegarder_manifeste(manifestes[code], repertoire)
+    return temps
+
+def figures_obsoletes(donnees, manifeste, repertoire_sortie, figures=None, forcer=False, pays=None):
+    """
+    Sélectionne les figures dont les données, les paramètres de rendu ou le code ont changé
+    (figures du pays `pays`, celui du rendu en cours par défaut).
+    Retourne un dictionnaire nom -> (empreinte, entrees, parametres) des figures à régénérer
+    """
+    empreintes = {cle: empreinte_dataframe(df) for cle, df in donnees.items()}
+    a_regenerer = {}
+    for nom in figures or figures_disponibles(donnees):
+        fichier = FIGURES[nom][2]
+        empreinte, entrees, parametres = empreinte_figure(nom, donnees, empreintes, pays)
+        if forcer or not est_a_jour(manifeste, repertoire_sortie, fichier, empreinte):
+            a_regenerer[nom] = (empreinte, entrees, parametres)
+    return a_regenerer
+
+def afficher_rapport_temps(temps, duree_totale, jobs):
+    """
+    Affiche le temps de rendu de chaque figure et l'accélération obtenue
+    """
+    cumul = sum(duree for _, duree, _ in temps)
+    print("⏱️  Temps de rendu par figure:")
+    for nom, duree, pid in sorted(temps, key=lambda t: t[1], reverse=True):
+        print(f"   • {nom:<22} {duree:6.2f} s   (pid {pid})")
+    print(f"   Total: {duree_totale:.2f} s avec {jobs} job(s) "
+          f"(somme des rendus: {cumul:.2f} s, accélération x{cumul / duree_totale:.1f})\n")
+
+def rendre_visualisations(donnees, repertoire_sortie=None, jobs=1, forcer=False, pays=PAYS_DEFAUT):
+    """
+    Redessine les figures obsolètes d'après le manifeste du répertoire de sortie
+    (toutes si forcer=True) à partir de DataFrames déjà en mémoire, titrées au nom de `pays`.
+    """
+    repertoire_sortie = repertoire_sortie or REPERTOIRE_SORTIE
+    os.makedirs(repertoire_sortie, exist_ok=True)
+    donnees = avec_hierarchie(avec_cube(donnees, pays), pays)
+    manifeste = charger_manifeste(repertoire_sortie)
+    a_regenerer = figures_obsoletes(donnees, manifeste, repertoire_sortie, forcer=forcer, pays=pays)
+    for nom in figures_disponibles(donnees):
+        if nom not in a_regenerer:
+            print(f"⏭️  {FIGURES[nom][2]} inchangé")
+    
+    if a_regenerer:
+        debut = time.perf_counter()
+        _CONTEXTE['pays'] = pays
+        try:
+            temps = rendre_figures(donnees, jobs=jobs, figures=a_regenerer,
+                                   repertoire_sortie=repertoire_sortie)
+        finally:
+            _CONTEXTE['pays'] = PAYS_DEFAUT
+        afficher_rapport_temps(temps, time.perf_counter() - debut, jobs)
+        for nom, (empreinte, entrees, parametres) in a_regenerer.items():
+            enregistrer_artefact(manifeste, repertoire_sortie, FIGURES[nom][2],
+                                 empreinte, entrees, parametres)
+        sauvegarder_manifeste(manifeste, repertoire_sortie)
+
+def main(jobs=1, forcer=False, format='csv', repertoire_sortie=None, rendus=None):
+    """
+    Fonction principale.
+    Seules les figures obsolètes d'après le manifeste sont redessinées, sauf si forcer=True.
+    Avec `rendus` (profils preview / web / print), les figures sont produites dans
+    le cache multi-résolution (cache_rendus/) au lieu des PNG 300 dpi habituels.
     """
     print("\n" + "="*70)
     print("  GÉNÉRATION DES VISUALISATIONS DÉMOGRAPHIQUES")
@@ -334,24 +778,31 @@ def main():
     print("="*70 + "\n")
     
     # Charger les données
-    df_pop, df_age, df_dept, df_social = charger_donnees()
-    
-    # Créer toutes les visualisations
-    visualiser_evolution_population(df_pop)
-    visualiser_pyramide_age(df_age)
-    visualiser_departements(df_dept)
-    visualiser_indicateurs_sociaux(df_social)
-    creer_dashboard_resume(df_pop, df_age, df_dept)
+    df_pop, df_age, df_dept, df_social = charger_donnees(format, repertoire_sortie)
+    donnees = avec_hierarchie(avec_cube({'population': df_pop, 'structure_age': df_age,
+                                         'departements': df_dept, 'indicateurs_sociaux': df_social}))
+    
+    # Créer les visualisations obsolètes
+    if rendus:
+        debut = time.perf_counter()
+        temps = rendre_figures(donnees, jobs=jobs, repertoire_sortie=repertoire_sortie,
+                               profils=rendus)
+        afficher_rapport_temps(temps, time.perf_counter() - debut, jobs)
+        # Toutes les sorties sont maintenant en cache : rendre_profils ne fait que retourner leurs chemins
+        repertoire_cache = os.path.join(repertoire_sortie or REPERTOIRE_SORTIE, REPERTOIRE_CACHE_RENDUS)
+        fichiers = [chemin for nom in figures_disponibles(donnees)
+                    for chemins in rendre_profils(nom, donnees, rendus, repertoire_cache).values()
+                    for chemin in chemins]
+    else:
+        rendre_visualisations(donnees, repertoire_sortie, jobs=jobs, forcer=forcer)
+        fichiers = [FIGURES[nom][2] for nom in figures_disponibles(donnees)]
     
     print("="*70)
     print("✅ TOUTES LES VISUALISATIONS ONT ÉTÉ CRÉÉES!")
     print("="*70)
     print("\n📁 Fichiers générés:")
-    print("   • viz_evolution_population.png")
-    print("   • viz_pyramide_ages.png")
-    print("   • viz_analyse_departements.png")
-    print("   • viz_indicateurs_sociaux.png")
-    print("   • viz_dashboard_resume.png")
+    for fichier in dict.fromkeys(fichiers):
+        print(f"   • {fichier}")
     print("\n🎯 Ces visualisations peuvent être:")
     print("   • Utilisées dans des présentations")
     print("   • Intégrées dans Power BI/Tableau")
@@ -359,4 +810,19 @@ def main():
     print("\n" + "="*70 + "\n")
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Visualisations démographiques du Bénin")
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                        help="nombre de processus de rendu (0 = un par cœur)")
+    parser.add_argument('--forcer', action='store_true',
+                        help="redessiner toutes les figures, même inchangées")
+    parser.add_argument('--format', choices=list(FORMATS), default='csv',
+                        help="format des jeux de données à charger (défaut: csv)")
+    parser.add_argument('--sortie', default=None,
+                        help=f"répertoire des données et des figures (défaut: {REPERTOIRE_SORTIE})")
+    parser.add_argument('--rendu', action='append', choices=list(PROFILS_RENDU), dest='rendus',
+                        help="profil de rendu mis en cache (répétable : preview, web, print)")
+    instrumentation.ajouter_options(parser)
+    args = parser.parse_args()
+    with instrumentation.session(args):
+        main(jobs=args.jobs if args.jobs > 0 else os.cpu_count(), forcer=args.forcer,
+             format=args.format, repertoire_sortie=args.sortie, rendus=args.rendus)
@@ -0,0 +1,207 @@
+"""
+Cube d'indicateurs - Dashboard Démographique Bénin
+Auteur: Freud GUEDOU
+
+Pré-agrège une fois pour toutes les indicateurs du dashboard dans un cube
+département × année × indicateur, avec une ligne nationale (nom du pays) : parts,
+densités, rangs et âge médian calculé sur la distribution cumulée de la
+pyramide des âges. Les figures et les exports lisent le cube au lieu de
+refaire tris, sommes et moyennes à chaque appel.
+
+Le cube est un DataFrame indexé par (Departement, Annee), aux types
+compacts (catégorie, int16/int32, float32, int8). La ligne nationale est
+la seule non classée (rangs à 0), ce qui la retrouve quel que soit le pays.
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+
+from pays import PAYS, PAYS_DEFAUT
+from stockage import SCHEMAS, lire_dataset
+
+NATIONAL = PAYS[PAYS_DEFAUT]['nom']  # libellé par défaut de la ligne nationale
+ANNEE_REFERENCE_DEPARTEMENTS = 2024  # année des effectifs départementaux
+INDEX_CUBE = ['Departement', 'Annee']
+
+# Indicateurs du cube, dans l'ordre des colonnes, et leur type compact (schéma de stockage)
+INDICATEURS_CUBE = {col: type_ for col, type_ in SCHEMAS['cube'].items() if col not in INDEX_CUBE}
+
+def age_median(df_age, colonne='Total'):
+    """
+    Âge médian d'une pyramide par groupes d'âge (0-4 ans ... 80+ ans), interpolé
+    linéairement dans le groupe où la distribution cumulée atteint 50 %
+    """
+    bornes = np.array([int(re.match(r'\d+', g).group()) for g in df_age['Groupe_Age']], dtype=float)
+    effectifs = df_age[colonne].to_numpy(dtype=np.float64)
+    cumul = np.cumsum(effectifs)
+    moitie = cumul[-1] / 2
+    i = int(np.searchsorted(cumul, moitie))
+    avant = cumul[i - 1] if i else 0.0
+    largeur = bornes[i + 1] - bornes[i] if i + 1 < len(bornes) else bornes[i] - bornes[i - 1]
+    return bornes[i] + (moitie - avant) / effectifs[i] * largeur
+
+def _rangs(valeurs):
+    """
+    Rang décroissant (1 = plus grande valeur) de chaque ligne, colonne par colonne
+    """
+    return np.argsort(np.argsort(-valeurs, axis=0, kind='stable'), axis=0) + 1
+
+def construire_cube(donnees, annees=None, national=NATIONAL, superficie_nationale=None):
+    """
+    Construit le cube département × année × indicateur à partir des jeux de
+    données population, structure_age et departements, avec une ligne nationale
+    libellée `national` (nom du pays). `annees` restreint le
+    calcul à certaines années (ex. les seules années nouvellement ingérées) :
+    les lignes d'une année ne dépendent que de cette année.
+    Sans jeu de données departements (pays sans subdivisions), le cube ne contient
+    que la ligne nationale ; sa superficie est alors `superficie_nationale` (par
+    défaut, la somme des départements).
+
+    Les populations départementales suivent la croissance nationale depuis leur
+    année de référence (ANNEE_REFERENCE_DEPARTEMENTS) ; urbanisation et âge médian
+    départementaux sont des instantanés reportés sur toutes les années. La ligne
+    nationale reprend la série nationale (population, croissance, urbanisation,
+    densité) et l'âge médian de la pyramide.
+    """
+    df_pop, df_age = donnees['population'], donnees['structure_age']
+    df_dept = donnees.get('departements')
+    if df_dept is None:
+        df_dept = pd.DataFrame(columns=['Departement', 'Population', 'Superficie_km2',
+                                        'Taux_Urbanisation_%', 'Age_Median_Ans'], dtype=np.float64)
+    reference = df_pop.loc[df_pop['Annee'] == ANNEE_REFERENCE_DEPARTEMENTS, 'Population_Totale']
+    reference = reference.iloc[0] if len(reference) else df_pop['Population_Totale'].iloc[-1]
+    if annees is not None:
+        df_pop = df_pop[df_pop['Annee'].isin(annees)]
+    annees = df_pop['Annee'].to_numpy()
+    population_nationale = df_pop['Population_Totale'].to_numpy(dtype=np.float64)
+    n_annees = len(annees)
+
+    # Départements : (département, année)
+    facteur = population_nationale / reference
+    population = np.rint(df_dept['Population'].to_numpy(dtype=np.float64)[:, None] * facteur)
+    superficie = np.repeat(df_dept['Superficie_km2'].to_numpy()[:, None], n_annees, axis=1)
+    urbanisation = np.repeat(df_dept['Taux_Urbanisation_%'].to_numpy()[:, None], n_annees, axis=1)
+    densite = population / superficie
+    pct_hommes = df_age['Hommes'].sum() / df_age['Total'].sum() * 100
+
+    colonnes = {
+        'Population': population,
+        'Superficie_km2': superficie,
+        'Densite_km2': densite,
+        'Pct_Population_Nationale': population / population.sum(axis=0) * 100,
+        'Taux_Croissance_%': np.broadcast_to(df_pop['Taux_Croissance_%'].to_numpy(), population.shape),
+        'Taux_Urbanisation_%': urbanisation,
+        'Age_Median_Ans': np.repeat(df_dept['Age_Median_Ans'].to_numpy()[:, None], n_annees, axis=1),
+        'Pct_Hommes': np.full(population.shape, pct_hommes),
+        'Rang_Population': _rangs(population),
+        'Rang_Densite': _rangs(densite),
+        'Rang_Urbanisation': _rangs(urbanisation),
+    }
+
+    # Ligne nationale (rangs à 0 : non classée)
+    nationale = {
+        'Population': population_nationale,
+        'Superficie_km2': np.full(n_annees, superficie_nationale or df_dept['Superficie_km2'].sum()),
+        'Densite_km2': df_pop['Densite_Pop_km2'].to_numpy(),
+        'Pct_Population_Nationale': np.full(n_annees, 100.0),
+        'Taux_Croissance_%': df_pop['Taux_Croissance_%'].to_numpy(),
+        'Taux_Urbanisation_%': df_pop['Pct_Urbain'].to_numpy(),
+        'Age_Median_Ans': np.full(n_annees, age_median(df_age)),
+        'Pct_Hommes': np.full(n_annees, pct_hommes),
+        'Rang_Population': np.zeros(n_annees),
+        'Rang_Densite': np.zeros(n_annees),
+        'Rang_Urbanisation': np.zeros(n_annees),
+    }
+
+    noms = [*df_dept['Departement'].astype(str), national]
+    cube = pd.DataFrame({
+        'Departement': pd.Categorical(np.repeat(noms, n_annees), categories=noms),
+        'Annee': np.tile(annees, len(noms)).astype(np.int16),
+        **{nom: np.vstack([colonnes[nom], nationale[nom][None, :]]).reshape(-1).astype(type_)
+           for nom, type_ in INDICATEURS_CUBE.items()},
+    })
+    return cube.set_index(INDEX_CUBE)
+
+def avec_cube(donnees, pays=PAYS_DEFAUT):
+    """
+    Ajoute le cube aux jeux de données s'il n'y est pas déjà (il n'est construit qu'une fois),
+    la ligne nationale portant le nom du pays. Sans données départementales (pays sans
+    subdivisions), le cube ne contient que la ligne nationale ; sans population ni
+    pyramide des âges, les données sont retournées telles quelles.
+    """
+    if 'cube' in donnees or not {'population', 'structure_age'} <= set(donnees):
+        return donnees
+    superficie = None if 'departements' in donnees else PAYS[pays]['superficie']
+    return {**donnees, 'cube': construire_cube(donnees, national=PAYS[pays]['nom'],
+                                               superficie_nationale=superficie)}
+
+def a_departements(cube):
+    """
+    Vrai si le cube contient des départements en plus de la ligne nationale
+    """
+    return bool((cube['Rang_Population'].to_numpy() > 0).any())
+
+def charger_cube(repertoire, format='csv'):
+    """
+    Relit un cube enregistré (cube_kpi.csv/.parquet/.feather) et rétablit son index
+    """
+    return lire_dataset('cube', repertoire, format).set_index(INDEX_CUBE).sort_index()
+
+def annee_reference(cube):
+    """
+    Dernière année du cube
+    """
+    return int(cube.index.get_level_values('Annee').max())
+
+def nom_national(cube):
+    """
+    Libellé de la ligne nationale du cube : la seule unité non classée (rangs à 0)
+    """
+    noms = cube.index.get_level_values('Departement')[cube['Rang_Population'].to_numpy() == 0]
+    return noms[0] if len(noms) else NATIONAL
+
+def tranche_annee(cube, annee=None):
+    """
+    Indicateurs des départements (sans la ligne nationale) pour une année
+    (la dernière par défaut), indexés par département
+    """
+    tranche = cube.xs(annee or annee_reference(cube), level='Annee')
+    tranche = tranche[tranche.index != nom_national(cube)]
+    tranche.index = tranche.index.astype(str)
+    return tranche
+
+def ligne_nationale(cube, annee=None):
+    """
+    Indicateurs nationaux d'une année (la dernière par défaut)
+    """
+    return cube.loc[(nom_national(cube), annee or annee_reference(cube))]
+
+def serie_nationale(cube):
+    """
+    Série annuelle des indicateurs nationaux, indexée par année
+    """
+    return cube.xs(nom_national(cube), level='Departement')
+
+def ordonner(tranche, rang, n=None, croissant=False):
+    """
+    Ordonne les départements d'après une colonne de rang précalculée, sans retrier
+    les valeurs. croissant=True : de la plus petite à la plus grande valeur.
+    `n` garde les n premiers (plus grandes valeurs) avant ce réordonnancement.
+    """
+    ordre = np.argsort(tranche[rang].to_numpy(), kind='stable')
+    if n is not None:
+        ordre = ordre[:n]
+    return tranche.iloc[ordre[::-1] if croissant else ordre]
+
+def filtrer_cube(cube, debut=None, fin=None, departements=()):
+    """
+    Restreint le cube à une période et à des départements (la ligne nationale est conservée)
+    """
+    annees = cube.index.get_level_values('Annee')
+    masque = annees.to_series(index=cube.index).between(
+        debut if debut is not None else annees.min(), fin if fin is not None else annees.max())
+    if departements:
+        masque &= cube.index.get_level_values('Departement').isin([*departements, nom_national(cube)])
+    return cube[masque.to_numpy()]
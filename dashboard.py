@@ -0,0 +1,305 @@
+"""
+Ligne de commande unifiée - Dashboard Démographique Bénin
+Auteur: Freud GUEDOU
+
+Point d'entrée unique des outils du dashboard :
+
+    python dashboard.py generer  [--pays ...] [--format ...] [--excel flux]
+    python dashboard.py rendre   [--jobs 4] [--rendu preview]
+    python dashboard.py stats    [--json]
+    python dashboard.py valider  [--strict]
+    python dashboard.py exporter --format parquet [--excel flux]
+    python dashboard.py carte    limites.geojson [--niveau commune] [--annee 2024]
+
+Chaque sous-commande n'importe que ce dont elle a besoin, au moment de
+s'exécuter : --help et stats (sur CSV) ne chargent ni pandas, ni numpy,
+ni matplotlib, ni openpyxl ; seuls `rendre` et `carte` importent matplotlib.
+Ces outils étant lancés très souvent (cron, CI), le démarrage compte.
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+
+import instrumentation
+from emplacements import FICHIERS, FORMATS, REPERTOIRE_SORTIE, nom_fichier
+
+def _ajouter_sortie(parser):
+    """
+    Option --sortie commune aux sous-commandes
+    """
+    parser.add_argument('--sortie', default=None,
+                        help=f"répertoire des données (défaut: {REPERTOIRE_SORTIE})")
+
+def _jobs(jobs):
+    """
+    Nombre de processus de rendu (0 = un par cœur)
+    """
+    return jobs if jobs > 0 else os.cpu_count()
+
+def commande_generer(args, parser):
+    """
+    Génère et enregistre les jeux de données (un sous-répertoire par pays avec --pays)
+    """
+    formats = args.formats or ('csv',)
+    if args.pays:
+        from pays import codes_pays
+        try:
+            codes = codes_pays(args.pays)
+        except ValueError as erreur:
+            parser.error(str(erreur))
+        from pipeline import executer_pays
+        graine = {} if args.graine is None else {'graine': args.graine}
+        executer_pays(codes, args.sortie, formats=formats, excel=args.excel, figures=False,
+                      forcer=args.forcer, **graine)
+    else:
+        from generer_donnees_demographiques import sauvegarder_donnees
+        sauvegarder_donnees(forcer=args.forcer, formats=formats, excel=args.excel,
+                            repertoire_sortie=args.sortie)
+
+def commande_rendre(args, parser):
+    """
+    Dessine les figures à partir des jeux de données enregistrés
+    """
+    import creer_visualisations
+    inconnus = [profil for profil in args.rendus or () if profil not in creer_visualisations.PROFILS_RENDU]
+    if inconnus:
+        parser.error(f"profil de rendu inconnu : {', '.join(inconnus)} "
+                     f"(disponibles: {', '.join(creer_visualisations.PROFILS_RENDU)})")
+    creer_visualisations.main(jobs=_jobs(args.jobs), forcer=args.forcer, format=args.format,
+                              repertoire_sortie=args.sortie, rendus=args.rendus)
+
+def _lire_lignes(nom, repertoire, format):
+    """
+    Lignes d'un jeu de données enregistré, sous forme de dictionnaires.
+    En CSV, la lecture se fait avec le module csv (sans pandas) ; les autres formats
+    passent par le module stockage.
+    """
+    chemin = os.path.join(repertoire, nom_fichier(nom, format))
+    if not os.path.exists(chemin):
+        return None
+    if format == 'csv':
+        with open(chemin, encoding='utf-8-sig', newline='') as f:
+            return list(csv.DictReader(f))
+    from stockage import lire_dataset
+    return lire_dataset(nom, repertoire, format).to_dict('records')
+
+def statistiques(repertoire, format='csv'):
+    """
+    Indicateurs clés de la dernière année, lus dans le cube d'indicateurs
+    (ou, à défaut, dans la série de population). Retourne un dictionnaire
+    """
+    cube = _lire_lignes('cube', repertoire, format)
+    if cube:
+        annee = max(int(ligne['Annee']) for ligne in cube)
+        lignes = [ligne for ligne in cube if int(ligne['Annee']) == annee]
+        # La ligne nationale est la seule sans rang
+        nationale = next(ligne for ligne in lignes if int(ligne['Rang_Population']) == 0)
+        departements = [ligne for ligne in lignes if int(ligne['Rang_Population']) != 0]
+        return {
+            'annee': annee,
+            'population_totale': int(nationale['Population']),
+            'taux_croissance_pct': round(float(nationale['Taux_Croissance_%']), 2),
+            'pct_urbain': round(float(nationale['Taux_Urbanisation_%']), 1),
+            'age_median_ans': round(float(nationale['Age_Median_Ans']), 1),
+            'pct_hommes': round(float(nationale['Pct_Hommes']), 2),
+            'departements': len(departements),
+            'plus_peuple': next(str(ligne['Departement']) for ligne in departements
+                                if int(ligne['Rang_Population']) == 1),
+        }
+    population = _lire_lignes('population', repertoire, format)
+    if not population:
+        raise FileNotFoundError(f"Aucun jeu de données {format} dans {repertoire}")
+    derniere = max(population, key=lambda ligne: int(ligne['Annee']))
+    return {
+        'annee': int(derniere['Annee']),
+        'population_totale': int(derniere['Population_Totale']),
+        'taux_croissance_pct': round(float(derniere['Taux_Croissance_%']), 2),
+        'pct_urbain': round(float(derniere['Pct_Urbain']), 1),
+    }
+
+def commande_stats(args, parser):
+    """
+    Affiche les indicateurs clés des données enregistrées
+    """
+    try:
+        stats = statistiques(args.sortie or REPERTOIRE_SORTIE, args.format)
+    except FileNotFoundError as erreur:
+        parser.exit(1, f"❌ {erreur}\n")
+    if args.json:
+        print(json.dumps(stats, ensure_ascii=False))
+        return
+    print(f"\n📊 Indicateurs {stats['annee']}")
+    print(f"   • Population totale : {stats['population_totale']:,}")
+    print(f"   • Croissance annuelle : {stats['taux_croissance_pct']:+.2f}%")
+    print(f"   • Urbanisation : {stats['pct_urbain']:.1f}%")
+    if 'age_median_ans' in stats:
+        print(f"   • Âge médian : {stats['age_median_ans']:.1f} ans")
+        print(f"   • Hommes : {stats['pct_hommes']:.2f}%")
+        print(f"   • Départements : {stats['departements']} (plus peuplé : {stats['plus_peuple']})")
+    print()
+
+def _charger_datasets(repertoire, format):
+    """
+    Jeux de données enregistrés dans un répertoire (hors cube, reconstruit au besoin)
+    """
+    from stockage import lire_dataset
+    return {nom: lire_dataset(nom, repertoire, format) for nom in FICHIERS
+            if nom != 'cube' and os.path.exists(os.path.join(repertoire, nom_fichier(nom, format)))}
+
+def commande_valider(args, parser):
+    """
+    Vérifie la cohérence des jeux de données enregistrés (code de sortie 1 en cas d'erreur,
+    ou d'avertissement avec --strict)
+    """
+    from validation import ERREUR, afficher_violations, valider
+    repertoire = args.sortie or REPERTOIRE_SORTIE
+    datasets = _charger_datasets(repertoire, args.format)
+    if not datasets:
+        parser.exit(1, f"❌ Aucun jeu de données {args.format} dans {repertoire}\n")
+    rapport = valider(datasets)
+    afficher_violations(rapport)
+    bloquantes = rapport if args.strict else rapport[rapport['Niveau'] == ERREUR]
+    if len(bloquantes):
+        parser.exit(1, f"❌ Données incohérentes : {', '.join(bloquantes['Regle'])}\n")
+
+def commande_exporter(args, parser):
+    """
+    Réexporte des jeux de données enregistrés vers d'autres formats et le classeur Excel
+    """
+    from generer_donnees_demographiques import persister_datasets
+    repertoire = args.sortie or REPERTOIRE_SORTIE
+    # Le cube est reconstruit à partir des jeux de données relus
+    datasets = _charger_datasets(repertoire, args.depuis)
+    if not datasets:
+        parser.exit(1, f"❌ Aucun jeu de données {args.depuis} dans {repertoire}\n")
+    persister_datasets(datasets, repertoire, args.formats or (args.depuis,), args.excel, args.forcer)
+    print("\n✅ Export terminé\n")
+
+def commande_carte(args, parser):
+    """
+    Dessine la grille de cartes choroplèthes (année × indicateur) des données enregistrées,
+    à partir d'un fichier de limites administratives (GeoJSON ou shapefile)
+    """
+    from cartes import (INDICATEURS_CARTE, charger_geometries, rendre_grille_cartes,
+                        tranches_departements, tranches_niveau, unites_absentes)
+    from cube_kpi import avec_cube
+    from hierarchie import avec_hierarchie
+    inconnus = [indicateur for indicateur in args.indicateurs or () if indicateur not in INDICATEURS_CARTE]
+    if inconnus:
+        parser.error(f"indicateur inconnu : {', '.join(inconnus)} "
+                     f"(disponibles: {', '.join(INDICATEURS_CARTE)})")
+    repertoire = args.sortie or REPERTOIRE_SORTIE
+    datasets = _charger_datasets(repertoire, args.format)
+    if 'departements' not in datasets:
+        parser.exit(1, f"❌ Aucune donnée départementale {args.format} dans {repertoire}\n")
+    donnees = avec_hierarchie(avec_cube(datasets))
+    if args.niveau == 'departement':
+        disponibles = set(donnees['cube'].index.get_level_values('Annee'))
+        absentes = sorted(set(args.annees or ()) - disponibles)
+        if absentes:
+            parser.error(f"années absentes du cube : {', '.join(map(str, absentes))}")
+        tranches = tranches_departements(donnees['cube'], args.annees)
+    else:
+        tranches = tranches_niveau(donnees['hierarchie'], args.niveau)
+    try:
+        geometries = charger_geometries(args.geometries, args.champ, repertoire_cache=repertoire)
+    except (OSError, KeyError, ValueError) as erreur:
+        parser.exit(1, f"❌ Limites illisibles ({args.geometries}) : {erreur}\n")
+    sans_geometrie = unites_absentes(geometries, next(iter(tranches.values())))
+    if sans_geometrie:
+        print(f"⚠️  {len(sans_geometrie)} unité(s) sans géométrie : {', '.join(sans_geometrie[:10])}"
+              + (" ..." if len(sans_geometrie) > 10 else ""))
+    rendre_grille_cartes(geometries, tranches, args.indicateurs, repertoire,
+                         fichier=f'viz_cartes_{args.niveau}s.png')
+
+def construire_parser():
+    """
+    Analyseur de la ligne de commande et de ses sous-commandes
+    """
+    parser = argparse.ArgumentParser(description="Dashboard démographique du Bénin")
+    sous_commandes = parser.add_subparsers(dest='commande', required=True, metavar='commande')
+
+    generer = sous_commandes.add_parser('generer', aliases=['generate'],
+                                        help="générer et enregistrer les jeux de données")
+    _ajouter_sortie(generer)
+    generer.add_argument('--format', action='append', choices=list(FORMATS), dest='formats',
+                         help="format de stockage (répétable, défaut: csv)")
+    generer.add_argument('--excel', choices=['standard', 'flux'], default='standard')
+    generer.add_argument('--pays', action='append',
+                         help="code ISO3 d'un pays (répétable, ou CEDEAO) : un sous-répertoire par pays")
+    generer.add_argument('--graine', type=int, default=None,
+                         help="graine aléatoire des séries multi-pays")
+    generer.add_argument('--forcer', action='store_true', help="réécrire même les fichiers inchangés")
+    generer.set_defaults(executer=commande_generer)
+
+    rendre = sous_commandes.add_parser('rendre', aliases=['render'], help="dessiner les figures")
+    _ajouter_sortie(rendre)
+    rendre.add_argument('--format', choices=list(FORMATS), default='csv',
+                        help="format des jeux de données à charger (défaut: csv)")
+    rendre.add_argument('--jobs', '-j', type=int, default=1,
+                        help="nombre de processus de rendu (0 = un par cœur)")
+    rendre.add_argument('--rendu', action='append', dest='rendus',
+                        help="profil de rendu mis en cache (répétable : preview, web, print)")
+    rendre.add_argument('--forcer', action='store_true', help="redessiner même les figures inchangées")
+    rendre.set_defaults(executer=commande_rendre)
+
+    stats = sous_commandes.add_parser('stats', help="afficher les indicateurs clés enregistrés")
+    _ajouter_sortie(stats)
+    stats.add_argument('--format', choices=list(FORMATS), default='csv',
+                       help="format des jeux de données à lire (défaut: csv, sans pandas)")
+    stats.add_argument('--json', action='store_true', help="sortie JSON sur une ligne")
+    stats.set_defaults(executer=commande_stats)
+
+    valider = sous_commandes.add_parser('valider', aliases=['validate'],
+                                        help="vérifier la cohérence des données enregistrées")
+    _ajouter_sortie(valider)
+    valider.add_argument('--format', choices=list(FORMATS), default='csv',
+                         help="format des jeux de données à lire (défaut: csv)")
+    valider.add_argument('--strict', action='store_true',
+                         help="échouer aussi sur les avertissements")
+    valider.set_defaults(executer=commande_valider)
+
+    exporter = sous_commandes.add_parser('exporter', aliases=['export'],
+                                         help="réexporter vers d'autres formats et Excel")
+    _ajouter_sortie(exporter)
+    exporter.add_argument('--depuis', choices=list(FORMATS), default='csv',
+                          help="format des jeux de données enregistrés (défaut: csv)")
+    exporter.add_argument('--format', action='append', choices=list(FORMATS), dest='formats',
+                          help="format cible (répétable, défaut: celui de --depuis)")
+    exporter.add_argument('--excel', choices=['standard', 'flux'], default='flux')
+    exporter.add_argument('--forcer', action='store_true', help="réécrire même les fichiers inchangés")
+    exporter.set_defaults(executer=commande_exporter)
+
+    carte = sous_commandes.add_parser('carte', aliases=['map'],
+                                      help="cartes choroplèthes des indicateurs (année × indicateur)")
+    _ajouter_sortie(carte)
+    carte.add_argument('geometries', help="limites administratives : GeoJSON ou shapefile (.shp, pyshp)")
+    carte.add_argument('--niveau', choices=['departement', 'commune', 'arrondissement'], default='departement')
+    carte.add_argument('--champ', default=None,
+                       help="propriété portant le nom des unités (défaut: détection automatique)")
+    carte.add_argument('--indicateur', action='append', dest='indicateurs',
+                       help="colonne à cartographier (répétable, défaut: toutes celles disponibles)")
+    carte.add_argument('--annee', type=int, action='append', dest='annees',
+                       help="année à cartographier (répétable, défaut: toutes ; niveau departement)")
+    carte.add_argument('--format', choices=list(FORMATS), default='csv',
+                       help="format des jeux de données à lire (défaut: csv)")
+    carte.set_defaults(executer=commande_carte)
+
+    for sous_parser in (generer, rendre, stats, valider, exporter, carte):
+        instrumentation.ajouter_options(sous_parser)
+    return parser
+
+def main(argv=None):
+    """
+    Point d'entrée en ligne de commande
+    """
+    parser = construire_parser()
+    args = parser.parse_args(argv)
+    with instrumentation.session(args):
+        args.executer(args, parser)
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,49 @@
+"""
+Emplacements des données - Dashboard Démographique Bénin
+Auteur: Freud GUEDOU
+
+Répertoire de sortie, noms de fichiers et formats des jeux de données.
+Ce module n'importe ni pandas ni numpy : la ligne de commande (dashboard.py)
+peut localiser les fichiers sans charger la pile scientifique.
+"""
+
+import os
+
+from pays import PAYS_DEFAUT
+
+# Répertoire de sortie par défaut (surchargeable par la variable d'environnement)
+REPERTOIRE_SORTIE = os.environ.get('DASHBOARD_BENIN_SORTIE', '/mnt/user-data/outputs')
+
+# Nom de fichier (sans extension) de chaque jeu de données
+FICHIERS = {
+    'population': 'donnees_population_benin',
+    'structure_age': 'donnees_structure_age',
+    'departements': 'donnees_departements',
+    'indicateurs_sociaux': 'donnees_indicateurs_sociaux',
+    'cube': 'cube_kpi',
+}
+
+# Suffixe des fichiers propres au pays : le pays par défaut garde les noms
+# historiques, les autres prennent leur code ISO3 (donnees_population_tgo.csv)
+SUFFIXE_PAYS = '_benin'
+
+# Formats disponibles : nom -> extension
+FORMATS = {
+    'csv': '.csv',
+    'parquet': '.parquet',
+    'feather': '.feather',
+}
+
+def nom_pays(base, pays=PAYS_DEFAUT):
+    """
+    Nom de fichier (sans extension) adapté au pays : suffixe _benin remplacé par le code ISO3
+    """
+    if pays == PAYS_DEFAUT or not base.endswith(SUFFIXE_PAYS):
+        return base
+    return f'{base[:-len(SUFFIXE_PAYS)]}_{pays.lower()}'
+
+def nom_fichier(nom, format='csv', pays=PAYS_DEFAUT):
+    """
+    Nom du fichier d'un jeu de données dans un format donné (et pour un pays donné)
+    """
+    return nom_pays(FICHIERS[nom], pays) + FORMATS[format]
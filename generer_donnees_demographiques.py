@@ -5,73 +5,189 @@ Date: Octobre 2024
 
 Ce script génère des fichiers de données démographiques pour le Bénin
 basés sur les données réelles de la Banque Mondiale et de l'ONU.
+Les autres pays de la CEDEAO (registre pays.py) peuvent être générés
+ensemble, en une seule passe vectorisée (generer_datasets_pays).
 """
 
+import os
+import argparse
+
 import pandas as pd
 import numpy as np
 from datetime import datetime
 
-def generer_donnees_population_annuelle():
+import instrumentation
+from cube_kpi import avec_cube
+from instrumentation import instrumenter, mesurer
+from manifeste import (
+    ORIGINE_INGESTION, charger_manifeste, empreinte_artefact, empreinte_dataframe,
+    enregistrer_artefact, est_a_jour, origine_artefact, sauvegarder_manifeste
+)
+from pays import (
+    DENSITE_URBAINE_KM2, INDICATEURS_SOCIAUX, PAYS, PAYS_DEFAUT, URBANISATION_DENSE, a_subdivisions,
+    codes_pays
+)
+
+from stockage import (
+    FORMATS, REPERTOIRE_SORTIE, appliquer_schema, compacter, ecrire_dataset, exporter_excel_flux,
+    lire_dataset, nom_fichier, nom_pays, rapport_memoire
+)
+from validation import controler
+
+FICHIER_EXCEL = 'dashboard_demographique_benin.xlsx'
+FEUILLES_EXCEL = {
+    'population': 'Population_Annuelle',
+    'structure_age': 'Structure_Age',
+    'departements': 'Departements',
+    'indicateurs_sociaux': 'Indicateurs_Sociaux',
+    'cube': 'Cube_KPI',
+}
+
+# Paramètres nationaux du Bénin (registre des pays)
+SUPERFICIE_BENIN = PAYS['BEN']['superficie']  # km²
+POP_1990 = PAYS['BEN']['pop_1990']
+POP_2024 = PAYS['BEN']['pop_2024']
+
+# Périodes générées (de nouvelles années s'ajoutent ensuite avec ingestion.py)
+ANNEES_POPULATION = range(1990, 2025)
+ANNEES_SOCIAUX = range(2010, 2025)
+
+# Jeux de données annuels (colonne Annee), complétables par ingestion.py
+DATASETS_ANNUELS = ('population', 'indicateurs_sociaux')
+
+# Urbanisation tirée par département (URBANISATION_DENSE au-delà de DENSITE_URBAINE_KM2 hab/km²)
+URBANISATION_DEPARTEMENTS = (20, 80)
+
+# Graine par défaut : les données générées sont reproductibles d'une exécution à l'autre
+GRAINE_DEFAUT = 2024
+
+# Tendances des indicateurs : (valeur initiale, variation sur la période, amplitude du bruit)
+TENDANCES_DEFAUT = {
+    'croissance': (3.2, -0.5, 0.1),
+    'urbain': (25.0, 23.0, 0.5),
+    'esperance_vie': (53.0, 9.0, 0.5),
+    'fertilite': (6.7, -1.0, 0.1),
+    'mortalite_infantile': (115.0, -40.0, 0.0),
+}
+
+def creer_generateur(graine=GRAINE_DEFAUT):
+    """
+    Crée un générateur aléatoire NumPy reproductible
+    (accepte une graine entière, None ou un np.random.Generator existant)
+    """
+    if isinstance(graine, np.random.Generator):
+        return graine
+    return np.random.default_rng(graine)
+
+def calculer_series_population(progression, pop_initiale, pop_finale, superficie,
+                               rng, tendances=None):
     """
-    Génère les données de population annuelle du Bénin (1990-2024)
+    Calcule en une seule passe vectorisée les indicateurs de population.
+
+    `progression` est un tableau (..., n_annees) de valeurs dans [0, 1]; les
+    populations, la superficie et les paramètres de `tendances` doivent être
+    diffusables (broadcast) vers sa forme. Retourne un dictionnaire de tableaux.
+    """
+    tendances = {**TENDANCES_DEFAUT, **(tendances or {})}
+    progression = np.asarray(progression, dtype=np.float64)
+    pop_initiale = np.asarray(pop_initiale, dtype=np.float64)
+    pop_finale = np.asarray(pop_finale, dtype=np.float64)
+    forme = np.broadcast_shapes(progression.shape, pop_initiale.shape,
+                                pop_finale.shape, np.shape(superficie))
+
+    def tendance(nom):
+        origine, variation, bruit = (np.asarray(v, dtype=np.float64) for v in tendances[nom])
+        valeurs = origine + progression * variation
+        if np.any(bruit):
+            valeurs = valeurs + bruit * rng.uniform(-1.0, 1.0, forme)
+        return np.broadcast_to(valeurs, forme)
+
+    # Population : cumul des taux annuels de la tendance 'croissance', recalé pour aller
+    # exactement de pop_initiale à pop_finale ; le taux publié est celui de la série obtenue
+    log_croissance = np.log1p(tendance('croissance') / 100)
+    cumul = np.cumsum(log_croissance, axis=-1) - log_croissance[..., :1]
+    echelle = np.divide(np.log(pop_finale / pop_initiale), cumul[..., -1:],
+                        out=np.zeros(cumul[..., -1:].shape),
+                        where=cumul[..., -1:] != 0)
+    population = pop_initiale * np.exp(echelle * cumul)
+    taux_croissance = np.expm1(echelle * log_croissance) * 100
+    pct_urbain = tendance('urbain')
+    pop_urbaine = population * (pct_urbain / 100)
+    # Rurale déduite des effectifs entiers : urbaine + rurale = totale exactement
+    totale, urbaine = population.astype(np.int64), pop_urbaine.astype(np.int64)
+
+    return {
+        'Population_Totale': totale,
+        'Taux_Croissance_%': np.round(taux_croissance, 2),
+        'Population_Urbaine': urbaine,
+        'Population_Rurale': totale - urbaine,
+        'Pct_Urbain': np.round(pct_urbain, 1),
+        'Esperance_Vie_Ans': np.round(tendance('esperance_vie'), 1),
+        'Taux_Fertilite': np.round(tendance('fertilite'), 2),
+        'Mortalite_Infantile_pour_1000': np.round(tendance('mortalite_infantile'), 1),
+        'Densite_Pop_km2': np.round(population / superficie, 1),
+    }
+
+@instrumenter
+def generer_population_grille(regions, annees, graine=GRAINE_DEFAUT, tendances=None):
+    """
+    Génère les séries de population pour toute une grille région × année.
+
+    `regions` est un DataFrame (ou une liste de dicts) avec les colonnes
+    Region, Pop_Initiale, Pop_Finale et Superficie_km2. Toutes les colonnes
+    sont construites d'un bloc avec NumPy, sans boucle Python par ligne.
+    """
+    df_regions = pd.DataFrame(regions)
+    annees = np.asarray(annees, dtype=np.int64)
+    n_regions, n_annees = len(df_regions), len(annees)
+    rng = creer_generateur(graine)
+
+    progression = np.linspace(0.0, 1.0, n_annees) if n_annees > 1 else np.zeros(1)
+    colonne = lambda nom: df_regions[nom].to_numpy(dtype=np.float64)[:, None]
+    series = calculer_series_population(
+        progression[None, :], colonne('Pop_Initiale'), colonne('Pop_Finale'),
+        colonne('Superficie_km2'), rng, tendances
+    )
+
+    codes = np.repeat(np.arange(n_regions), n_annees)
+    df = pd.DataFrame({
+        'Region': pd.Categorical.from_codes(codes, categories=pd.Index(df_regions['Region'])),
+        'Annee': np.tile(annees, n_regions),
+    })
+    for nom, valeurs in series.items():
+        df[nom] = valeurs.reshape(-1)
+    return df
+
+@instrumenter
+def generer_donnees_population_annuelle(graine=GRAINE_DEFAUT, annees=ANNEES_POPULATION,
+                                        pays=PAYS_DEFAUT):
+    """
+    Génère les données de population annuelle d'un pays (Bénin, 1990-2024 par défaut)
     """
     print("📊 Génération des données de population annuelle...")
     
     # Données basées sur les statistiques réelles
-    annees = list(range(1990, 2025))
-    
-    # Population de base et taux de croissance réels
-    pop_initiale = 4779000  # 1990
-    pop_finale = 14462724    # 2024
-    
-    # Calculer la croissance avec une courbe réaliste
-    donnees = []
-    for i, annee in enumerate(annees):
-        progression = i / (len(annees) - 1)
-        
-        # Population avec croissance exponentielle réaliste
-        population = pop_initiale * ((pop_finale/pop_initiale) ** progression)
-        
-        # Taux de croissance (commence plus haut, diminue légèrement)
-        taux_croissance = 3.2 - (progression * 0.5) + np.random.uniform(-0.1, 0.1)
-        
-        # Population urbaine (augmente de ~25% en 1990 à ~48% en 2024)
-        pop_urbaine_pct = 25 + (progression * 23) + np.random.uniform(-0.5, 0.5)
-        pop_urbaine = population * (pop_urbaine_pct / 100)
-        pop_rurale = population - pop_urbaine
-        
-        # Espérance de vie (augmente de 53 ans à 62 ans)
-        esperance_vie = 53 + (progression * 9) + np.random.uniform(-0.5, 0.5)
-        
-        # Taux de fertilité (diminue de 6.7 à 5.7)
-        taux_fertilite = 6.7 - (progression * 1.0) + np.random.uniform(-0.1, 0.1)
-        
-        # Taux de mortalité infantile (diminue)
-        mortalite_infantile = 115 - (progression * 40)
-        
-        # Densité de population (habitants par km²)
-        superficie = 112760  # km²
-        densite = population / superficie
-        
-        donnees.append({
-            'Annee': annee,
-            'Population_Totale': int(population),
-            'Taux_Croissance_%': round(taux_croissance, 2),
-            'Population_Urbaine': int(pop_urbaine),
-            'Population_Rurale': int(pop_rurale),
-            'Pct_Urbain': round(pop_urbaine_pct, 1),
-            'Esperance_Vie_Ans': round(esperance_vie, 1),
-            'Taux_Fertilite': round(taux_fertilite, 2),
-            'Mortalite_Infantile_pour_1000': round(mortalite_infantile, 1),
-            'Densite_Pop_km2': round(densite, 1)
-        })
-    
-    df = pd.DataFrame(donnees)
-    return df
+    df = generer_population_grille(regions_pays([pays]), annees, graine)
+    return df.drop(columns='Region')
+
+def regions_pays(codes):
+    """
+    Paramètres de generer_population_grille pour une liste de pays du registre
+    (une « région » par pays, nommée par son code ISO3)
+    """
+    return pd.DataFrame({
+        'Region': list(codes),
+        'Pop_Initiale': [PAYS[code]['pop_1990'] for code in codes],
+        'Pop_Finale': [PAYS[code]['pop_2024'] for code in codes],
+        'Superficie_km2': [PAYS[code]['superficie'] for code in codes],
+    })
 
-def generer_donnees_structure_age():
+@instrumenter
+def generer_donnees_structure_age(pays=PAYS_DEFAUT):
     """
-    Génère la structure par âge de la population (2024)
+    Génère la structure par âge de la population (2024), mise à l'échelle de la
+    population 2024 du pays. Les autres pays reprennent le profil d'âge béninois
+    (structure très proche dans la région).
     """
     print("📊 Génération de la structure par âge...")
     
@@ -96,84 +212,246 @@ def generer_donnees_structure_age():
     ]
     
     df = pd.DataFrame(groupes_age)
+    facteur = PAYS[pays]['pop_2024'] / df[['Hommes', 'Femmes']].to_numpy().sum()
+    df[['Hommes', 'Femmes']] = (df[['Hommes', 'Femmes']] * facteur).round().astype(np.int64)
     df['Total'] = df['Hommes'] + df['Femmes']
     df['Pct_Total'] = (df['Total'] / df['Total'].sum() * 100).round(2)
     
     return df
 
-def generer_donnees_departements():
+@instrumenter
+def generer_donnees_departements(graine=GRAINE_DEFAUT, pays=PAYS_DEFAUT):
     """
-    Génère les données démographiques par département
+    Génère les données démographiques par département (subdivisions du registre) :
+    effectifs du recensement mis à l'échelle de la population 2024 du pays,
+    urbanisation tirée au hasard (majoritaire dans les départements denses)
     """
     print("📊 Génération des données par département...")
     
-    departements = [
-        {'Departement': 'Alibori', 'Population': 867463, 'Superficie_km2': 25683, 'Chef_lieu': 'Kandi'},
-        {'Departement': 'Atacora', 'Population': 769337, 'Superficie_km2': 20459, 'Chef_lieu': 'Natitingou'},
-        {'Departement': 'Atlantique', 'Population': 1398229, 'Superficie_km2': 3233, 'Chef_lieu': 'Ouidah'},
-        {'Departement': 'Borgou', 'Population': 1202095, 'Superficie_km2': 25310, 'Chef_lieu': 'Parakou'},
-        {'Departement': 'Collines', 'Population': 717477, 'Superficie_km2': 13931, 'Chef_lieu': 'Savalou'},
-        {'Departement': 'Couffo', 'Population': 745328, 'Superficie_km2': 2404, 'Chef_lieu': 'Aplahoué'},
-        {'Departement': 'Donga', 'Population': 542605, 'Superficie_km2': 10691, 'Chef_lieu': 'Djougou'},
-        {'Departement': 'Littoral', 'Population': 679012, 'Superficie_km2': 79, 'Chef_lieu': 'Cotonou'},
-        {'Departement': 'Mono', 'Population': 497243, 'Superficie_km2': 1396, 'Chef_lieu': 'Lokossa'},
-        {'Departement': 'Ouémé', 'Population': 1096850, 'Superficie_km2': 1281, 'Chef_lieu': 'Porto-Novo'},
-        {'Departement': 'Plateau', 'Population': 622372, 'Superficie_km2': 3264, 'Chef_lieu': 'Pobè'},
-        {'Departement': 'Zou', 'Population': 851580, 'Superficie_km2': 5106, 'Chef_lieu': 'Abomey'}
-    ]
+    departements = PAYS[pays].get('subdivisions')
+    if not departements:
+        raise ValueError(f"Pas de subdivisions pour {PAYS[pays]['nom']} dans le registre des pays")
     
     df = pd.DataFrame(departements)
+    facteur = PAYS[pays]['pop_2024'] / df['Population'].sum()
+    df['Population'] = (df['Population'] * facteur).round().astype(np.int64)
     df['Densite_km2'] = (df['Population'] / df['Superficie_km2']).round(1)
     df['Pct_Population_Nationale'] = (df['Population'] / df['Population'].sum() * 100).round(2)
     
     # Ajouter des indicateurs démographiques estimés
-    df['Taux_Urbanisation_%'] = np.random.uniform(20, 80, len(df)).round(1)
-    df['Age_Median_Ans'] = np.random.uniform(16, 22, len(df)).round(1)
+    rng = creer_generateur(graine)
+    urbanisation = rng.uniform(*URBANISATION_DEPARTEMENTS, len(df))
+    # Même tirage ramené dans URBANISATION_DENSE pour les départements denses
+    (bas, haut), (bas_dense, haut_dense) = URBANISATION_DEPARTEMENTS, URBANISATION_DENSE
+    dense = bas_dense + (urbanisation - bas) / (haut - bas) * (haut_dense - bas_dense)
+    df['Taux_Urbanisation_%'] = np.where(df['Densite_km2'] >= DENSITE_URBAINE_KM2, dense, urbanisation).round(1)
+    df['Age_Median_Ans'] = rng.uniform(16, 22, len(df)).round(1)
     
     return df
 
-def generer_indicateurs_sociaux():
+def calculer_indicateurs_sociaux(codes, annees=ANNEES_SOCIAUX):
     """
-    Génère les indicateurs sociaux (éducation, santé, etc.)
+    Indicateurs sociaux de plusieurs pays d'un bloc : progression linéaire entre les
+    niveaux de début et de fin de période du registre (PAYS[code]['sociaux']).
+    Retourne un tableau (pays × année, indicateur) dans l'ordre de INDICATEURS_SOCIAUX
+    """
+    annees = list(annees)
+    progression = np.arange(len(annees)) / (len(annees) - 1)
+    niveaux = np.array([PAYS[code]['sociaux'] for code in codes], dtype=np.float64)
+    debut, fin = niveaux[:, None, :, 0], niveaux[:, None, :, 1]
+    valeurs = debut + progression[None, :, None] * (fin - debut)
+    return np.round(valeurs, 1).reshape(-1, len(INDICATEURS_SOCIAUX))
+
+@instrumenter
+def generer_indicateurs_sociaux(annees=ANNEES_SOCIAUX, pays=PAYS_DEFAUT):
+    """
+    Génère les indicateurs sociaux (éducation, santé, etc.) d'un pays, 2010-2024 par défaut
     """
     print("📊 Génération des indicateurs sociaux...")
     
-    annees = list(range(2010, 2025))
-    
-    donnees = []
-    for i, annee in enumerate(annees):
-        progression = i / (len(annees) - 1)
-        
-        # Taux d'alphabétisation (augmente)
-        alpha_hommes = 50 + (progression * 15)
-        alpha_femmes = 30 + (progression * 20)
-        
-        # Taux de scolarisation
-        scol_primaire = 85 + (progression * 10)
-        scol_secondaire = 35 + (progression * 20)
-        
-        # Accès aux services
-        acces_eau_potable = 65 + (progression * 15)
-        acces_electricite = 28 + (progression * 22)
-        acces_sante = 45 + (progression * 20)
-        
-        donnees.append({
-            'Annee': annee,
-            'Taux_Alphabetisation_Hommes_%': round(alpha_hommes, 1),
-            'Taux_Alphabetisation_Femmes_%': round(alpha_femmes, 1),
-            'Taux_Scolarisation_Primaire_%': round(scol_primaire, 1),
-            'Taux_Scolarisation_Secondaire_%': round(scol_secondaire, 1),
-            'Acces_Eau_Potable_%': round(acces_eau_potable, 1),
-            'Acces_Electricite_%': round(acces_electricite, 1),
-            'Acces_Soins_Sante_%': round(acces_sante, 1)
-        })
-    
-    df = pd.DataFrame(donnees)
+    annees = list(annees)
+    df = pd.DataFrame(calculer_indicateurs_sociaux([pays], annees), columns=list(INDICATEURS_SOCIAUX))
+    df.insert(0, 'Annee', annees)
     return df
 
-def sauvegarder_donnees():
+@instrumenter
+def generer_datasets(graine=GRAINE_DEFAUT, pays=PAYS_DEFAUT):
+    """
+    Génère les jeux de données d'un pays en mémoire, sans rien écrire sur disque
+    (departements seulement si le registre connaît ses subdivisions), aux types
+    compacts de leur schéma
+    """
+    datasets = {
+        'population': generer_donnees_population_annuelle(graine, pays=pays),
+        'structure_age': generer_donnees_structure_age(pays),
+        'indicateurs_sociaux': generer_indicateurs_sociaux(pays=pays),
+    }
+    if a_subdivisions(pays):
+        datasets['departements'] = generer_donnees_departements(graine, pays)
+    return compacter(datasets)
+
+@instrumenter
+def generer_datasets_pays(codes=None, graine=GRAINE_DEFAUT, annees=ANNEES_POPULATION):
+    """
+    Génère en une seule passe les jeux de données de plusieurs pays, au format
+    long : chaque DataFrame porte une colonne catégorielle Pays (code ISO3).
+
+    Les séries de population de tous les pays sont calculées d'un bloc
+    (generer_population_grille) ; pyramides et indicateurs sociaux (niveaux du
+    registre) sont calculés pour tous les pays sans boucle sur les lignes. Les tirages aléatoires étant
+    faits sur toute la grille, les séries d'un pays dépendent de la sélection
+    (reproductibles pour une même graine et une même liste de pays).
+    """
+    codes = codes_pays(codes)
+    categories = pd.CategoricalDtype(codes)
+    print(f"📊 Génération groupée de {len(codes)} pays...")
+
+    population = generer_population_grille(regions_pays(codes), annees, graine)
+    population = population.rename(columns={'Region': 'Pays'}).astype({'Pays': categories})
+
+    # Pyramide de référence mise à l'échelle de chaque pays
+    pyramide = generer_donnees_structure_age()
+    facteurs = np.array([PAYS[code]['pop_2024'] for code in codes]) / POP_2024
+    effectifs = np.rint(pyramide[['Hommes', 'Femmes']].to_numpy()[None, :, :] * facteurs[:, None, None])
+    effectifs = effectifs.astype(np.int64).reshape(-1, 2)
+    structure_age = pd.DataFrame({
+        'Pays': pd.Categorical(np.repeat(codes, len(pyramide)), dtype=categories),
+        'Groupe_Age': np.tile(pyramide['Groupe_Age'].to_numpy(), len(codes)),
+        'Hommes': effectifs[:, 0],
+        'Femmes': effectifs[:, 1],
+    })
+    structure_age['Total'] = structure_age['Hommes'] + structure_age['Femmes']
+    structure_age['Pct_Total'] = (structure_age['Total'] / structure_age.groupby(
+        'Pays', observed=True)['Total'].transform('sum') * 100).round(2)
+
+    annees_sociales = list(ANNEES_SOCIAUX)
+    indicateurs_sociaux = pd.DataFrame(calculer_indicateurs_sociaux(codes, annees_sociales),
+                                       columns=list(INDICATEURS_SOCIAUX))
+    indicateurs_sociaux.insert(0, 'Pays', pd.Categorical(np.repeat(codes, len(annees_sociales)),
+                                                         dtype=categories))
+    indicateurs_sociaux.insert(1, 'Annee', np.tile(annees_sociales, len(codes)))
+
+    datasets = {'population': population, 'structure_age': structure_age,
+                'indicateurs_sociaux': indicateurs_sociaux}
+    avec_subdivisions = [code for code in codes if a_subdivisions(code)]
+    if avec_subdivisions:
+        departements = pd.concat([generer_donnees_departements(graine, code).assign(Pays=code)
+                                  for code in avec_subdivisions], ignore_index=True)
+        datasets['departements'] = departements.astype({'Pays': categories})
+    return compacter(datasets)
+
+def separer_pays(datasets):
+    """
+    Découpe des jeux de données au format long (colonne Pays) en un dictionnaire
+    code -> jeux de données du pays (sans la colonne Pays), au format de generer_datasets
+    """
+    par_pays = {}
+    for nom, df in datasets.items():
+        for code, groupe in df.groupby('Pays', observed=True, sort=False):
+            par_pays.setdefault(code, {})[nom] = groupe.drop(columns='Pays').reset_index(drop=True)
+    return par_pays
+
+def fichier_excel(pays=PAYS_DEFAUT):
+    """
+    Nom du classeur Excel consolidé d'un pays
+    """
+    return nom_pays(os.path.splitext(FICHIER_EXCEL)[0], pays) + '.xlsx'
+
+def completer_annees_ingerees(datasets, repertoire_sortie=None, pays=PAYS_DEFAUT):
+    """
+    Ajoute aux jeux annuels générés les années postérieures que ingestion.py a
+    ajoutées aux fichiers du répertoire (repérés par leur origine dans le
+    manifeste) : une régénération conserve ces années au lieu de les effacer.
+    Le cube éventuel est retiré s'il doit être reconstruit.
+    Retourne (datasets, noms des jeux complétés)
+    """
+    repertoire_sortie = repertoire_sortie or REPERTOIRE_SORTIE
+    manifeste = charger_manifeste(repertoire_sortie)
+    completes = []
+    for nom in DATASETS_ANNUELS:
+        format = next((format for format in FORMATS
+                       if origine_artefact(manifeste, nom_fichier(nom, format, pays)) == ORIGINE_INGESTION
+                       and os.path.exists(os.path.join(repertoire_sortie, nom_fichier(nom, format, pays)))),
+                      None)
+        if nom not in datasets or format is None:
+            continue
+        stocke = lire_dataset(nom, repertoire_sortie, format, pays=pays)
+        ajoutees = stocke[stocke['Annee'] > datasets[nom]['Annee'].max()]
+        if len(ajoutees):
+            datasets = {**datasets, nom: pd.concat([datasets[nom], appliquer_schema(ajoutees, nom)],
+                                                   ignore_index=True)}
+            completes.append(nom)
+            print(f"   ➕ {nom} : années ingérées conservées "
+                  f"({ajoutees['Annee'].min()}-{ajoutees['Annee'].max()})")
+    if completes and 'cube' in datasets and 'population' in completes:
+        datasets = {nom: df for nom, df in datasets.items() if nom != 'cube'}
+    return datasets, completes
+
+@instrumenter
+def persister_datasets(datasets, repertoire_sortie=None, formats=('csv',), excel='standard',
+                       forcer=False, pays=PAYS_DEFAUT):
+    """
+    Sauvegarde les jeux de données dans chacun des `formats` demandés
+    (csv, parquet, feather) plus le classeur Excel.
+    Le cube d'indicateurs (cube_kpi) est construit une fois et exporté avec eux
+    (ligne nationale au nom du pays `pays`, dont le code nomme aussi les fichiers ;
+    ligne nationale seule pour un pays sans subdivisions).
+    excel='flux' écrit le classeur en mode flux, à mémoire bornée.
+    Les fichiers dont les données n'ont pas changé depuis la dernière exécution
+    (d'après le manifeste) ne sont pas réécrits, sauf si forcer=True.
+    Les années ajoutées par ingestion.py sont conservées (completer_annees_ingerees).
+    """
+    repertoire_sortie = repertoire_sortie or REPERTOIRE_SORTIE
+    os.makedirs(repertoire_sortie, exist_ok=True)
+    datasets, completes = completer_annees_ingerees(datasets, repertoire_sortie, pays)
+    datasets = avec_cube(datasets, pays)
+    if 'cube' in datasets:
+        datasets = {**datasets, 'cube': datasets['cube'].reset_index()}
+    empreintes = {nom: empreinte_dataframe(df) for nom, df in datasets.items()}
+    manifeste = charger_manifeste(repertoire_sortie)
+    
+    # Sauvegarder chaque jeu de données (uniquement les fichiers dont les données ont changé)
+    for format in formats:
+        print(f"\n💾 Sauvegarde des fichiers {format.upper()}...")
+        parametres = {'format': format}
+        for nom, df in datasets.items():
+            fichier = nom_fichier(nom, format, pays)
+            entrees = {nom: empreintes[nom]}
+            empreinte = empreinte_artefact(entrees, parametres)
+            if not forcer and est_a_jour(manifeste, repertoire_sortie, fichier, empreinte):
+                print(f"   ⏭️  {fichier} inchangé")
+                continue
+            with mesurer(f'ecrire_{format}', [os.path.join(repertoire_sortie, fichier)]):
+                ecrire_dataset(df, nom, repertoire_sortie, format, pays)
+            enregistrer_artefact(manifeste, repertoire_sortie, fichier, empreinte, entrees, parametres,
+                                 ORIGINE_INGESTION if nom in completes else None)
+    
+    # Sauvegarder en Excel (avec plusieurs feuilles)
+    print("💾 Sauvegarde du fichier Excel consolidé...")
+    feuilles = {nom: feuille for nom, feuille in FEUILLES_EXCEL.items() if nom in datasets}
+    parametres_excel = {'format': 'xlsx', 'engine': 'openpyxl', 'mode': excel,
+                        'feuilles': feuilles}
+    empreinte = empreinte_artefact(empreintes, parametres_excel)
+    classeur = fichier_excel(pays)
+    chemin_excel = os.path.join(repertoire_sortie, classeur)
+    if not forcer and est_a_jour(manifeste, repertoire_sortie, classeur, empreinte):
+        print(f"   ⏭️  {classeur} inchangé")
+    else:
+        with mesurer(f'ecrire_excel_{excel}', [chemin_excel]):
+            if excel == 'flux':
+                exporter_excel_flux(datasets, chemin_excel, feuilles)
+            else:
+                with pd.ExcelWriter(chemin_excel, engine='openpyxl') as writer:
+                    for nom, feuille in feuilles.items():
+                        datasets[nom].to_excel(writer, sheet_name=feuille, index=False)
+        enregistrer_artefact(manifeste, repertoire_sortie, classeur, empreinte,
+                             empreintes, parametres_excel)
+    sauvegarder_manifeste(manifeste, repertoire_sortie)
+
+def sauvegarder_donnees(forcer=False, formats=('csv',), excel='standard', repertoire_sortie=None):
     """
     Génère et sauvegarde tous les fichiers de données
+    (voir persister_datasets pour les formats et l'écriture incrémentale)
     """
     print("\n" + "="*70)
     print("  GÉNÉRATEUR DE DONNÉES DÉMOGRAPHIQUES - BÉNIN")
@@ -181,25 +459,12 @@ def sauvegarder_donnees():
     print("="*70 + "\n")
     
     # Générer les différents datasets
-    df_population = generer_donnees_population_annuelle()
-    df_age = generer_donnees_structure_age()
-    df_departements = generer_donnees_departements()
-    df_sociaux = generer_indicateurs_sociaux()
-    
-    # Sauvegarder en CSV
-    print("\n💾 Sauvegarde des fichiers CSV...")
-    df_population.to_csv('/mnt/user-data/outputs/donnees_population_benin.csv', index=False, encoding='utf-8-sig')
-    df_age.to_csv('/mnt/user-data/outputs/donnees_structure_age.csv', index=False, encoding='utf-8-sig')
-    df_departements.to_csv('/mnt/user-data/outputs/donnees_departements.csv', index=False, encoding='utf-8-sig')
-    df_sociaux.to_csv('/mnt/user-data/outputs/donnees_indicateurs_sociaux.csv', index=False, encoding='utf-8-sig')
-    
-    # Sauvegarder en Excel (avec plusieurs feuilles)
-    print("💾 Sauvegarde du fichier Excel consolidé...")
-    with pd.ExcelWriter('/mnt/user-data/outputs/dashboard_demographique_benin.xlsx', engine='openpyxl') as writer:
-        df_population.to_excel(writer, sheet_name='Population_Annuelle', index=False)
-        df_age.to_excel(writer, sheet_name='Structure_Age', index=False)
-        df_departements.to_excel(writer, sheet_name='Departements', index=False)
-        df_sociaux.to_excel(writer, sheet_name='Indicateurs_Sociaux', index=False)
+    datasets = generer_datasets()
+    rapport_memoire(datasets)
+    controler(datasets)
+    persister_datasets(datasets, repertoire_sortie, formats, excel, forcer)
+    df_population, df_age = datasets['population'], datasets['structure_age']
+    df_departements, df_sociaux = datasets['departements'], datasets['indicateurs_sociaux']
     
     print("\n" + "="*70)
     print("✅ GÉNÉRATION TERMINÉE AVEC SUCCÈS!")
@@ -209,6 +474,7 @@ def sauvegarder_donnees():
     print("   • donnees_structure_age.csv")
     print("   • donnees_departements.csv")
     print("   • donnees_indicateurs_sociaux.csv")
+    print("   • cube_kpi.csv (indicateurs pré-agrégés)")
     print("   • dashboard_demographique_benin.xlsx (fichier consolidé)")
     
     print("\n📊 Statistiques des données:")
@@ -226,4 +492,20 @@ def sauvegarder_donnees():
     return df_population, df_age, df_departements, df_sociaux
 
 if __name__ == "__main__":
-    sauvegarder_donnees()
+    parser = argparse.ArgumentParser(description="Générateur de données démographiques du Bénin")
+    parser.add_argument('--forcer', action='store_true',
+                        help="réécrire tous les fichiers, même inchangés")
+    parser.add_argument('--format', action='append', choices=list(FORMATS), dest='formats',
+                        help="format de stockage des jeux de données (répétable, défaut: csv)")
+    parser.add_argument('--excel', choices=['standard', 'flux'], default='standard',
+                        help="mode d'écriture du classeur Excel (flux = mémoire bornée)")
+    parser.add_argument('--sortie', default=None,
+                        help=f"répertoire de sortie (défaut: {REPERTOIRE_SORTIE})")
+    instrumentation.ajouter_options(parser)
+    args = parser.parse_args()
+    with instrumentation.session(args):
+        try:
+            sauvegarder_donnees(forcer=args.forcer, formats=args.formats or ('csv',), excel=args.excel,
+                                repertoire_sortie=args.sortie)
+        except ValueError as erreur:
+            parser.exit(1, f"❌ Génération arrêtée : {erreur}\n")
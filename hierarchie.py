@@ -0,0 +1,190 @@
+"""
+Hiérarchie géographique - Dashboard Démographique Bénin
+Auteur: Freud GUEDOU
+
+Modèle département → commune → arrondissement (12 départements, 77
+communes, 546 arrondissements) avec liens de parenté. Les effectifs de
+chaque département sont répartis entre ses communes puis leurs
+arrondissements (répartition aléatoire reproductible, sommes exactes) ;
+les arrondissements sont synthétiques et numérotés par commune
+(Cotonou-01, Cotonou-02...).
+
+Les feuilles (arrondissements) sont rangées par département puis par
+commune : chaque unité d'un niveau supérieur occupe un bloc contigu de
+feuilles. L'index de la hiérarchie garde le début de chaque bloc, si bien
+que l'agrégation de toutes les colonnes additives d'un niveau est une seule
+opération (np.add.reduceat), sans filtrage répété. Les agrégats de tous les
+niveaux sont calculés une fois et mis en cache avec les données (avec_hierarchie).
+"""
+
+import numpy as np
+import pandas as pd
+
+from generer_donnees_demographiques import GRAINE_DEFAUT, creer_generateur
+from pays import PAYS, PAYS_DEFAUT
+
+# Niveaux, des feuilles à la racine, et colonne qui nomme les unités de chaque niveau
+NIVEAUX = {
+    'arrondissement': 'Arrondissement',
+    'commune': 'Commune',
+    'departement': 'Departement',
+    'national': None,
+}
+ARRONDISSEMENTS_MIN = 3  # par commune
+CONCENTRATION = 4.0  # paramètre des répartitions (Dirichlet) : plus grand = plus homogène
+COLONNES_ADDITIVES = ['Population', 'Population_Urbaine', 'Superficie_km2']
+
+def _repartir_entiers(totaux, poids, parents):
+    """
+    Répartit des totaux entiers (un par parent) entre les enfants, proportionnellement
+    à leurs poids, par la méthode du plus fort reste : la somme des enfants de chaque
+    parent est exactement son total. `parents` donne le parent de chaque enfant
+    """
+    totaux = np.asarray(totaux, dtype=np.int64)
+    poids = poids / np.bincount(parents, weights=poids)[parents]
+    brut = totaux[parents] * poids
+    parts = np.floor(brut).astype(np.int64)
+    manque = totaux - np.bincount(parents, weights=parts, minlength=len(totaux)).astype(np.int64)
+    # Une unité de plus aux enfants aux plus forts restes, dans chaque parent
+    ordre = np.lexsort((parts - brut, parents))
+    debuts = np.searchsorted(parents[ordre], np.arange(len(totaux)))
+    rang = np.arange(len(ordre)) - debuts[parents[ordre]]
+    parts[ordre[rang < manque[parents[ordre]]]] += 1
+    return parts
+
+def generer_hierarchie(df_dept, communes, n_arrondissements, graine=GRAINE_DEFAUT):
+    """
+    Génère les arrondissements (feuilles de la hiérarchie) à partir des départements
+    et de la liste de leurs communes : Departement, Commune, Arrondissement,
+    Population, Population_Urbaine, Superficie_km2.
+
+    Populations et nombres d'arrondissements sont répartis en entiers (sommes
+    exactes) ; les taux d'urbanisation des arrondissements varient autour de
+    celui de leur département, dont la moyenne pondérée est conservée
+    (à l'écrêtage à 100 % près).
+    """
+    rng = creer_generateur(graine)
+    noms_dept = df_dept['Departement'].astype(str).tolist()
+    communes_dept = [communes[nom] for nom in noms_dept]
+    noms_communes = np.array([commune for liste in communes_dept for commune in liste])
+    dept_commune = np.repeat(np.arange(len(noms_dept)), [len(liste) for liste in communes_dept])
+    n_communes = len(noms_communes)
+
+    # Départements -> communes, puis nombre d'arrondissements par commune (selon sa population)
+    pop_communes = _repartir_entiers(df_dept['Population'].to_numpy(), rng.gamma(CONCENTRATION, size=n_communes),
+                                     dept_commune)
+    nombres = ARRONDISSEMENTS_MIN + _repartir_entiers(
+        [n_arrondissements - ARRONDISSEMENTS_MIN * n_communes], pop_communes.astype(np.float64),
+        np.zeros(n_communes, dtype=np.int64))
+
+    # Communes -> arrondissements
+    commune_arr = np.repeat(np.arange(n_communes), nombres)
+    dept_arr = dept_commune[commune_arr]
+    n = len(commune_arr)
+    population = _repartir_entiers(pop_communes, rng.gamma(CONCENTRATION, size=n), commune_arr)
+    poids_surface = rng.gamma(CONCENTRATION, size=n)
+    superficie = (df_dept['Superficie_km2'].to_numpy(dtype=np.float64)[dept_arr] * poids_surface
+                  / np.bincount(dept_arr, weights=poids_surface)[dept_arr])
+    facteur = rng.gamma(CONCENTRATION, size=n)
+    facteur /= (np.bincount(dept_arr, weights=population * facteur)
+                / np.bincount(dept_arr, weights=population))[dept_arr]
+    taux = np.minimum(df_dept['Taux_Urbanisation_%'].to_numpy(dtype=np.float64)[dept_arr] * facteur, 100)
+
+    debut_commune = np.concatenate([[0], np.cumsum(nombres)[:-1]])
+    numeros = np.arange(n) - debut_commune[commune_arr] + 1
+    arrondissements = [f'{commune}-{numero:02d}' for commune, numero in zip(noms_communes[commune_arr], numeros)]
+    return pd.DataFrame({
+        'Departement': pd.Categorical.from_codes(dept_arr, categories=noms_dept),
+        'Commune': pd.Categorical.from_codes(commune_arr, categories=noms_communes),
+        'Arrondissement': pd.Categorical(arrondissements, categories=arrondissements),
+        'Population': population.astype(np.int32),
+        'Population_Urbaine': np.rint(population * taux / 100).astype(np.int32),
+        'Superficie_km2': superficie.astype(np.float32),
+    })
+
+def indexer(feuilles):
+    """
+    Index de la hiérarchie : pour chaque niveau, position de la première feuille
+    de chacune de ses unités (les unités occupent des blocs contigus de feuilles)
+    """
+    index = {}
+    for niveau, colonne in NIVEAUX.items():
+        if colonne is None:
+            index[niveau] = np.zeros(1, dtype=np.int64)
+            continue
+        codes = feuilles[colonne].cat.codes.to_numpy()
+        index[niveau] = np.flatnonzero(np.concatenate([[True], codes[1:] != codes[:-1]]))
+    return index
+
+def agreger(feuilles, nom_national, index=None):
+    """
+    Agrège les feuilles à tous les niveaux et retourne un DataFrame indexé par
+    (Niveau, Nom) : Departement, Parent, effectifs additifs (Population,
+    Population_Urbaine, Superficie_km2), indicateurs dérivés (Densite_km2,
+    Pct_Population_Nationale, Taux_Urbanisation_%) et rangs dans le niveau.
+    Chaque niveau est agrégé en une opération np.add.reduceat sur toutes les colonnes
+    """
+    index = index or indexer(feuilles)
+    valeurs = feuilles[COLONNES_ADDITIVES].to_numpy(dtype=np.float64)
+    parents = {'arrondissement': 'Commune', 'commune': 'Departement', 'departement': None, 'national': None}
+    blocs = []
+    for niveau, colonne in NIVEAUX.items():
+        debuts = index[niveau]
+        bloc = pd.DataFrame(np.add.reduceat(valeurs, debuts, axis=0), columns=COLONNES_ADDITIVES)
+        bloc.insert(0, 'Niveau', niveau)
+        bloc.insert(1, 'Nom', feuilles[colonne].to_numpy()[debuts].astype(str) if colonne else nom_national)
+        bloc.insert(2, 'Departement', feuilles['Departement'].to_numpy()[debuts].astype(str)
+                    if niveau != 'national' else nom_national)
+        bloc.insert(3, 'Parent', feuilles[parents[niveau]].to_numpy()[debuts].astype(str)
+                    if parents[niveau] else (nom_national if niveau == 'departement' else ''))
+        blocs.append(bloc)
+    agregats = pd.concat(blocs, ignore_index=True)
+
+    population = agregats['Population'].to_numpy()
+    agregats['Densite_km2'] = population / agregats['Superficie_km2'].to_numpy()
+    agregats['Pct_Population_Nationale'] = population / population[-1] * 100
+    agregats['Taux_Urbanisation_%'] = agregats['Population_Urbaine'].to_numpy() / population * 100
+    par_niveau = agregats.groupby('Niveau', sort=False)
+    for rang, colonne in (('Rang_Population', 'Population'), ('Rang_Densite', 'Densite_km2'),
+                          ('Rang_Urbanisation', 'Taux_Urbanisation_%')):
+        agregats[rang] = par_niveau[colonne].rank(method='first', ascending=False).astype(np.int16)
+    agregats = agregats.astype({'Niveau': pd.CategoricalDtype(list(NIVEAUX)), 'Population': np.int32,
+                                'Population_Urbaine': np.int32, 'Superficie_km2': np.float32,
+                                'Densite_km2': np.float32, 'Pct_Population_Nationale': np.float32,
+                                'Taux_Urbanisation_%': np.float32})
+    return agregats.set_index(['Niveau', 'Nom'])
+
+def avec_hierarchie(donnees, pays=PAYS_DEFAUT, graine=GRAINE_DEFAUT):
+    """
+    Ajoute aux jeux de données les agrégats de la hiérarchie (clé 'hierarchie'),
+    calculés une seule fois. Sans départements ou sans communes connues pour le
+    pays, les données sont retournées telles quelles
+    """
+    if 'hierarchie' in donnees or 'departements' not in donnees or not PAYS[pays].get('communes'):
+        return donnees
+    feuilles = generer_hierarchie(donnees['departements'], PAYS[pays]['communes'],
+                                  PAYS[pays]['arrondissements'], graine)
+    return {**donnees, 'hierarchie': agreger(feuilles, PAYS[pays]['nom'])}
+
+def tranche_niveau(hierarchie, niveau):
+    """
+    Agrégats d'un niveau (departement, commune, arrondissement), indexés par nom d'unité
+    """
+    tranche = hierarchie.xs(niveau, level='Niveau')
+    tranche.index = tranche.index.astype(str)
+    return tranche
+
+def ligne_nationale_hierarchie(hierarchie):
+    """
+    Agrégats nationaux de la hiérarchie
+    """
+    return tranche_niveau(hierarchie, 'national').iloc[0]
+
+def filtrer_hierarchie(hierarchie, departements=()):
+    """
+    Restreint la hiérarchie aux unités de certains départements (la ligne nationale est conservée)
+    """
+    if not departements:
+        return hierarchie
+    niveaux = hierarchie.index.get_level_values('Niveau')
+    return hierarchie[(hierarchie['Departement'].isin(departements) | (niveaux == 'national')).to_numpy()]
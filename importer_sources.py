@@ -0,0 +1,327 @@
+"""
+Import des sources officielles - Dashboard Démographique Bénin
+Auteur: Freud GUEDOU
+
+Lit les extractions en masse stockées localement (World Development
+Indicators de la Banque Mondiale, World Population Prospects de l'ONU),
+en CSV, CSV compressé (.gz) ou archive .zip. Les fichiers sont parcourus
+ligne à ligne : seules les lignes du pays demandé sont décodées et passées
+à pandas, sans charger les centaines de Mo du fichier complet.
+
+Les lignes extraites sont mises en cache (cache_sources/) sous l'empreinte
+du fichier source : une nouvelle exécution sur la même extraction relit
+directement le cache. L'empreinte d'un fichier n'est recalculée que si sa
+taille ou sa date de modification change.
+"""
+
+import argparse
+import gzip
+import io
+import json
+import os
+import zipfile
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+import instrumentation
+from generer_donnees_demographiques import (
+    ANNEES_POPULATION, ANNEES_SOCIAUX, generer_donnees_departements, persister_datasets
+)
+from instrumentation import instrumenter, mesurer
+from manifeste import empreinte_artefact, empreinte_fichier
+from pays import PAYS, PAYS_DEFAUT, a_subdivisions, codes_pays
+from stockage import FORMATS, REPERTOIRE_SORTIE, SCHEMAS, appliquer_schema, ecrire_dataset
+
+REPERTOIRE_CACHE_SOURCES = 'cache_sources'
+INDEX_EMPREINTES = 'empreintes_sources.json'
+VERSION_EXTRACTION = 1
+
+# Colonne portant le code pays ISO3 dans chaque type de source
+COLONNE_PAYS = {'wdi': 'Country Code', 'wpp': 'ISO3_code', 'wpp_ages': 'ISO3_code'}
+
+# Indicateurs WDI -> colonnes des jeux de données
+INDICATEURS_WDI = {
+    'population': {
+        'SP.POP.TOTL': 'Population_Totale',
+        'SP.POP.GROW': 'Taux_Croissance_%',
+        'SP.URB.TOTL': 'Population_Urbaine',
+        'SP.RUR.TOTL': 'Population_Rurale',
+        'SP.URB.TOTL.IN.ZS': 'Pct_Urbain',
+        'SP.DYN.LE00.IN': 'Esperance_Vie_Ans',
+        'SP.DYN.TFRT.IN': 'Taux_Fertilite',
+        'SP.DYN.IMRT.IN': 'Mortalite_Infantile_pour_1000',
+        'EN.POP.DNST': 'Densite_Pop_km2',
+    },
+    'indicateurs_sociaux': {
+        'SE.ADT.LITR.MA.ZS': 'Taux_Alphabetisation_Hommes_%',
+        'SE.ADT.LITR.FE.ZS': 'Taux_Alphabetisation_Femmes_%',
+        'SE.PRM.ENRR': 'Taux_Scolarisation_Primaire_%',
+        'SE.SEC.ENRR': 'Taux_Scolarisation_Secondaire_%',
+        'SH.H2O.BASW.ZS': 'Acces_Eau_Potable_%',
+        'EG.ELC.ACCS.ZS': 'Acces_Electricite_%',
+        'SH.UHC.SRVS.CV.XD': 'Acces_Soins_Sante_%',
+    },
+}
+
+# Colonnes WPP (indicateurs démographiques) -> (colonne, multiplicateur)
+COLONNES_WPP = {
+    'TPopulation1July': ('Population_Totale', 1000),
+    'PopGrowthRate': ('Taux_Croissance_%', 1),
+    'LEx': ('Esperance_Vie_Ans', 1),
+    'TFR': ('Taux_Fertilite', 1),
+    'IMR': ('Mortalite_Infantile_pour_1000', 1),
+    'PopDensity': ('Densite_Pop_km2', 1),
+}
+
+# Arrondis des colonnes importées (mêmes précisions que le générateur)
+ARRONDIS = {
+    'Taux_Croissance_%': 2, 'Pct_Urbain': 1, 'Esperance_Vie_Ans': 1, 'Taux_Fertilite': 2,
+    'Mortalite_Infantile_pour_1000': 1, 'Densite_Pop_km2': 1,
+}
+
+@contextmanager
+def _ouvrir_binaire(chemin):
+    """
+    Ouvre une source en binaire : CSV, CSV compressé (.gz) ou premier CSV d'une archive .zip
+    (le fichier de données principal, hors fichiers *Series*, *Country* et *footnote*).
+    L'archive est fermée avec le fichier lu.
+    """
+    if chemin.endswith('.gz'):
+        with gzip.open(chemin, 'rb') as f:
+            yield f
+    elif chemin.endswith('.zip'):
+        with zipfile.ZipFile(chemin) as archive:
+            membres = [m for m in archive.namelist() if m.lower().endswith('.csv')]
+            principaux = [m for m in membres
+                          if not any(mot in m.lower() for mot in ('series', 'country', 'footnote'))]
+            if not (principaux or membres):
+                raise ValueError(f"Aucun CSV dans l'archive {chemin}")
+            with archive.open((principaux or membres)[0]) as f:
+                yield f
+    else:
+        with open(chemin, 'rb') as f:
+            yield f
+
+def extraire_lignes_pays(chemin, colonne_pays, pays=PAYS_DEFAUT):
+    """
+    Parcourt une source ligne à ligne et retourne un DataFrame des seules lignes du pays.
+
+    Un test de sous-chaîne sur les octets bruts écarte la quasi-totalité des
+    lignes sans les décoder ; les lignes retenues sont ensuite analysées par
+    pandas et filtrées exactement sur la colonne du code pays.
+    """
+    motif = pays.encode('ascii')
+    with _ouvrir_binaire(chemin) as f:
+        entete = f.readline()
+        lignes = [entete]
+        lignes.extend(ligne for ligne in f if motif in ligne)
+    df = pd.read_csv(io.BytesIO(b''.join(lignes)), encoding='utf-8-sig', low_memory=False)
+    df = df.loc[:, ~df.columns.str.startswith('Unnamed')]
+    return df[df[colonne_pays] == pays].reset_index(drop=True)
+
+def _empreinte_source(chemin, repertoire_cache):
+    """
+    Empreinte SHA-256 d'un fichier source, mémorisée par (chemin, taille, date de modification)
+    pour ne pas relire un fichier de plusieurs centaines de Mo à chaque exécution
+    """
+    chemin_index = os.path.join(repertoire_cache, INDEX_EMPREINTES)
+    try:
+        with open(chemin_index, encoding='utf-8') as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        index = {}
+    etat = os.stat(chemin)
+    cle = os.path.abspath(chemin)
+    signature = [etat.st_size, etat.st_mtime_ns]
+    if index.get(cle, {}).get('signature') != signature:
+        index[cle] = {'signature': signature, 'empreinte': empreinte_fichier(chemin)}
+        temporaire = chemin_index + '.tmp'
+        with open(temporaire, 'w', encoding='utf-8') as f:
+            json.dump(index, f, indent=2)
+        os.replace(temporaire, chemin_index)
+    return index[cle]['empreinte']
+
+@instrumenter
+def extraire_avec_cache(chemin, type_source, pays=PAYS_DEFAUT, repertoire_cache=None):
+    """
+    Lignes du pays extraites d'une source, relues depuis le cache si le fichier
+    source (même empreinte) a déjà été traité pour ce pays
+    """
+    repertoire_cache = repertoire_cache or os.path.join(REPERTOIRE_SORTIE, REPERTOIRE_CACHE_SOURCES)
+    os.makedirs(repertoire_cache, exist_ok=True)
+    empreinte = empreinte_artefact({'source': _empreinte_source(chemin, repertoire_cache)},
+                                   {'type': type_source, 'pays': pays, 'version': VERSION_EXTRACTION})
+    chemin_cache = os.path.join(repertoire_cache, f'{type_source}_{pays}_{empreinte[:16]}.csv')
+    if os.path.exists(chemin_cache):
+        print(f"   ⚡ {os.path.basename(chemin)} : cache {os.path.basename(chemin_cache)}")
+        return pd.read_csv(chemin_cache, encoding='utf-8', low_memory=False)
+
+    with mesurer(f'extraire_{type_source}'):
+        df = extraire_lignes_pays(chemin, COLONNE_PAYS[type_source], pays)
+    if df.empty:
+        raise ValueError(f"Aucune ligne pour {pays} dans {chemin}")
+    temporaire = chemin_cache + '.tmp'
+    df.to_csv(temporaire, index=False, encoding='utf-8')
+    os.replace(temporaire, chemin_cache)
+    print(f"   📥 {os.path.basename(chemin)} : {len(df)} ligne(s) extraite(s) pour {pays}")
+    return df
+
+def indicateurs_wdi(df_wdi, correspondances):
+    """
+    Passe les lignes WDI (une ligne par indicateur, une colonne par année) au
+    format du dashboard : une ligne par année, une colonne par indicateur
+    """
+    df = df_wdi[df_wdi['Indicator Code'].isin(correspondances)]
+    colonnes_annees = [col for col in df.columns if str(col).isdigit()]
+    df = (df.set_index('Indicator Code')[colonnes_annees]
+            .rename(index=correspondances).T.apply(pd.to_numeric, errors='coerce'))
+    df.index = df.index.astype(int).rename('Annee')
+    return df.reindex(columns=list(correspondances.values()))
+
+def indicateurs_wpp(df_wpp):
+    """
+    Indicateurs démographiques WPP (variante médiane) par année, aux unités du dashboard
+    """
+    if 'Variant' in df_wpp.columns:
+        df_wpp = df_wpp[df_wpp['Variant'] == 'Medium']
+    df = df_wpp.set_index(df_wpp['Time'].astype(int).rename('Annee'))
+    colonnes = {source: nom for source, (nom, _) in COLONNES_WPP.items() if source in df.columns}
+    return pd.DataFrame({nom: df[source] * COLONNES_WPP[source][1] for source, nom in colonnes.items()})
+
+def structure_age_wpp(df_ages, annee):
+    """
+    Pyramide des âges d'une année au format du dashboard (17 groupes, 80+ ouvert)
+    à partir de la population WPP par groupes quinquennaux (en milliers)
+    """
+    if 'Variant' in df_ages.columns:
+        df_ages = df_ages[df_ages['Variant'] == 'Medium']
+    df = df_ages[df_ages['Time'] == annee]
+    if df.empty:
+        raise ValueError(f"Pas de structure par âge WPP pour {annee}")
+    debut = df['AgeGrp'].astype(str).str.extract(r'^(\d+)')[0].astype(int)
+    groupe = np.minimum(debut, 80)
+    effectifs = (df.assign(Groupe=groupe)
+                   .groupby('Groupe')[['PopMale', 'PopFemale']].sum() * 1000).round()
+    pyramide = pd.DataFrame({
+        'Groupe_Age': [f'{g}-{g + 4} ans' if g < 80 else '80+ ans' for g in effectifs.index],
+        'Hommes': effectifs['PopMale'].to_numpy(dtype=np.int64),
+        'Femmes': effectifs['PopFemale'].to_numpy(dtype=np.int64),
+    })
+    pyramide['Total'] = pyramide['Hommes'] + pyramide['Femmes']
+    pyramide['Pct_Total'] = (pyramide['Total'] / pyramide['Total'].sum() * 100).round(2)
+    return pyramide
+
+def completer_derivees(df, superficie=None):
+    """
+    Complète les colonnes de population manquantes à partir des autres
+    (rurale = totale - urbaine, pourcentage urbain, densité si la superficie est
+    connue, croissance d'une année sur l'autre comme le générateur).
+    Le pourcentage urbain, qui évolue lentement, est prolongé depuis la dernière
+    année connue quand la source s'arrête avant la population (ex. WDI vs WPP).
+    """
+    totale = df['Population_Totale']
+    df['Pct_Urbain'] = df['Pct_Urbain'].fillna(df['Population_Urbaine'] / totale * 100).ffill()
+    df['Population_Urbaine'] = df['Population_Urbaine'].fillna(
+        (totale * df['Pct_Urbain'] / 100).round())
+    df['Population_Rurale'] = df['Population_Rurale'].fillna(totale - df['Population_Urbaine'])
+    if superficie:
+        df['Densite_Pop_km2'] = df['Densite_Pop_km2'].fillna(totale / superficie)
+    df['Taux_Croissance_%'] = df['Taux_Croissance_%'].fillna(totale.pct_change() * 100)
+    return df
+
+@instrumenter
+def importer_sources(wdi=None, wpp=None, wpp_ages=None, pays=PAYS_DEFAUT, annees=ANNEES_POPULATION,
+                     annees_sociales=ANNEES_SOCIAUX, annee_structure=None, repertoire_cache=None):
+    """
+    Construit les jeux de données population, indicateurs_sociaux et structure_age
+    à partir des extractions disponibles (chemins optionnels).
+
+    Pour la population, les valeurs WDI sont prioritaires et complétées par le
+    WPP ; les colonnes encore manquantes sont dérivées des autres (densité avec la
+    superficie du registre des pays). La pyramide est celle de annee_structure
+    (dernière des `annees` par défaut). Retourne un dictionnaire nom -> DataFrame
+    (seuls les jeux de données couverts par les sources).
+    """
+    annee_structure = max(annees) if annee_structure is None else annee_structure
+    extraits = {type_source: extraire_avec_cache(chemin, type_source, pays, repertoire_cache)
+                for type_source, chemin in (('wdi', wdi), ('wpp', wpp), ('wpp_ages', wpp_ages))
+                if chemin}
+    datasets = {}
+
+    colonnes = list(SCHEMAS['population'])[1:]
+    population = pd.DataFrame(index=pd.Index(list(annees), name='Annee'), columns=colonnes, dtype=float)
+    if 'wdi' in extraits:
+        population = population.combine_first(
+            indicateurs_wdi(extraits['wdi'], INDICATEURS_WDI['population']))
+    if 'wpp' in extraits:
+        population = population.combine_first(indicateurs_wpp(extraits['wpp']))
+    population = population.reindex(list(annees))[colonnes]
+    if population['Population_Totale'].notna().any():
+        population = completer_derivees(population, PAYS.get(pays, {}).get('superficie'))
+        population = population.dropna(subset=['Population_Totale'])
+        population = population.round(ARRONDIS).reset_index()
+        entiers = {col: 0 for col, type_ in SCHEMAS['population'].items()
+                   if pd.api.types.is_integer_dtype(type_)}
+        datasets['population'] = appliquer_schema(population.round(entiers), 'population')
+
+    if 'wdi' in extraits:
+        sociaux = indicateurs_wdi(extraits['wdi'], INDICATEURS_WDI['indicateurs_sociaux'])
+        sociaux = sociaux.reindex(list(annees_sociales)).round(1).reset_index()
+        datasets['indicateurs_sociaux'] = appliquer_schema(sociaux, 'indicateurs_sociaux')
+
+    if 'wpp_ages' in extraits:
+        datasets['structure_age'] = structure_age_wpp(extraits['wpp_ages'], annee_structure)
+    return datasets
+
+def main():
+    """
+    Point d'entrée en ligne de commande
+    """
+    parser = argparse.ArgumentParser(description="Import des extractions Banque Mondiale / ONU")
+    parser.add_argument('--wdi', help="extraction WDI (WDICSV.csv, .csv.gz ou WDI_CSV.zip)")
+    parser.add_argument('--wpp', help="indicateurs démographiques WPP (Demographic_Indicators)")
+    parser.add_argument('--wpp-ages', help="population WPP par groupes d'âge quinquennaux")
+    parser.add_argument('--pays', default=PAYS_DEFAUT, help="code ISO3 du pays, en majuscules ou minuscules (défaut: BEN)")
+    parser.add_argument('--sortie', default=None,
+                        help=f"répertoire de sortie et du cache (défaut: {REPERTOIRE_SORTIE})")
+    parser.add_argument('--format', action='append', choices=list(FORMATS), dest='formats',
+                        help="format de stockage des jeux de données (répétable, défaut: csv)")
+    instrumentation.ajouter_options(parser)
+    args = parser.parse_args()
+    if not (args.wdi or args.wpp or args.wpp_ages):
+        parser.error("au moins une source est nécessaire (--wdi, --wpp ou --wpp-ages)")
+    try:
+        selection = codes_pays(args.pays)
+    except ValueError as erreur:
+        parser.error(str(erreur))
+    if len(selection) > 1:
+        parser.error("un seul pays par import (--pays CEDEAO non pris en charge)")
+    args.pays = selection[0]
+
+    repertoire = args.sortie or REPERTOIRE_SORTIE
+    print("\n📚 Import des sources officielles...")
+    with instrumentation.session(args):
+        datasets = importer_sources(args.wdi, args.wpp, args.wpp_ages, args.pays,
+                                    repertoire_cache=os.path.join(repertoire, REPERTOIRE_CACHE_SOURCES))
+        for nom, df in datasets.items():
+            print(f"   • {nom}: {len(df)} ligne(s)")
+        manquants = [nom for nom in ('population', 'structure_age', 'indicateurs_sociaux')
+                     if nom not in datasets]
+        if manquants:
+            # Sans les trois jeux de données, ni le cube ni le classeur ne peuvent être reconstruits
+            print(f"   ⚠️  Non couverts par les sources: {', '.join(manquants)}")
+            os.makedirs(repertoire, exist_ok=True)
+            for nom, df in datasets.items():
+                for format in args.formats or ('csv',):
+                    print(f"   💾 {ecrire_dataset(df, nom, repertoire, format, pays=args.pays)}")
+        else:
+            # Les découpages départementaux ne figurent dans aucune des deux sources
+            if a_subdivisions(args.pays):
+                datasets['departements'] = generer_donnees_departements(pays=args.pays)
+            persister_datasets(datasets, repertoire, args.formats or ('csv',), pays=args.pays)
+    print("✅ Import terminé\n")
+
+if __name__ == "__main__":
+    main()
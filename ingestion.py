@@ -0,0 +1,246 @@
+"""
+Ingestion incrémentale - Dashboard Démographique Bénin
+Auteur: Freud GUEDOU
+
+Ajoute de nouvelles années aux jeux de données déjà enregistrés, sans
+régénérer ni réécrire tout l'historique : les lignes reçues sont validées
+(puis les jeux de données complétés, par les règles de validation.py, avant
+toute écriture), leurs colonnes dérivées (Population_Rurale, Pct_Urbain, Densite_Pop_km2,
+Taux_Croissance_%) sont calculées pour ces seules lignes, puis ajoutées en
+fin de fichier (CSV) ou au fichier columnaire. Seules les lignes du cube
+d'indicateurs correspondant aux nouvelles années sont calculées, et le
+manifeste est mis à jour pour les fichiers touchés. Ces fichiers y sont
+marqués comme ingérés : une régénération (generer, pipeline) conserve les
+années ajoutées. Le répertoire d'un autre pays de la CEDEAO (sortie de
+pipeline.py --pays) se complète avec --pays et son code ISO3.
+"""
+
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+import instrumentation
+from cube_kpi import INDEX_CUBE, construire_cube
+from generer_donnees_demographiques import DATASETS_ANNUELS, FEUILLES_EXCEL, SUPERFICIE_BENIN, fichier_excel
+from instrumentation import instrumenter, mesurer
+from manifeste import (
+    ORIGINE_INGESTION, charger_manifeste, empreinte_artefact, empreinte_dataframe,
+    enregistrer_artefact, sauvegarder_manifeste
+)
+from pays import PAYS, PAYS_DEFAUT, codes_pays
+from stockage import (
+    FICHIERS, FORMATS, REPERTOIRE_SORTIE, SCHEMAS, appliquer_schema, ecrire_dataset,
+    exporter_excel_flux, lire_dataset, nom_fichier
+)
+from validation import controler
+
+# Colonnes à fournir pour chaque jeu de données (les autres sont dérivées)
+COLONNES_SAISIES = {
+    'population': ['Annee', 'Population_Totale', 'Population_Urbaine', 'Esperance_Vie_Ans',
+                   'Taux_Fertilite', 'Mortalite_Infantile_pour_1000'],
+    'indicateurs_sociaux': list(SCHEMAS['indicateurs_sociaux']),
+}
+
+def valider_nouvelles_lignes(nouvelles, existant, nom):
+    """
+    Vérifie les lignes à ajouter : colonnes requises, années nouvelles et uniques,
+    valeurs positives, pourcentages dans [0, 100]. Lève ValueError avec la liste des problèmes.
+    """
+    problemes = []
+    manquantes = [col for col in COLONNES_SAISIES[nom] if col not in nouvelles.columns]
+    if manquantes:
+        raise ValueError(f"{nom} : colonnes manquantes : {', '.join(manquantes)}")
+
+    annees = nouvelles['Annee']
+    if annees.duplicated().any():
+        problemes.append(f"années en double : {sorted(annees[annees.duplicated()].unique())}")
+    deja_presentes = annees[annees.isin(existant['Annee'])]
+    if len(deja_presentes):
+        problemes.append(f"années déjà présentes : {sorted(deja_presentes)}")
+    if len(existant) and (annees <= existant['Annee'].max()).any():
+        problemes.append(f"les nouvelles années doivent suivre {existant['Annee'].max()}")
+
+    valeurs = nouvelles[COLONNES_SAISIES[nom]].drop(columns='Annee')
+    if valeurs.isna().any().any():
+        problemes.append(f"valeurs manquantes : {', '.join(valeurs.columns[valeurs.isna().any()])}")
+    if (valeurs < 0).any().any():
+        problemes.append(f"valeurs négatives : {', '.join(valeurs.columns[(valeurs < 0).any()])}")
+    pourcentages = [col for col in valeurs.columns if col.endswith('%')]
+    if pourcentages and (valeurs[pourcentages] > 100).any().any():
+        problemes.append("pourcentages supérieurs à 100")
+    if nom == 'population' and (nouvelles['Population_Urbaine'] > nouvelles['Population_Totale']).any():
+        problemes.append("population urbaine supérieure à la population totale")
+
+    if problemes:
+        raise ValueError(f"{nom} : " + " ; ".join(problemes))
+
+def completer_population(nouvelles, existant, superficie=SUPERFICIE_BENIN):
+    """
+    Calcule les colonnes dérivées des seules nouvelles lignes de population.
+    Le taux de croissance (s'il n'est pas fourni) est le taux annuel moyen depuis
+    l'année précédente, la dernière ligne existante servant de point de départ.
+    """
+    df = nouvelles.sort_values('Annee').reset_index(drop=True)
+    totale = df['Population_Totale'].to_numpy(dtype=np.float64)
+    df['Population_Rurale'] = df['Population_Totale'] - df['Population_Urbaine']
+    df['Pct_Urbain'] = (df['Population_Urbaine'] / totale * 100).round(1)
+    df['Densite_Pop_km2'] = (totale / superficie).round(1)
+
+    if 'Taux_Croissance_%' not in df.columns or df['Taux_Croissance_%'].isna().any():
+        precedente = existant.iloc[[-1]] if len(existant) else df.iloc[[0]]
+        populations = np.concatenate([precedente['Population_Totale'].to_numpy(np.float64), totale])
+        ecarts = np.diff(np.concatenate([precedente['Annee'].to_numpy(), df['Annee'].to_numpy()]))
+        croissance = ((populations[1:] / populations[:-1]) ** (1 / np.maximum(ecarts, 1)) - 1) * 100
+        calcule = pd.Series(croissance.round(2), index=df.index)
+        df['Taux_Croissance_%'] = df['Taux_Croissance_%'].fillna(calcule) if 'Taux_Croissance_%' in df else calcule
+    return df[list(SCHEMAS['population'])]
+
+def ajouter_lignes(lignes, nom, repertoire, format='csv', pays=PAYS_DEFAUT):
+    """
+    Ajoute des lignes à un jeu de données enregistré et retourne le chemin du fichier.
+    En CSV, les lignes sont écrites en fin de fichier sans réécrire l'existant ;
+    Parquet et Feather, non modifiables en place, sont relus et réécrits.
+    """
+    chemin = os.path.join(repertoire, nom_fichier(nom, format, pays))
+    lignes = appliquer_schema(lignes, nom)[list(SCHEMAS[nom])]
+    if format == 'csv':
+        with open(chemin, 'a', encoding='utf-8-sig', newline='') as f:
+            lignes.to_csv(f, header=False, index=False)
+        return chemin
+    existant = lire_dataset(nom, repertoire, format, pays=pays)
+    return ecrire_dataset(pd.concat([existant, lignes], ignore_index=True), nom, repertoire, format, pays)
+
+def _enregistrer(manifeste, repertoire, nom, df, format, pays=PAYS_DEFAUT):
+    """
+    Met à jour l'entrée du manifeste d'un fichier complété (même empreinte que persister_datasets),
+    marquée comme ingérée pour qu'une régénération conserve ses nouvelles années
+    """
+    entrees = {nom: empreinte_dataframe(df)}
+    parametres = {'format': format}
+    enregistrer_artefact(manifeste, repertoire, nom_fichier(nom, format, pays),
+                         empreinte_artefact(entrees, parametres), entrees, parametres,
+                         ORIGINE_INGESTION if nom in DATASETS_ANNUELS else None)
+
+@instrumenter
+def ingerer(nouvelles, repertoire=None, formats=('csv',), excel=False, figures=False, pays=PAYS_DEFAUT,
+            strict=False):
+    """
+    Ajoute de nouvelles années aux jeux de données enregistrés du pays `pays`.
+
+    `nouvelles` associe un jeu de données annuel (population, indicateurs_sociaux)
+    aux lignes à ajouter. Chaque format listé doit déjà exister dans `repertoire` ;
+    les jeux de données absents pour le pays (departements d'un pays sans
+    subdivisions) sont ignorés. Les jeux de données complétés passent les règles
+    de cohérence (validation.controler) avant toute écriture : une violation de
+    niveau « erreur » (ou tout avertissement avec strict=True) refuse l'ingestion
+    (ValueError). excel=True réexporte le classeur (en flux) ; figures=True
+    redessine les figures dont les données ont changé.
+    Retourne les jeux de données complets.
+    """
+    repertoire = repertoire or REPERTOIRE_SORTIE
+    manifeste = charger_manifeste(repertoire)
+    donnees = {nom: lire_dataset(nom, repertoire, formats[0], pays=pays) for nom in FICHIERS
+               if nom != 'cube' and os.path.exists(os.path.join(repertoire, nom_fichier(nom, formats[0], pays)))}
+    annees_population, ajouts = [], {}
+
+    for nom, lignes in nouvelles.items():
+        if nom not in DATASETS_ANNUELS:
+            raise ValueError(f"{nom} n'est pas un jeu de données annuel ({', '.join(DATASETS_ANNUELS)})")
+        if nom not in donnees:
+            raise ValueError(f"{nom_fichier(nom, formats[0], pays)} absent de {repertoire}")
+        existant = donnees[nom]
+        valider_nouvelles_lignes(lignes, existant, nom)
+        if nom == 'population':
+            lignes = completer_population(lignes, existant, PAYS[pays]['superficie'])
+            annees_population = lignes['Annee'].tolist()
+        else:
+            lignes = lignes.sort_values('Annee')
+        donnees[nom] = pd.concat([existant, appliquer_schema(lignes, nom)[list(SCHEMAS[nom])]],
+                                 ignore_index=True)
+        ajouts[nom] = lignes
+
+    # Règles de cohérence sur les jeux de données complétés, avant toute écriture
+    rapport = controler(donnees)
+    if strict and len(rapport):
+        raise ValueError(f"avertissements de validation : {', '.join(rapport['Regle'])}")
+
+    for nom, lignes in ajouts.items():
+        for format in formats:
+            with mesurer(f'ajouter_{format}', [os.path.join(repertoire, nom_fichier(nom, format, pays))]):
+                ajouter_lignes(lignes, nom, repertoire, format, pays)
+            _enregistrer(manifeste, repertoire, nom, donnees[nom], format, pays)
+        print(f"   ➕ {nom} : {len(lignes)} année(s) ajoutée(s) "
+              f"({lignes['Annee'].min()}-{lignes['Annee'].max()})")
+
+    # Cube : seules les lignes des nouvelles années sont calculées puis ajoutées
+    if annees_population and 'structure_age' in donnees:
+        superficie = None if 'departements' in donnees else PAYS[pays]['superficie']
+        lignes_cube = construire_cube(donnees, annees_population, PAYS[pays]['nom'], superficie).reset_index()
+        for format in formats:
+            if not os.path.exists(os.path.join(repertoire, nom_fichier('cube', format, pays))):
+                continue
+            cube = pd.concat([lire_dataset('cube', repertoire, format, pays=pays), lignes_cube], ignore_index=True)
+            with mesurer(f'ajouter_cube_{format}'):
+                ajouter_lignes(lignes_cube, 'cube', repertoire, format, pays)
+            _enregistrer(manifeste, repertoire, 'cube', appliquer_schema(cube, 'cube'), format, pays)
+            donnees['cube'] = cube
+        print(f"   ➕ cube : {len(lignes_cube)} ligne(s) ajoutée(s)")
+
+    if excel:
+        classeur = fichier_excel(pays)
+        chemin_excel = os.path.join(repertoire, classeur)
+        with mesurer('ecrire_excel_flux', [chemin_excel]):
+            exporter_excel_flux(donnees, chemin_excel,
+                                {nom: feuille for nom, feuille in FEUILLES_EXCEL.items() if nom in donnees})
+        print(f"   💾 {classeur} réexporté")
+    sauvegarder_manifeste(manifeste, repertoire)
+
+    if figures:
+        from creer_visualisations import rendre_visualisations
+        donnees_figures = dict(donnees)
+        if 'cube' in donnees_figures:
+            donnees_figures['cube'] = appliquer_schema(donnees['cube'], 'cube').set_index(INDEX_CUBE).sort_index()
+        rendre_visualisations(donnees_figures, repertoire, pays=pays)
+    return donnees
+
+def main():
+    """
+    Point d'entrée en ligne de commande
+    """
+    parser = argparse.ArgumentParser(description="Ajoute de nouvelles années aux données enregistrées")
+    parser.add_argument('fichier', help="CSV des nouvelles années (colonnes du jeu de données)")
+    parser.add_argument('--dataset', choices=DATASETS_ANNUELS, default='population')
+    parser.add_argument('--sortie', default=None,
+                        help=f"répertoire des données (défaut: {REPERTOIRE_SORTIE})")
+    parser.add_argument('--format', action='append', choices=list(FORMATS), dest='formats',
+                        help="formats enregistrés à compléter (répétable, défaut: csv)")
+    parser.add_argument('--pays', default=PAYS_DEFAUT,
+                        help="code ISO3 du pays dont les fichiers sont complétés (défaut: BEN)")
+    parser.add_argument('--strict', action='store_true',
+                        help="refuser aussi l'ingestion sur un avertissement de validation")
+    parser.add_argument('--excel', action='store_true', help="réexporter le classeur Excel")
+    parser.add_argument('--figures', action='store_true',
+                        help="redessiner les figures dont les données ont changé")
+    instrumentation.ajouter_options(parser)
+    args = parser.parse_args()
+    try:
+        selection = codes_pays(args.pays)
+    except ValueError as erreur:
+        parser.error(str(erreur))
+    if len(selection) > 1:
+        parser.error("un seul pays par ingestion (--pays CEDEAO non pris en charge)")
+
+    nouvelles = pd.read_csv(args.fichier, encoding='utf-8-sig')
+    print(f"\n📥 Ingestion de {len(nouvelles)} ligne(s) dans {args.dataset}")
+    with instrumentation.session(args):
+        try:
+            ingerer({args.dataset: nouvelles}, args.sortie, args.formats or ('csv',),
+                    excel=args.excel, figures=args.figures, pays=selection[0], strict=args.strict)
+        except ValueError as erreur:
+            parser.exit(1, f"❌ Ingestion refusée : {erreur}\n")
+    print("✅ Ingestion terminée\n")
+
+if __name__ == "__main__":
+    main()
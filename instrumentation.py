@@ -0,0 +1,211 @@
+"""
+Instrumentation des étapes - Dashboard Démographique Bénin
+Auteur: Freud GUEDOU
+
+Mesure, pour chaque étape (chargement, génération, rendu, écriture de
+fichier), le temps réel, le temps CPU, le pic de mémoire Python et le
+nombre d'octets écrits. Les étapes s'imbriquent (ex.
+visualiser_departements/savefig) et le rapport peut être exporté en JSON
+ou CSV, avec en option un profil cProfile.
+Désactivée par défaut : une étape non mesurée ne coûte qu'un test booléen.
+"""
+
+import cProfile
+import functools
+import itertools
+import json
+import os
+import resource
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+_ETAT = {'actif': False, 'memoire': False}
+_MESURES = []
+_PILE = []
+_IDENTIFIANTS = itertools.count(1)
+
+def activer(memoire=True, reinitialiser=False):
+    """
+    Active l'enregistrement des mesures (memoire=True suit aussi les allocations
+    Python avec tracemalloc, ce qui ralentit sensiblement l'exécution).
+    reinitialiser=True oublie les mesures et étapes en cours héritées du processus
+    parent (workers créés par fork, qui ne doivent remonter que leurs propres mesures)
+    """
+    global _IDENTIFIANTS
+    if reinitialiser:
+        _MESURES.clear()
+        _PILE.clear()
+        _IDENTIFIANTS = itertools.count(1)
+    _ETAT.update(actif=True, memoire=memoire)
+    if memoire and not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+def desactiver():
+    """
+    Désactive l'enregistrement et arrête le suivi mémoire
+    """
+    if _ETAT['memoire'] and tracemalloc.is_tracing():
+        tracemalloc.stop()
+    _ETAT.update(actif=False, memoire=False)
+
+def est_actif():
+    """
+    Vrai si l'instrumentation est active
+    """
+    return _ETAT['actif']
+
+def _rss_max_mo():
+    """
+    Pic de mémoire résidente du processus en Mo (ru_maxrss est en octets sous macOS)
+    """
+    pic = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return pic / 1024 ** 2 if sys.platform == 'darwin' else pic / 1024
+
+@contextmanager
+def mesurer(etape, fichiers=()):
+    """
+    Mesure un bloc de code. `fichiers` liste les fichiers écrits par le bloc :
+    leur taille est comptée dans les octets écrits de l'étape.
+    """
+    if not _ETAT['actif']:
+        yield
+        return
+
+    nom = f"{_PILE[-1]['etape']}/{etape}" if _PILE else etape
+    mesure = {'id': next(_IDENTIFIANTS), 'parent': _PILE[-1]['id'] if _PILE else 0,
+              'etape': nom, 'niveau': len(_PILE), 'pid': os.getpid(), 'octets_ecrits': 0}
+    if _ETAT['memoire']:
+        # Le pic du parent est conservé avant la remise à zéro pour l'étape imbriquée
+        if _PILE:
+            _PILE[-1]['_pic'] = max(_PILE[-1].get('_pic', 0), tracemalloc.get_traced_memory()[1])
+        tracemalloc.reset_peak()
+    _PILE.append(mesure)
+    debut, debut_cpu = time.perf_counter(), time.process_time()
+    try:
+        yield
+    finally:
+        mesure['duree_s'] = time.perf_counter() - debut
+        mesure['cpu_s'] = time.process_time() - debut_cpu
+        _PILE.pop()
+        if _ETAT['memoire']:
+            pic = max(mesure.pop('_pic', 0), tracemalloc.get_traced_memory()[1])
+            mesure['pic_memoire_mo'] = pic / 1024 ** 2
+            if _PILE:
+                _PILE[-1]['_pic'] = max(_PILE[-1].get('_pic', 0), pic)
+        mesure['rss_max_mo'] = _rss_max_mo()
+        mesure['octets_ecrits'] += sum(os.path.getsize(f) for f in fichiers if os.path.exists(f))
+        if _PILE:
+            _PILE[-1]['octets_ecrits'] += mesure['octets_ecrits']
+        _MESURES.append(mesure)
+
+def instrumenter(fonction=None, etape=None):
+    """
+    Décorateur : mesure chaque appel de la fonction comme une étape (nom de la fonction par défaut)
+    """
+    def decorer(f):
+        nom = etape or f.__name__
+
+        @functools.wraps(f)
+        def enveloppe(*args, **kwargs):
+            if not _ETAT['actif']:
+                return f(*args, **kwargs)
+            with mesurer(nom):
+                return f(*args, **kwargs)
+        return enveloppe
+    return decorer(fonction) if fonction is not None else decorer
+
+def extraire_mesures():
+    """
+    Retourne et vide les mesures enregistrées (utilisé pour les remonter des workers)
+    """
+    mesures = list(_MESURES)
+    _MESURES.clear()
+    return mesures
+
+def ajouter_mesures(mesures):
+    """
+    Ajoute des mesures venant d'un autre processus
+    """
+    _MESURES.extend(mesures)
+
+def rapport():
+    """
+    Mesures sous forme de DataFrame, avec le temps propre de chaque étape
+    (sa durée moins celle de ses étapes imbriquées directes)
+    """
+    import pandas as pd
+
+    df = pd.DataFrame(_MESURES)
+    if df.empty:
+        return df
+    enfants = df.groupby(['pid', 'parent'])['duree_s'].sum()
+    cles = pd.MultiIndex.from_arrays([df['pid'], df['id']])
+    df['duree_propre_s'] = df['duree_s'] - enfants.reindex(cles).fillna(0).to_numpy()
+    return df
+
+def ecrire_rapport(chemin):
+    """
+    Écrit le rapport en JSON ou en CSV selon l'extension du fichier
+    """
+    df = rapport()
+    if chemin.endswith('.csv'):
+        df.to_csv(chemin, index=False)
+    else:
+        with open(chemin, 'w', encoding='utf-8') as f:
+            json.dump(df.to_dict(orient='records'), f, indent=2, ensure_ascii=False)
+    return chemin
+
+def afficher_resume(n=15):
+    """
+    Affiche les étapes les plus coûteuses (par temps propre cumulé)
+    """
+    df = rapport()
+    if df.empty:
+        return
+    resume = (df.groupby('etape')
+                .agg(appels=('duree_s', 'size'), duree_s=('duree_s', 'sum'),
+                     propre_s=('duree_propre_s', 'sum'), cpu_s=('cpu_s', 'sum'),
+                     octets=('octets_ecrits', 'sum'))
+                .sort_values('propre_s', ascending=False).head(n))
+    print("\n⏱️  Étapes les plus coûteuses (temps propre):")
+    for etape, ligne in resume.iterrows():
+        print(f"   • {etape:<50} {ligne['propre_s']:7.3f} s  (total {ligne['duree_s']:.3f} s, "
+              f"cpu {ligne['cpu_s']:.3f} s, {int(ligne['appels'])} appel(s), "
+              f"{ligne['octets'] / 1e3:,.0f} Ko)")
+
+def ajouter_options(parser):
+    """
+    Ajoute les options d'instrumentation à un analyseur argparse
+    """
+    parser.add_argument('--profil', metavar='RAPPORT',
+                        help="écrire le rapport de mesures par étape (.json ou .csv)")
+    parser.add_argument('--sans-memoire', action='store_true',
+                        help="ne pas suivre le pic mémoire (tracemalloc) pendant le profilage")
+    parser.add_argument('--cprofile', metavar='FICHIER',
+                        help="écrire aussi un profil cProfile (lisible avec pstats/snakeviz)")
+
+@contextmanager
+def session(args):
+    """
+    Active l'instrumentation selon les options de ligne de commande et écrit les rapports à la fin
+    """
+    if not (args.profil or args.cprofile):
+        yield
+        return
+    activer(memoire=not args.sans_memoire)
+    profileur = cProfile.Profile() if args.cprofile else None
+    if profileur:
+        profileur.enable()
+    try:
+        yield
+    finally:
+        if profileur:
+            profileur.disable()
+            profileur.dump_stats(args.cprofile)
+            print(f"📄 Profil cProfile: {args.cprofile}")
+        if args.profil:
+            afficher_resume()
+            print(f"📄 Rapport de mesures: {ecrire_rapport(args.profil)}")
+        desactiver()
@@ -0,0 +1,113 @@
+"""
+Manifeste de construction - Dashboard Démographique Bénin
+Auteur: Freud GUEDOU
+
+Enregistre, pour chaque fichier produit (CSV, Excel, PNG), l'empreinte des
+données et des paramètres qui l'ont généré. Une nouvelle exécution peut
+ainsi ne régénérer que les fichiers dont les entrées ont changé.
+"""
+
+import hashlib
+import inspect
+import json
+import os
+from datetime import datetime
+
+import pandas as pd
+
+NOM_MANIFESTE = 'manifeste_build.json'
+VERSION_MANIFESTE = 1
+
+# Origine d'un fichier complété par ingestion.py : ses années ajoutées ne doivent
+# pas être effacées par une régénération
+ORIGINE_INGESTION = 'ingestion'
+
+def empreinte_dataframe(df):
+    """
+    Empreinte SHA-256 du contenu d'un DataFrame (colonnes et valeurs).
+    Les types ne sont pas inclus : un même contenu donne la même empreinte qu'il
+    vienne du générateur en mémoire ou d'un fichier relu avec son schéma.
+    """
+    h = hashlib.sha256()
+    h.update(repr(list(df.columns)).encode('utf-8'))
+    h.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    return h.hexdigest()
+
+def empreinte_fichier(chemin, taille_bloc=1 << 20):
+    """
+    Empreinte SHA-256 d'un fichier, lu par blocs
+    """
+    h = hashlib.sha256()
+    with open(chemin, 'rb') as f:
+        for bloc in iter(lambda: f.read(taille_bloc), b''):
+            h.update(bloc)
+    return h.hexdigest()
+
+def empreinte_fonction(fonction):
+    """
+    Empreinte du code source d'une fonction (un changement de code invalide ses sorties)
+    """
+    return hashlib.sha256(inspect.getsource(fonction).encode('utf-8')).hexdigest()
+
+def empreinte_artefact(entrees, parametres):
+    """
+    Combine les empreintes des entrées et les paramètres en une empreinte unique
+    """
+    contenu = json.dumps({'entrees': entrees, 'parametres': parametres},
+                         sort_keys=True, default=str)
+    return hashlib.sha256(contenu.encode('utf-8')).hexdigest()
+
+def charger_manifeste(repertoire):
+    """
+    Charge le manifeste du répertoire de sortie (vide s'il n'existe pas ou est illisible)
+    """
+    chemin = os.path.join(repertoire, NOM_MANIFESTE)
+    try:
+        with open(chemin, encoding='utf-8') as f:
+            manifeste = json.load(f)
+    except (OSError, ValueError):
+        manifeste = {}
+    if manifeste.get('version') != VERSION_MANIFESTE:
+        manifeste = {'version': VERSION_MANIFESTE, 'artefacts': {}}
+    return manifeste
+
+def sauvegarder_manifeste(manifeste, repertoire):
+    """
+    Écrit le manifeste de façon atomique (fichier temporaire puis renommage)
+    """
+    chemin = os.path.join(repertoire, NOM_MANIFESTE)
+    temporaire = chemin + '.tmp'
+    with open(temporaire, 'w', encoding='utf-8') as f:
+        json.dump(manifeste, f, indent=2, ensure_ascii=False, sort_keys=True)
+    os.replace(temporaire, chemin)
+
+def est_a_jour(manifeste, repertoire, artefact, empreinte):
+    """
+    Vrai si l'artefact existe, n'a pas été modifié et a été produit avec la même empreinte
+    """
+    entree = manifeste['artefacts'].get(artefact)
+    chemin = os.path.join(repertoire, artefact)
+    if entree is None or entree['empreinte'] != empreinte or not os.path.exists(chemin):
+        return False
+    return entree['sortie'] == empreinte_fichier(chemin)
+
+def enregistrer_artefact(manifeste, repertoire, artefact, empreinte, entrees, parametres, origine=None):
+    """
+    Enregistre dans le manifeste un artefact qui vient d'être (re)généré
+    (origine=ORIGINE_INGESTION pour un fichier qui contient des années ingérées)
+    """
+    entree = manifeste['artefacts'][artefact] = {
+        'empreinte': empreinte,
+        'sortie': empreinte_fichier(os.path.join(repertoire, artefact)),
+        'entrees': entrees,
+        'parametres': parametres,
+        'date': datetime.now().isoformat(timespec='seconds'),
+    }
+    if origine:
+        entree['origine'] = origine
+
+def origine_artefact(manifeste, artefact):
+    """
+    Origine enregistrée d'un artefact (None s'il a seulement été généré)
+    """
+    return manifeste['artefacts'].get(artefact, {}).get('origine')
@@ -0,0 +1,137 @@
+"""
+Registre des pays - Dashboard Démographique CEDEAO
+Auteur: Freud GUEDOU
+
+Paramètres nationaux des pays de la CEDEAO utilisés par les générateurs et
+les visualisations : nom (et forme « du/de la » pour les titres), code ISO3,
+superficie, populations de 1990 et 2024, niveaux des indicateurs sociaux en
+début et fin de période (ordres de grandeur, voir INDICATEURS_SOCIAUX) et,
+quand elles sont disponibles, les subdivisions de premier niveau
+(départements, régions), leurs communes et le nombre d'arrondissements.
+"""
+
+PAYS_DEFAUT = 'BEN'
+
+# Au-delà de DENSITE_URBAINE_KM2 hab/km², une subdivision est majoritairement urbaine :
+# son taux d'urbanisation est dans URBANISATION_DENSE (%)
+DENSITE_URBAINE_KM2 = 1000
+URBANISATION_DENSE = (80, 100)
+
+# Ordre des niveaux 'sociaux' du registre : (début, fin) de période en %, par indicateur
+INDICATEURS_SOCIAUX = (
+    'Taux_Alphabetisation_Hommes_%', 'Taux_Alphabetisation_Femmes_%',
+    'Taux_Scolarisation_Primaire_%', 'Taux_Scolarisation_Secondaire_%',
+    'Acces_Eau_Potable_%', 'Acces_Electricite_%', 'Acces_Soins_Sante_%',
+)
+
+PAYS = {
+    'BEN': {'nom': 'Bénin', 'de': 'du Bénin', 'superficie': 112760,
+            'pop_1990': 4779000, 'pop_2024': 14462724,
+            'sociaux': ((50, 65), (30, 50), (85, 95), (35, 55), (65, 80), (28, 50), (45, 65)),
+            'subdivisions': [
+                {'Departement': 'Alibori', 'Population': 867463, 'Superficie_km2': 25683, 'Chef_lieu': 'Kandi'},
+                {'Departement': 'Atacora', 'Population': 769337, 'Superficie_km2': 20459, 'Chef_lieu': 'Natitingou'},
+                {'Departement': 'Atlantique', 'Population': 1398229, 'Superficie_km2': 3233, 'Chef_lieu': 'Ouidah'},
+                {'Departement': 'Borgou', 'Population': 1202095, 'Superficie_km2': 25310, 'Chef_lieu': 'Parakou'},
+                {'Departement': 'Collines', 'Population': 717477, 'Superficie_km2': 13931, 'Chef_lieu': 'Savalou'},
+                {'Departement': 'Couffo', 'Population': 745328, 'Superficie_km2': 2404, 'Chef_lieu': 'Aplahoué'},
+                {'Departement': 'Donga', 'Population': 542605, 'Superficie_km2': 10691, 'Chef_lieu': 'Djougou'},
+                {'Departement': 'Littoral', 'Population': 679012, 'Superficie_km2': 79, 'Chef_lieu': 'Cotonou'},
+                {'Departement': 'Mono', 'Population': 497243, 'Superficie_km2': 1396, 'Chef_lieu': 'Lokossa'},
+                {'Departement': 'Ouémé', 'Population': 1096850, 'Superficie_km2': 1281, 'Chef_lieu': 'Porto-Novo'},
+                {'Departement': 'Plateau', 'Population': 622372, 'Superficie_km2': 3264, 'Chef_lieu': 'Pobè'},
+                {'Departement': 'Zou', 'Population': 851580, 'Superficie_km2': 5106, 'Chef_lieu': 'Abomey'},
+            ],
+            # Les 77 communes, par département
+            'communes': {
+                'Alibori': ['Banikoara', 'Gogounou', 'Kandi', 'Karimama', 'Malanville', 'Segbana'],
+                'Atacora': ['Boukoumbé', 'Cobly', 'Kérou', 'Kouandé', 'Matéri', 'Natitingou',
+                            'Péhunco', 'Tanguiéta', 'Toucountouna'],
+                'Atlantique': ['Abomey-Calavi', 'Allada', 'Kpomassè', 'Ouidah', 'Sô-Ava', 'Toffo',
+                               'Tori-Bossito', 'Zè'],
+                'Borgou': ['Bembèrèkè', 'Kalalé', "N'Dali", 'Nikki', 'Parakou', 'Pèrèrè', 'Sinendé',
+                           'Tchaourou'],
+                'Collines': ['Bantè', 'Dassa-Zoumè', 'Glazoué', 'Ouèssè', 'Savalou', 'Savè'],
+                'Couffo': ['Aplahoué', 'Djakotomey', 'Dogbo', 'Klouékanmè', 'Lalo', 'Toviklin'],
+                'Donga': ['Bassila', 'Copargo', 'Djougou', 'Ouaké'],
+                'Littoral': ['Cotonou'],
+                'Mono': ['Athiémé', 'Bopa', 'Comè', 'Grand-Popo', 'Houéyogbé', 'Lokossa'],
+                'Ouémé': ['Adjarra', 'Adjohoun', 'Aguégués', 'Akpro-Missérété', 'Avrankou', 'Bonou',
+                          'Dangbo', 'Porto-Novo', 'Sèmè-Kpodji'],
+                'Plateau': ['Adja-Ouèrè', 'Ifangni', 'Kétou', 'Pobè', 'Sakété'],
+                'Zou': ['Abomey', 'Agbangnizoun', 'Bohicon', 'Covè', 'Djidja', 'Ouinhi', 'Za-Kpota',
+                        'Zagnanado', 'Zogbodomey'],
+            },
+            'arrondissements': 546},
+    'BFA': {'nom': 'Burkina Faso', 'de': 'du Burkina Faso', 'superficie': 274200,
+            'pop_1990': 8811000, 'pop_2024': 23548781,
+            'sociaux': ((36, 47), (22, 32), (77, 90), (22, 40), (60, 70), (13, 20), (35, 50))},
+    'CPV': {'nom': 'Cap-Vert', 'de': 'du Cap-Vert', 'superficie': 4033,
+            'pop_1990': 341000, 'pop_2024': 524877,
+            'sociaux': ((88, 93), (78, 87), (110, 100), (88, 92), (85, 92), (80, 96), (60, 75))},
+    'CIV': {'nom': "Côte d'Ivoire", 'de': "de la Côte d'Ivoire", 'superficie': 322463,
+            'pop_1990': 12166000, 'pop_2024': 31934230,
+            'sociaux': ((53, 60), (40, 49), (80, 100), (35, 60), (76, 80), (58, 72), (45, 60))},
+    'GMB': {'nom': 'Gambie', 'de': 'de la Gambie', 'superficie': 11295,
+            'pop_1990': 927000, 'pop_2024': 2759988,
+            'sociaux': ((55, 67), (39, 52), (85, 100), (55, 60), (84, 88), (47, 65), (50, 65))},
+    'GHA': {'nom': 'Ghana', 'de': 'du Ghana', 'superficie': 238533,
+            'pop_1990': 14773000, 'pop_2024': 34427414,
+            'sociaux': ((78, 84), (63, 75), (100, 100), (60, 80), (80, 88), (64, 86), (55, 70))},
+    'GIN': {'nom': 'Guinée', 'de': 'de la Guinée', 'superficie': 245857,
+            'pop_1990': 6034000, 'pop_2024': 14754785,
+            'sociaux': ((38, 50), (18, 30), (85, 100), (38, 45), (65, 70), (27, 47), (40, 55))},
+    'GNB': {'nom': 'Guinée-Bissau', 'de': 'de la Guinée-Bissau', 'superficie': 36125,
+            'pop_1990': 1000000, 'pop_2024': 2201352,
+            'sociaux': ((62, 65), (38, 40), (105, 115), (35, 40), (60, 68), (14, 37), (35, 50))},
+    'LBR': {'nom': 'Libéria', 'de': 'du Libéria', 'superficie': 111369,
+            'pop_1990': 2102000, 'pop_2024': 5612817,
+            'sociaux': ((60, 62), (35, 40), (96, 92), (40, 45), (65, 80), (4, 32), (40, 55))},
+    'MLI': {'nom': 'Mali', 'de': 'du Mali', 'superficie': 1240192,
+            'pop_1990': 8465000, 'pop_2024': 24478595,
+            'sociaux': ((40, 46), (24, 26), (80, 74), (38, 42), (65, 82), (25, 53), (35, 50))},
+    'NER': {'nom': 'Niger', 'de': 'du Niger', 'superficie': 1267000,
+            'pop_1990': 8026000, 'pop_2024': 27032412,
+            'sociaux': ((25, 38), (10, 27), (65, 70), (14, 22), (45, 50), (9, 19), (30, 45))},
+    'NGA': {'nom': 'Nigeria', 'de': 'du Nigeria', 'superficie': 923768,
+            'pop_1990': 95214000, 'pop_2024': 232679478,
+            'sociaux': ((70, 70), (50, 55), (85, 90), (45, 50), (60, 78), (48, 61), (40, 50))},
+    'SEN': {'nom': 'Sénégal', 'de': 'du Sénégal', 'superficie': 196722,
+            'pop_1990': 7514000, 'pop_2024': 18501984,
+            'sociaux': ((52, 65), (33, 45), (85, 82), (40, 50), (72, 85), (57, 70), (50, 65))},
+    'SLE': {'nom': 'Sierra Leone', 'de': 'de la Sierra Leone', 'superficie': 71740,
+            'pop_1990': 4325000, 'pop_2024': 8642022,
+            'sociaux': ((52, 53), (33, 40), (120, 130), (45, 60), (55, 65), (12, 29), (40, 55))},
+    'TGO': {'nom': 'Togo', 'de': 'du Togo', 'superficie': 56785,
+            'pop_1990': 3875000, 'pop_2024': 9515236,
+            'sociaux': ((74, 80), (49, 55), (120, 125), (55, 60), (55, 70), (31, 57), (45, 60))},
+}
+
+# Ordre de traitement de la région
+CEDEAO = list(PAYS)
+
+def codes_pays(codes=None):
+    """
+    Normalise une sélection de pays : None -> pays par défaut, 'CEDEAO' -> toute la région.
+    Lève ValueError pour un code inconnu.
+    """
+    if not codes:
+        return [PAYS_DEFAUT]
+    if isinstance(codes, str):
+        codes = [codes]
+    selection = []
+    for code in codes:
+        code = code.upper()
+        if code == 'CEDEAO':
+            selection.extend(c for c in CEDEAO if c not in selection)
+        elif code not in PAYS:
+            raise ValueError(f"Pays inconnu : {code} (disponibles: {', '.join(CEDEAO)}, CEDEAO)")
+        elif code not in selection:
+            selection.append(code)
+    return selection
+
+def a_subdivisions(code):
+    """
+    Vrai si le registre contient les subdivisions du pays
+    """
+    return bool(PAYS[code].get('subdivisions'))
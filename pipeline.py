@@ -0,0 +1,140 @@
+"""
+Pipeline complet - Dashboard Démographique Bénin
+Auteur: Freud GUEDOU
+
+Enchaîne génération des données et visualisations dans un seul processus :
+les DataFrames passent directement du générateur aux fonctions visualiser_*,
+sans écriture puis relecture des CSV. La persistance sur disque est optionnelle.
+Avec --pays, plusieurs pays de la CEDEAO sont générés en une passe puis rendus
+dans un pool de processus commun, un sous-répertoire par pays.
+"""
+
+import argparse
+import os
+import time
+
+import instrumentation
+from cube_kpi import avec_cube
+from generer_donnees_demographiques import (
+    GRAINE_DEFAUT, completer_annees_ingerees, generer_datasets, generer_datasets_pays, persister_datasets,
+    separer_pays
+)
+from pays import CEDEAO, codes_pays
+from stockage import FORMATS, REPERTOIRE_SORTIE
+from validation import controler
+
+def executer_pipeline(repertoire_sortie=None, graine=GRAINE_DEFAUT, persister=True,
+                      formats=('csv',), excel='standard', figures=True, jobs=1, forcer=False,
+                      valider=True):
+    """
+    Génère les jeux de données, les valide (une incohérence de niveau erreur
+    arrête le pipeline avant toute écriture), construit leur cube d'indicateurs
+    puis, en mémoire, les visualisations. Retourne le dictionnaire des DataFrames générés.
+    """
+    repertoire_sortie = repertoire_sortie or REPERTOIRE_SORTIE
+    datasets = generer_datasets(graine)
+    if persister:
+        # Les années ajoutées par ingestion.py sont conservées, figures comprises
+        datasets, _ = completer_annees_ingerees(datasets, repertoire_sortie)
+    if valider:
+        controler(datasets)
+    datasets = avec_cube(datasets)
+
+    if persister:
+        persister_datasets(datasets, repertoire_sortie, formats, excel, forcer)
+    if figures:
+        # Import tardif : matplotlib n'est chargé que si des figures sont demandées
+        from creer_visualisations import rendre_visualisations
+        rendre_visualisations(datasets, repertoire_sortie, jobs=jobs, forcer=forcer)
+    return datasets
+
+def executer_scenarios(graines, repertoire_racine=None, **options):
+    """
+    Exécute le pipeline pour plusieurs graines dans le même processus,
+    chaque scénario ayant son propre sous-répertoire (scenario_<graine>).
+    Retourne un dictionnaire graine -> DataFrames
+    """
+    repertoire_racine = repertoire_racine or REPERTOIRE_SORTIE
+    resultats = {}
+    for graine in graines:
+        print(f"\n🎲 Scénario graine={graine}")
+        repertoire = os.path.join(repertoire_racine, f'scenario_{graine}')
+        resultats[graine] = executer_pipeline(repertoire, graine=graine, **options)
+    return resultats
+
+def executer_pays(codes, repertoire_racine=None, graine=GRAINE_DEFAUT, persister=True,
+                  formats=('csv',), excel='standard', figures=True, jobs=1, forcer=False,
+                  valider=True):
+    """
+    Génère les jeux de données de plusieurs pays en une seule passe (format long),
+    les enregistre dans <racine>/<code>/ puis rend toutes les figures de tous
+    les pays dans un même pool de processus. Les données de tous les pays sont
+    validées en une passe avant d'être séparées. Retourne un dictionnaire code -> DataFrames
+    """
+    repertoire_racine = repertoire_racine or REPERTOIRE_SORTIE
+    datasets_long = generer_datasets_pays(codes, graine)
+    if valider:
+        controler(datasets_long)
+    par_pays = {code: avec_cube(datasets, code) for code, datasets in separer_pays(datasets_long).items()}
+
+    if persister:
+        for code, datasets in par_pays.items():
+            print(f"\n🌍 {code}")
+            persister_datasets(datasets, os.path.join(repertoire_racine, code), formats, excel, forcer, code)
+    if figures:
+        from creer_visualisations import afficher_rapport_temps, rendre_pays
+        debut = time.perf_counter()
+        temps = rendre_pays(par_pays, jobs=jobs, repertoire_racine=repertoire_racine, forcer=forcer)
+        if temps:
+            afficher_rapport_temps(temps, time.perf_counter() - debut, jobs)
+    return par_pays
+
+def main():
+    """
+    Point d'entrée en ligne de commande
+    """
+    parser = argparse.ArgumentParser(description="Pipeline génération + visualisations en mémoire")
+    parser.add_argument('--sortie', default=None,
+                        help=f"répertoire de sortie (défaut: {REPERTOIRE_SORTIE})")
+    parser.add_argument('--graine', type=int, action='append', dest='graines',
+                        help="graine aléatoire (répétable : un sous-répertoire par scénario)")
+    parser.add_argument('--sans-persistance', action='store_true',
+                        help="ne pas écrire les jeux de données sur disque")
+    parser.add_argument('--sans-figures', action='store_true', help="ne pas dessiner les figures")
+    parser.add_argument('--format', action='append', choices=list(FORMATS), dest='formats',
+                        help="format de stockage des jeux de données (répétable, défaut: csv)")
+    parser.add_argument('--excel', choices=['standard', 'flux'], default='standard')
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                        help="nombre de processus de rendu (0 = un par cœur)")
+    parser.add_argument('--forcer', action='store_true', help="tout régénérer, même inchangé")
+    parser.add_argument('--sans-validation', action='store_true',
+                        help="ne pas vérifier la cohérence des données générées")
+    parser.add_argument('--pays', action='append',
+                        help=f"code ISO3 d'un pays (répétable, ou CEDEAO : {', '.join(CEDEAO)})")
+    instrumentation.ajouter_options(parser)
+    args = parser.parse_args()
+
+    options = dict(persister=not args.sans_persistance, formats=args.formats or ('csv',),
+                   excel=args.excel, figures=not args.sans_figures,
+                   jobs=args.jobs if args.jobs > 0 else os.cpu_count(), forcer=args.forcer,
+                   valider=not args.sans_validation)
+    try:
+        pays = codes_pays(args.pays) if args.pays else None
+    except ValueError as erreur:
+        parser.error(str(erreur))
+    with instrumentation.session(args):
+        try:
+            if pays:
+                graine = args.graines[0] if args.graines else GRAINE_DEFAUT
+                executer_pays(pays, args.sortie, graine=graine, **options)
+            elif args.graines and len(args.graines) > 1:
+                executer_scenarios(args.graines, args.sortie, **options)
+            else:
+                graine = args.graines[0] if args.graines else GRAINE_DEFAUT
+                executer_pipeline(args.sortie, graine=graine, **options)
+        except ValueError as erreur:
+            parser.exit(1, f"❌ Pipeline arrêté : {erreur}\n")
+    print("\n✅ Pipeline terminé\n")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Projection par composantes (cohortes) - Dashboard Démographique Bénin
+Auteur: Freud GUEDOU
+
+Fait vieillir la pyramide des âges (17 groupes quinquennaux, Hommes/Femmes)
+année par année avec des hypothèses de fécondité, de mortalité et de
+migration. Chaque pas annuel est un produit matrice (de type Leslie) ×
+vecteur, calculé d'un bloc pour tout un lot de populations (départements,
+scénarios...) : seule la boucle sur les années reste en Python.
+"""
+
+import numpy as np
+import pandas as pd
+
+N_GROUPES = 17
+LARGEUR_GROUPE = 5  # années par groupe d'âge
+
+# Quotients annuels de mortalité par groupe d'âge (0-4 ans ... 80+ ans)
+MORTALITE_DEFAUT = np.array([
+    0.0250, 0.0040, 0.0020, 0.0025, 0.0035, 0.0040, 0.0045, 0.0055, 0.0065,
+    0.0080, 0.0110, 0.0150, 0.0210, 0.0310, 0.0470, 0.0720, 0.1400,
+])
+SURMORTALITE_MASCULINE = 1.10
+
+# Répartition de la fécondité entre les groupes 15-19 ... 45-49 ans (somme = 1)
+CALENDRIER_FECONDITE = np.zeros(N_GROUPES)
+CALENDRIER_FECONDITE[3:10] = [0.11, 0.22, 0.23, 0.19, 0.14, 0.08, 0.03]
+
+RAPPORT_MASCULINITE_NAISSANCE = 1.05
+
+def _matrices_leslie(q_hommes, q_femmes, fecondite, rapport_masculinite):
+    """
+    Construit les matrices de transition annuelles (..., 34, 34) d'un lot de populations.
+
+    Ordre du vecteur d'état : 17 groupes d'hommes puis 17 groupes de femmes.
+    Chaque année, les survivants d'un groupe y restent avec une probabilité 4/5
+    et passent au groupe suivant avec une probabilité 1/5 ; le dernier groupe
+    (80+) est ouvert. Les naissances, issues des femmes, alimentent les 0-4 ans.
+    """
+    forme = np.broadcast_shapes(q_hommes.shape[:-1], q_femmes.shape[:-1], fecondite.shape[:-1])
+    matrices = np.zeros(forme + (2 * N_GROUPES, 2 * N_GROUPES))
+    groupes = np.arange(N_GROUPES)
+
+    for decalage, q in ((0, q_hommes), (N_GROUPES, q_femmes)):
+        survie = 1.0 - q
+        maintien = survie * (1.0 - 1.0 / LARGEUR_GROUPE)
+        maintien[..., -1] = survie[..., -1]
+        matrices[..., decalage + groupes, decalage + groupes] = maintien
+        matrices[..., decalage + groupes[1:], decalage + groupes[:-1]] = survie[..., :-1] / LARGEUR_GROUPE
+
+    part_garcons = rapport_masculinite / (1.0 + rapport_masculinite)
+    femmes = slice(N_GROUPES, 2 * N_GROUPES)
+    matrices[..., 0, femmes] += fecondite * part_garcons * (1.0 - q_hommes[..., :1] / 2)
+    matrices[..., N_GROUPES, femmes] += fecondite * (1.0 - part_garcons) * (1.0 - q_femmes[..., :1] / 2)
+    return matrices
+
+def projeter_cohortes(population_initiale, n_annees=50, taux_fertilite=5.7, mortalite=None,
+                      facteur_mortalite=1.0, amelioration_mortalite=0.01, migration=0.0,
+                      rapport_masculinite=RAPPORT_MASCULINITE_NAISSANCE):
+    """
+    Projette un lot de pyramides sur n_annees.
+
+    population_initiale : tableau (..., 2, 17) [Hommes, Femmes] × groupes d'âge
+    taux_fertilite      : indice synthétique, diffusable vers (..., n_annees)
+    mortalite           : quotients annuels (17,) (MORTALITE_DEFAUT par défaut)
+    facteur_mortalite   : multiplicateur de la mortalité par population (...)
+    amelioration_mortalite : baisse relative annuelle de la mortalité
+    migration           : solde migratoire annuel en proportion, diffusable vers (..., 2, 17)
+
+    Retourne un tableau (..., n_annees + 1, 2, 17), l'indice 0 étant l'état initial.
+    """
+    population = np.asarray(population_initiale, dtype=np.float64)
+    mortalite = MORTALITE_DEFAUT if mortalite is None else np.asarray(mortalite, dtype=np.float64)
+    facteur = np.asarray(facteur_mortalite, dtype=np.float64)[..., None]
+    fertilite = np.asarray(taux_fertilite, dtype=np.float64)
+    fertilite = np.broadcast_to(fertilite, fertilite.shape[:-1] + (n_annees,)
+                                if fertilite.ndim else (n_annees,))
+    migration = np.asarray(migration, dtype=np.float64)
+    if migration.ndim < 2:
+        migration = np.broadcast_to(migration, (2, N_GROUPES))
+    solde_migratoire = 1.0 + migration.reshape(migration.shape[:-2] + (2 * N_GROUPES,))
+
+    forme_lot = np.broadcast_shapes(population.shape[:-2], facteur.shape[:-1], fertilite.shape[:-1],
+                                    solde_migratoire.shape[:-1])
+    etat = np.broadcast_to(population.reshape(population.shape[:-2] + (2 * N_GROUPES,)),
+                           forme_lot + (2 * N_GROUPES,)).copy()
+    resultat = np.empty(forme_lot + (n_annees + 1, 2 * N_GROUPES))
+    resultat[..., 0, :] = etat
+
+    for t in range(n_annees):
+        q_femmes = np.minimum(mortalite * facteur * (1.0 - amelioration_mortalite) ** t, 1.0)
+        q_hommes = np.minimum(q_femmes * SURMORTALITE_MASCULINE, 1.0)
+        fecondite = fertilite[..., t, None] * CALENDRIER_FECONDITE / LARGEUR_GROUPE
+        matrices = _matrices_leslie(q_hommes, q_femmes, fecondite, rapport_masculinite)
+        etat = np.matmul(matrices, etat[..., None])[..., 0] * solde_migratoire
+        resultat[..., t + 1, :] = etat
+
+    return resultat.reshape(resultat.shape[:-1] + (2, N_GROUPES))
+
+def population_depuis_pyramide(df_age):
+    """
+    Convertit une pyramide au format de generer_donnees_structure_age en tableau (2, 17)
+    """
+    return df_age[['Hommes', 'Femmes']].to_numpy(dtype=np.float64).T
+
+def pyramides_departements(df_age, df_dept):
+    """
+    Répartit la pyramide nationale entre les départements au prorata de leur population.
+    Retourne un tableau (n_departements, 2, 17)
+    """
+    parts = df_dept['Population'].to_numpy(dtype=np.float64)
+    parts = parts / parts.sum()
+    return parts[:, None, None] * population_depuis_pyramide(df_age)[None]
+
+def pyramides_par_annee(projection, groupes_age, annee_depart=2024):
+    """
+    Met en forme une projection (n_annees + 1, 2, 17) en DataFrame long, au format de
+    la pyramide (Groupe_Age, Hommes, Femmes, Total, Pct_Total) avec une colonne Annee
+    """
+    n_annees = projection.shape[0]
+    hommes = projection[:, 0, :].round().astype(np.int64)
+    femmes = projection[:, 1, :].round().astype(np.int64)
+    total = hommes + femmes
+    df = pd.DataFrame({
+        'Annee': np.repeat(np.arange(annee_depart, annee_depart + n_annees), N_GROUPES),
+        'Groupe_Age': np.tile(np.asarray(groupes_age), n_annees),
+        'Hommes': hommes.reshape(-1),
+        'Femmes': femmes.reshape(-1),
+        'Total': total.reshape(-1),
+    })
+    df['Pct_Total'] = (total / total.sum(axis=1, keepdims=True) * 100).round(2).reshape(-1)
+    return df
@@ -0,0 +1,85 @@
+"""
+Moteur de scénarios Monte-Carlo - Dashboard Démographique Bénin
+Auteur: Freud GUEDOU
+
+Génère N trajectoires démographiques d'un coup, sous la forme d'un tableau
+(scénario × année × indicateur), en tirant pour chaque scénario les
+populations de départ/d'arrivée et les pentes des tendances dans des plages
+configurables. Le calcul est vectorisé et découpé en blocs de scénarios
+pour borner la mémoire intermédiaire.
+"""
+
+import numpy as np
+import pandas as pd
+
+from generer_donnees_demographiques import (
+    GRAINE_DEFAUT, POP_1990, POP_2024, SUPERFICIE_BENIN, TENDANCES_DEFAUT,
+    calculer_series_population, creer_generateur
+)
+
+# Plages (min, max) des paramètres tirés pour chaque scénario
+PLAGES_DEFAUT = {
+    'pop_initiale': (0.97 * POP_1990, 1.03 * POP_1990),
+    'pop_finale': (0.95 * POP_2024, 1.05 * POP_2024),
+    'pente_croissance': (-0.8, -0.2),
+    'pente_urbain': (18.0, 28.0),
+    'pente_esperance_vie': (7.0, 11.0),
+    'pente_fertilite': (-1.5, -0.5),
+    'pente_mortalite_infantile': (-50.0, -30.0),
+}
+
+# Indicateurs produits, dans l'ordre du dernier axe du tableau
+INDICATEURS = [
+    'Population_Totale', 'Taux_Croissance_%', 'Population_Urbaine', 'Population_Rurale',
+    'Pct_Urbain', 'Esperance_Vie_Ans', 'Taux_Fertilite', 'Mortalite_Infantile_pour_1000',
+    'Densite_Pop_km2',
+]
+
+def _tirer_parametres(rng, n, plages):
+    """
+    Tire les paramètres de n scénarios, chacun sous forme de colonne (n, 1)
+    """
+    return {nom: rng.uniform(bas, haut, (n, 1)) for nom, (bas, haut) in plages.items()}
+
+def generer_trajectoires(n_scenarios, annees=range(1990, 2025), plages=None,
+                         graine=GRAINE_DEFAUT, taille_bloc=2000, dtype=np.float32):
+    """
+    Génère n_scenarios trajectoires en un tableau (scénario × année × indicateur).
+
+    Les plages par défaut (PLAGES_DEFAUT) peuvent être surchargées une à une.
+    Les scénarios sont calculés par blocs de `taille_bloc` : la mémoire
+    intermédiaire ne dépend que de la taille du bloc, pas de n_scenarios.
+    """
+    plages = {**PLAGES_DEFAUT, **(plages or {})}
+    annees = np.asarray(annees)
+    rng = creer_generateur(graine)
+    progression = np.linspace(0.0, 1.0, len(annees))[None, :]
+
+    resultat = np.empty((n_scenarios, len(annees), len(INDICATEURS)), dtype=dtype)
+    for debut in range(0, n_scenarios, taille_bloc):
+        n = min(taille_bloc, n_scenarios - debut)
+        p = _tirer_parametres(rng, n, plages)
+        tendances = {
+            nom: (TENDANCES_DEFAUT[nom][0], p[f'pente_{nom}'], TENDANCES_DEFAUT[nom][2])
+            for nom in TENDANCES_DEFAUT
+        }
+        series = calculer_series_population(progression, p['pop_initiale'], p['pop_finale'],
+                                            SUPERFICIE_BENIN, rng, tendances)
+        for k, indicateur in enumerate(INDICATEURS):
+            resultat[debut:debut + n, :, k] = series[indicateur]
+    return resultat
+
+def bandes_percentiles(trajectoires, annees=range(1990, 2025), percentiles=(5, 50, 95)):
+    """
+    Calcule les bandes de percentiles (par défaut P5/P50/P95) sur l'axe des scénarios.
+    Retourne un DataFrame long : Annee, Indicateur, P5, P50, P95
+    """
+    annees = np.asarray(annees)
+    valeurs = np.percentile(trajectoires, percentiles, axis=0)  # (p, année, indicateur)
+    df = pd.DataFrame({
+        'Annee': np.tile(annees, len(INDICATEURS)),
+        'Indicateur': np.repeat(INDICATEURS, len(annees)),
+    })
+    for p, bande in zip(percentiles, valeurs):
+        df[f'P{p}'] = bande.T.reshape(-1)
+    return df
@@ -0,0 +1,381 @@
+"""
+Serveur du dashboard - Dashboard Démographique Bénin
+Auteur: Freud GUEDOU
+
+Petit serveur HTTP local qui sert les KPIs et les figures du dashboard à la
+demande, au lieu des cinq PNG statiques. Les paramètres de requête filtrent
+la période (debut, fin), les départements et la résolution (preview, web,
+print). Les images et les agrégats sont gardés dans un cache LRU indexé par
+la version des données et les paramètres ; le rendu matplotlib tourne dans
+un pool borné de processus.
+
+Routes :
+    /                          page HTML du dashboard
+    /api/kpis                  indicateurs clés (JSON)
+    /api/figures               figures disponibles (JSON)
+    /figure/<nom>.png          figure rendue à la demande
+"""
+
+import argparse
+import html
+import io
+import json
+import threading
+import time
+import traceback
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+import creer_visualisations as viz
+from creer_visualisations import FIGURES, PROFILS_RENDU, construire_figure
+from cube_kpi import avec_cube, filtrer_cube, ligne_nationale, ordonner, tranche_annee
+from hierarchie import avec_hierarchie, filtrer_hierarchie
+from manifeste import empreinte_artefact, empreinte_dataframe
+from stockage import FORMATS, REPERTOIRE_SORTIE, lire_dataset
+
+HOTE_DEFAUT = '127.0.0.1'
+PORT_DEFAUT = 8050
+TAILLE_CACHE_DEFAUT = 256
+RESOLUTION_DEFAUT = 'web'
+
+# Jeux de données filtrés par la période (colonne Annee)
+DATASETS_ANNUELS = ('population', 'indicateurs_sociaux')
+
+# Figures tracées sur une période : au moins ANNEES_MIN_SERIE années sont requises
+FIGURES_SERIES = ('evolution_population', 'indicateurs_sociaux', 'dashboard_resume')
+ANNEES_MIN_SERIE = 2
+
+class CacheLRU:
+    """
+    Cache LRU thread-safe. Une clé absente n'est calculée qu'une fois, même si
+    plusieurs requêtes la demandent en même temps : les suivantes attendent le
+    résultat du premier calcul.
+    """
+
+    def __init__(self, capacite=TAILLE_CACHE_DEFAUT):
+        self.capacite = capacite
+        self._entrees = OrderedDict()
+        self._en_cours = {}
+        self._verrou = threading.Lock()
+        self.succes = self.echecs = 0
+
+    def obtenir(self, cle, calculer):
+        """
+        Retourne (valeur, trouvee_en_cache) ; calcule la valeur avec calculer() si besoin
+        """
+        with self._verrou:
+            if cle in self._entrees:
+                self._entrees.move_to_end(cle)
+                self.succes += 1
+                return self._entrees[cle], True
+            attente = self._en_cours.get(cle)
+            if attente is not None:
+                self.succes += 1
+            else:
+                self.echecs += 1
+                future = self._en_cours[cle] = Future()
+        if attente is not None:
+            return attente.result(), True
+
+        try:
+            valeur = calculer()
+        except BaseException as erreur:
+            with self._verrou:
+                del self._en_cours[cle]
+            future.set_exception(erreur)
+            raise
+        with self._verrou:
+            del self._en_cours[cle]
+            self._entrees[cle] = valeur
+            while len(self._entrees) > self.capacite:
+                self._entrees.popitem(last=False)
+        future.set_result(valeur)
+        return valeur, False
+
+    def statistiques(self):
+        """
+        Nombre d'entrées, de succès et d'échecs du cache
+        """
+        with self._verrou:
+            return {'entrees': len(self._entrees), 'capacite': self.capacite,
+                    'succes': self.succes, 'echecs': self.echecs}
+
+# État du serveur : données, version des données, cache et pool de rendu
+_ETAT = {'donnees': None, 'version': None, 'cache': None, 'pool': None}
+
+def version_donnees(donnees):
+    """
+    Version des données : empreinte combinée des jeux de données (16 caractères)
+    """
+    empreintes = {cle: empreinte_dataframe(df) for cle, df in donnees.items()}
+    return empreinte_artefact(empreintes, {})[:16]
+
+def lire_parametres(requete):
+    """
+    Normalise les paramètres de requête en un tuple hachable
+    (debut, fin, departements, resolution). Lève ValueError si un paramètre est invalide.
+    """
+    debut = int(requete['debut'][0]) if 'debut' in requete else None
+    fin = int(requete['fin'][0]) if 'fin' in requete else None
+    departements = tuple(sorted({d.strip() for valeur in requete.get('departements', [])
+                                 for d in valeur.split(',') if d.strip()}))
+    resolution = requete.get('resolution', [RESOLUTION_DEFAUT])[0]
+    if resolution not in PROFILS_RENDU:
+        raise ValueError(f"résolution inconnue : {resolution} ({', '.join(PROFILS_RENDU)})")
+    if debut is not None and fin is not None and debut > fin:
+        raise ValueError("debut doit être inférieur ou égal à fin")
+    return debut, fin, departements, resolution
+
+def filtrer_donnees(donnees, debut=None, fin=None, departements=(), requis=('population',)):
+    """
+    Restreint les jeux de données à la période [debut, fin] et aux départements demandés.
+    Lève ValueError si le filtre ne laisse aucune ligne dans un des jeux `requis`.
+    """
+    filtrees = dict(donnees)
+    for cle in DATASETS_ANNUELS:
+        df = donnees[cle]
+        masque = df['Annee'].between(debut if debut is not None else df['Annee'].min(),
+                                     fin if fin is not None else df['Annee'].max())
+        filtrees[cle] = df[masque].reset_index(drop=True)
+        if cle in requis and filtrees[cle].empty:
+            raise ValueError(f"aucune donnée entre {debut} et {fin}")
+    if departements:
+        df = donnees['departements']
+        inconnus = set(departements) - set(df['Departement'])
+        if inconnus:
+            raise ValueError(f"départements inconnus : {', '.join(sorted(inconnus))}")
+        filtrees['departements'] = df[df['Departement'].isin(departements)].reset_index(drop=True)
+    if 'cube' in donnees:
+        filtrees['cube'] = filtrer_cube(donnees['cube'], debut, fin, departements)
+    if 'hierarchie' in donnees:
+        filtrees['hierarchie'] = filtrer_hierarchie(donnees['hierarchie'], departements)
+    return filtrees
+
+def calculer_kpis(donnees):
+    """
+    Indicateurs clés du dashboard sur des données (éventuellement filtrées),
+    lus dans le cube d'indicateurs
+    """
+    df_pop, cube = donnees['population'], donnees['cube']
+    annee = int(df_pop['Annee'].iloc[-1])
+    nationale = ligne_nationale(cube, annee)
+    df_dept = tranche_annee(cube, annee)
+    return {
+        'annee_debut': int(df_pop['Annee'].iloc[0]),
+        'annee_fin': annee,
+        'population_totale': int(nationale['Population']),
+        'taux_croissance_pct': round(float(nationale['Taux_Croissance_%']), 2),
+        'pct_urbain': round(float(nationale['Taux_Urbanisation_%']), 1),
+        'age_median_ans': round(float(nationale['Age_Median_Ans']), 1),
+        'esperance_vie_ans': round(float(df_pop['Esperance_Vie_Ans'].iloc[-1]), 1),
+        'pct_hommes': round(float(nationale['Pct_Hommes']), 2),
+        'departements': {
+            'nombre': len(df_dept),
+            'population': int(df_dept['Population'].sum()),
+            'densite_km2': round(float(df_dept['Population'].sum() / df_dept['Superficie_km2'].sum()), 1),
+            'plus_peuple': ordonner(df_dept, 'Rang_Population', n=1).index[0],
+        },
+    }
+
+def _rendre_png(nom, debut, fin, departements, resolution):
+    """
+    Rend une figure filtrée en PNG (exécuté dans un processus du pool).
+    Retourne les octets de l'image
+    """
+    donnees = filtrer_donnees(viz._DONNEES_WORKER, debut, fin, departements, FIGURES[nom][1])
+    _, dpi, serre = next(sortie for sortie in PROFILS_RENDU[resolution] if sortie[0] == 'png')
+    figure = construire_figure(nom, donnees)
+    tampon = io.BytesIO()
+    try:
+        figure.savefig(tampon, format='png', dpi=dpi, bbox_inches='tight' if serre else None)
+    finally:
+        viz.plt.close(figure)
+    return tampon.getvalue()
+
+def demarrer(donnees, jobs=2, taille_cache=TAILLE_CACHE_DEFAUT):
+    """
+    Prépare l'état du serveur : données, version, cache LRU et pool de rendu borné
+    """
+    donnees = avec_hierarchie(avec_cube(donnees))
+    _ETAT.update(donnees=donnees, version=version_donnees(donnees),
+                 cache=CacheLRU(taille_cache),
+                 pool=ProcessPoolExecutor(max_workers=jobs, initializer=viz._initialiser_worker,
+                                          initargs=(donnees,)))
+
+def arreter():
+    """
+    Arrête le pool de rendu
+    """
+    if _ETAT['pool'] is not None:
+        _ETAT['pool'].shutdown(cancel_futures=True)
+        _ETAT['pool'] = None
+
+def obtenir_kpis(parametres):
+    """
+    KPIs en JSON (octets) pour des paramètres normalisés, via le cache
+    """
+    debut, fin, departements, _ = parametres
+    cle = (_ETAT['version'], 'kpis', debut, fin, departements)
+
+    def calculer():
+        kpis = calculer_kpis(filtrer_donnees(_ETAT['donnees'], debut, fin, departements))
+        return json.dumps(kpis, ensure_ascii=False).encode('utf-8')
+    return _ETAT['cache'].obtenir(cle, calculer)
+
+def verifier_periode(donnees, cles):
+    """
+    Lève ValueError si un des jeux `cles` filtrés couvre moins de ANNEES_MIN_SERIE années
+    """
+    for cle in cles:
+        df = donnees[cle]
+        annees = df.index.get_level_values('Annee') if cle == 'cube' else df['Annee']
+        if annees.nunique() < ANNEES_MIN_SERIE:
+            raise ValueError(f"la période demandée doit couvrir au moins {ANNEES_MIN_SERIE} années")
+
+def obtenir_figure(nom, parametres):
+    """
+    PNG d'une figure pour des paramètres normalisés, via le cache et le pool de rendu
+    """
+    # Valide les filtres dans le processus du serveur avant d'occuper un worker
+    donnees = filtrer_donnees(_ETAT['donnees'], *parametres[:3], requis=FIGURES[nom][1])
+    if nom in FIGURES_SERIES:
+        verifier_periode(donnees, FIGURES[nom][1])
+    cle = (_ETAT['version'], 'figure', nom) + parametres
+    return _ETAT['cache'].obtenir(cle, lambda: _ETAT['pool'].submit(_rendre_png, nom, *parametres).result())
+
+def page_dashboard(parametres):
+    """
+    Page HTML du dashboard : KPIs et figures, avec un formulaire de filtres
+    """
+    debut, fin, departements, resolution = parametres
+    kpis = json.loads(obtenir_kpis(parametres)[0])
+    requete = urlencode({k: v for k, v in (('debut', debut), ('fin', fin),
+                                            ('departements', ','.join(departements)),
+                                            ('resolution', resolution)) if v})
+    cartes = ''.join(
+        f'<div class="kpi"><b>{html.escape(valeur)}</b><span>{html.escape(libelle)}</span></div>'
+        for libelle, valeur in (
+            (f"Population ({kpis['annee_fin']})", f"{kpis['population_totale'] / 1e6:.2f}M"),
+            ('Croissance annuelle', f"{kpis['taux_croissance_pct']:+.1f}%"),
+            ('Population urbaine', f"{kpis['pct_urbain']:.0f}%"),
+            ('Âge médian', f"{kpis['age_median_ans']:.0f} ans"),
+            ('Espérance de vie', f"{kpis['esperance_vie_ans']:.1f} ans"),
+        ))
+    images = ''.join(f'<img src="/figure/{nom}.png?{requete}" alt="{nom}" loading="lazy">'
+                     for nom in FIGURES)
+    options = ''.join(f'<option{" selected" if r == resolution else ""}>{r}</option>'
+                      for r in PROFILS_RENDU)
+    return f"""<!DOCTYPE html>
+<html lang="fr"><head><meta charset="utf-8"><title>Dashboard Démographique Bénin</title>
+<style>
+body {{ font-family: sans-serif; margin: 2em; color: #2c3e50; }}
+.kpis {{ display: flex; gap: 1em; margin: 1em 0; }}
+.kpi {{ flex: 1; padding: 1em; background: #ecf0f1; text-align: center; }}
+.kpi b {{ display: block; font-size: 2em; }}
+img {{ max-width: 100%; margin: 1em 0; display: block; }}
+</style></head><body>
+<h1>Dashboard Démographique - Bénin</h1>
+<form>
+  Années <input name="debut" size="4" value="{debut or ''}"> à <input name="fin" size="4" value="{fin or ''}">
+  Départements <input name="departements" value="{html.escape(','.join(departements))}" placeholder="Littoral,Atlantique">
+  Résolution <select name="resolution">{options}</select>
+  <button>Filtrer</button>
+</form>
+<div class="kpis">{cartes}</div>
+{images}
+</body></html>""".encode('utf-8')
+
+class GestionnaireDashboard(BaseHTTPRequestHandler):
+    """
+    Gestionnaire HTTP des routes du dashboard
+    """
+    server_version = 'DashboardBenin/1.0'
+
+    def do_GET(self):
+        debut = time.perf_counter()
+        url = urlsplit(self.path)
+        try:
+            parametres = lire_parametres(parse_qs(url.query))
+            if url.path == '/':
+                contenu, en_cache, type_mime = page_dashboard(parametres), False, 'text/html; charset=utf-8'
+            elif url.path == '/api/kpis':
+                (contenu, en_cache), type_mime = obtenir_kpis(parametres), 'application/json'
+            elif url.path == '/api/figures':
+                contenu = json.dumps({'figures': list(FIGURES), 'resolutions': list(PROFILS_RENDU),
+                                      'version': _ETAT['version'],
+                                      'cache': _ETAT['cache'].statistiques()}).encode('utf-8')
+                en_cache, type_mime = False, 'application/json'
+            elif url.path.startswith('/figure/') and url.path.endswith('.png'):
+                nom = url.path[len('/figure/'):-len('.png')]
+                if nom not in FIGURES:
+                    return self._erreur(404, f"figure inconnue : {nom}")
+                (contenu, en_cache), type_mime = obtenir_figure(nom, parametres), 'image/png'
+            else:
+                return self._erreur(404, "route inconnue")
+        except ValueError as erreur:
+            return self._erreur(400, str(erreur))
+        except Exception as erreur:
+            self.log_error("erreur sur %s : %r", self.path, erreur)
+            traceback.print_exc()
+            return self._erreur(500, f"erreur interne : {type(erreur).__name__}")
+
+        self.send_response(200)
+        self.send_header('Content-Type', type_mime)
+        self.send_header('Content-Length', str(len(contenu)))
+        self.send_header('Cache-Control', 'max-age=300')
+        self.send_header('ETag', f'"{_ETAT["version"]}"')
+        self.send_header('X-Cache', 'HIT' if en_cache else 'MISS')
+        self.send_header('X-Duree-ms', f'{(time.perf_counter() - debut) * 1000:.1f}')
+        self.end_headers()
+        self.wfile.write(contenu)
+
+    def _erreur(self, code, message):
+        contenu = json.dumps({'erreur': message}, ensure_ascii=False).encode('utf-8')
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(contenu)))
+        self.end_headers()
+        self.wfile.write(contenu)
+
+def servir(donnees, hote=HOTE_DEFAUT, port=PORT_DEFAUT, jobs=2, taille_cache=TAILLE_CACHE_DEFAUT):
+    """
+    Démarre le serveur (bloquant jusqu'à Ctrl+C)
+    """
+    demarrer(donnees, jobs, taille_cache)
+    serveur = ThreadingHTTPServer((hote, port), GestionnaireDashboard)
+    print(f"🌐 Dashboard disponible sur http://{hote}:{port}/ "
+          f"(données {_ETAT['version']}, {jobs} worker(s) de rendu)")
+    try:
+        serveur.serve_forever()
+    except KeyboardInterrupt:
+        print("\n🛑 Arrêt du serveur")
+    finally:
+        serveur.server_close()
+        arreter()
+
+def main():
+    """
+    Point d'entrée en ligne de commande
+    """
+    parser = argparse.ArgumentParser(description="Serveur HTTP local du dashboard démographique")
+    parser.add_argument('--hote', default=HOTE_DEFAUT)
+    parser.add_argument('--port', type=int, default=PORT_DEFAUT)
+    parser.add_argument('--jobs', '-j', type=int, default=2,
+                        help="nombre de processus de rendu (borne le travail matplotlib simultané)")
+    parser.add_argument('--taille-cache', type=int, default=TAILLE_CACHE_DEFAUT,
+                        help="nombre maximal d'images et d'agrégats gardés en cache")
+    parser.add_argument('--format', choices=list(FORMATS), default='csv',
+                        help="format des jeux de données à charger (défaut: csv)")
+    parser.add_argument('--sortie', default=None,
+                        help=f"répertoire des données (défaut: {REPERTOIRE_SORTIE})")
+    args = parser.parse_args()
+
+    repertoire = args.sortie or REPERTOIRE_SORTIE
+    donnees = {nom: lire_dataset(nom, repertoire, args.format)
+               for nom in ('population', 'structure_age', 'departements', 'indicateurs_sociaux')}
+    servir(donnees, args.hote, args.port, max(args.jobs, 1), args.taille_cache)
+
+if __name__ == "__main__":
+    main()
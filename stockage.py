@@ -0,0 +1,243 @@
+"""
+Stockage des données - Dashboard Démographique Bénin
+Auteur: Freud GUEDOU
+
+Lecture et écriture typées des quatre jeux de données en CSV, Parquet ou
+Feather. Chaque jeu de données a un schéma explicite : les types ne sont
+plus devinés au chargement. Les types sont compacts (catégories pour les
+noms et groupes d'âge, int16 pour les années, int32 pour les effectifs,
+float32 pour les taux) ; un entier devient nullable (Int32) s'il a des trous.
+Parquet et Feather nécessitent le paquet optionnel `pyarrow`.
+Le classeur Excel peut aussi être exporté en flux, à mémoire bornée.
+"""
+
+import os
+
+import pandas as pd
+
+from emplacements import FICHIERS, FORMATS, REPERTOIRE_SORTIE, nom_fichier, nom_pays  # noqa: F401
+from pays import PAYS_DEFAUT
+
+# Schéma explicite de chaque jeu de données : colonne -> type pandas compact
+SCHEMAS = {
+    'population': {
+        'Annee': 'int16',
+        'Population_Totale': 'int32',
+        'Taux_Croissance_%': 'float32',
+        'Population_Urbaine': 'int32',
+        'Population_Rurale': 'int32',
+        'Pct_Urbain': 'float32',
+        'Esperance_Vie_Ans': 'float32',
+        'Taux_Fertilite': 'float32',
+        'Mortalite_Infantile_pour_1000': 'float32',
+        'Densite_Pop_km2': 'float32',
+    },
+    'structure_age': {
+        'Groupe_Age': 'category',
+        'Hommes': 'int32',
+        'Femmes': 'int32',
+        'Total': 'int32',
+        'Pct_Total': 'float32',
+    },
+    'departements': {
+        'Departement': 'category',
+        'Population': 'int32',
+        'Superficie_km2': 'int32',
+        'Chef_lieu': 'category',
+        'Densite_km2': 'float32',
+        'Pct_Population_Nationale': 'float32',
+        'Taux_Urbanisation_%': 'float32',
+        'Age_Median_Ans': 'float32',
+    },
+    'indicateurs_sociaux': {
+        'Annee': 'int16',
+        'Taux_Alphabetisation_Hommes_%': 'float32',
+        'Taux_Alphabetisation_Femmes_%': 'float32',
+        'Taux_Scolarisation_Primaire_%': 'float32',
+        'Taux_Scolarisation_Secondaire_%': 'float32',
+        'Acces_Eau_Potable_%': 'float32',
+        'Acces_Electricite_%': 'float32',
+        'Acces_Soins_Sante_%': 'float32',
+    },
+    # Cube d'indicateurs pré-agrégés (cube_kpi), stocké à plat avec des types compacts
+    'cube': {
+        'Departement': 'category',
+        'Annee': 'int16',
+        'Population': 'int32',
+        'Superficie_km2': 'int32',
+        'Densite_km2': 'float32',
+        'Pct_Population_Nationale': 'float32',
+        'Taux_Croissance_%': 'float32',
+        'Taux_Urbanisation_%': 'float32',
+        'Age_Median_Ans': 'float32',
+        'Pct_Hommes': 'float32',
+        'Rang_Population': 'int8',
+        'Rang_Densite': 'int8',
+        'Rang_Urbanisation': 'int8',
+    },
+}
+
+def _verifier_format(format):
+    """
+    Vérifie que le format est connu et que ses dépendances sont installées
+    """
+    if format not in FORMATS:
+        raise ValueError(f"Format inconnu: {format!r} (disponibles: {', '.join(FORMATS)})")
+    if format in ('parquet', 'feather'):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise ImportError(
+                f"Le format {format} nécessite pyarrow : pip install pyarrow"
+            ) from None
+
+def _type_colonne(serie, type_):
+    """
+    Type effectif d'une colonne : un entier avec des valeurs manquantes devient
+    nullable (int32 -> Int32) ; une catégorie garde l'ordre d'apparition des
+    valeurs (groupes d'âge du plus jeune au plus âgé, départements du fichier)
+    """
+    if type_ == 'category':
+        if isinstance(serie.dtype, pd.CategoricalDtype):
+            return serie.dtype
+        return pd.CategoricalDtype(pd.unique(serie.dropna()))
+    if pd.api.types.is_integer_dtype(type_) and serie.hasnans:
+        return type_.capitalize()
+    return type_
+
+def appliquer_schema(df, nom):
+    """
+    Convertit les colonnes connues du jeu de données vers les types de son schéma
+    (les colonnes supplémentaires, comme Region, sont conservées telles quelles)
+    """
+    manquantes = [col for col in SCHEMAS[nom] if col not in df.columns]
+    if manquantes:
+        raise ValueError(f"Colonnes manquantes dans {nom}: {', '.join(manquantes)}")
+    return df.astype({col: _type_colonne(df[col], type_) for col, type_ in SCHEMAS[nom].items()})
+
+def compacter(datasets):
+    """
+    Applique leur schéma compact à plusieurs jeux de données (nom -> DataFrame)
+    """
+    return {nom: appliquer_schema(df, nom) if nom in SCHEMAS else df for nom, df in datasets.items()}
+
+def memoire_octets(df):
+    """
+    Mémoire occupée par un DataFrame, chaînes comprises (octets)
+    """
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+def memoire_types_larges(df):
+    """
+    Mémoire qu'occuperait le DataFrame avec les types par défaut d'un chargement
+    sans schéma : int64/float64 pour les nombres, chaînes objet pour le texte
+    """
+    total = int(df.index.memory_usage(deep=True))
+    for _, serie in df.items():
+        if pd.api.types.is_numeric_dtype(serie.dtype):
+            total += 8 * len(serie)
+        else:
+            total += int(serie.astype(object).memory_usage(index=False, deep=True))
+    return total
+
+def rapport_memoire(datasets):
+    """
+    Affiche, pour chaque jeu de données, la mémoire occupée avec les types compacts
+    et le gain par rapport aux types par défaut. Retourne {nom: (larges, compacts)} en octets
+    """
+    rapport = {nom: (memoire_types_larges(df), memoire_octets(df)) for nom, df in datasets.items()}
+    print("🧮 Mémoire des jeux de données (types par défaut → compacts):")
+    for nom, (larges, compacts) in rapport.items():
+        print(f"   • {nom:<20} {larges / 1024:8.1f} Ko → {compacts / 1024:7.1f} Ko "
+              f"(-{(1 - compacts / larges) * 100:.0f}%)")
+    total_larges = sum(larges for larges, _ in rapport.values())
+    total_compacts = sum(compacts for _, compacts in rapport.values())
+    print(f"   Total {total_larges / 1024:.1f} Ko → {total_compacts / 1024:.1f} Ko "
+          f"(-{(1 - total_compacts / total_larges) * 100:.0f}%)\n")
+    return rapport
+
+def ecrire_dataset(df, nom, repertoire, format='csv', pays=PAYS_DEFAUT):
+    """
+    Écrit un jeu de données typé et retourne le chemin du fichier
+    """
+    _verifier_format(format)
+    chemin = os.path.join(repertoire, nom_fichier(nom, format, pays))
+    df = appliquer_schema(df, nom)
+    if format == 'csv':
+        df.to_csv(chemin, index=False, encoding='utf-8-sig')
+    elif format == 'parquet':
+        df.to_parquet(chemin, index=False, engine='pyarrow', compression='zstd')
+    else:
+        df.reset_index(drop=True).to_feather(chemin, compression='zstd')
+    return chemin
+
+def lire_dataset(nom, repertoire, format='csv', colonnes=None, pays=PAYS_DEFAUT):
+    """
+    Lit un jeu de données en appliquant son schéma (pas d'inférence de types).
+    `colonnes` permet de ne lire qu'une partie des colonnes (Parquet/Feather).
+    """
+    _verifier_format(format)
+    chemin = os.path.join(repertoire, nom_fichier(nom, format, pays))
+    if format == 'csv':
+        # Entiers lus en nullable (trous éventuels) et catégories en texte : le schéma
+        # rétablit ensuite les types compacts et l'ordre d'apparition des catégories
+        schema = {col: type_.capitalize() if pd.api.types.is_integer_dtype(type_) else type_
+                  for col, type_ in SCHEMAS[nom].items() if colonnes is None or col in colonnes}
+        df = pd.read_csv(chemin, encoding='utf-8-sig', usecols=colonnes,
+                         dtype={col: 'str' if type_ == 'category' else type_
+                                for col, type_ in schema.items()})
+    elif format == 'parquet':
+        df = pd.read_parquet(chemin, columns=colonnes, engine='pyarrow')
+    else:
+        df = pd.read_feather(chemin, columns=colonnes)
+    if colonnes is None:
+        df = appliquer_schema(df, nom)
+    else:
+        df = df.astype({col: _type_colonne(df[col], SCHEMAS[nom][col])
+                        for col in df.columns if col in SCHEMAS[nom]})
+    return df
+
+def _lignes_par_blocs(df, taille_bloc):
+    """
+    Parcourt un DataFrame par blocs et produit ses lignes en types Python natifs
+    (valeurs manquantes converties en None, comme le fait pandas pour Excel)
+    """
+    for debut in range(0, len(df), taille_bloc):
+        bloc = df.iloc[debut:debut + taille_bloc]
+        colonnes = []
+        for _, serie in bloc.items():
+            valeurs = serie.tolist()
+            if serie.hasnans:
+                valeurs = [None if manquante else v for v, manquante in zip(valeurs, serie.isna())]
+            colonnes.append(valeurs)
+        yield from zip(*colonnes)
+
+def exporter_excel_flux(datasets, chemin, feuilles, taille_bloc=10000):
+    """
+    Exporte plusieurs DataFrames dans un classeur Excel en mode flux.
+
+    Les feuilles sont ouvertes en écriture seule (openpyxl write_only) et
+    alimentées bloc par bloc : la mémoire utilisée ne dépend pas du nombre
+    de lignes. `feuilles` associe chaque clé de `datasets` à un nom de feuille.
+    """
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Alignment, Border, Font, Side
+
+    classeur = Workbook(write_only=True)
+    bordure = Border(*(Side(style='thin'),) * 4)
+    for nom, feuille in feuilles.items():
+        df = datasets[nom]
+        ws = classeur.create_sheet(feuille)
+        entetes = []
+        for colonne in df.columns:
+            cellule = WriteOnlyCell(ws, value=str(colonne))
+            cellule.font = Font(bold=True)
+            cellule.border = bordure
+            cellule.alignment = Alignment(horizontal='center', vertical='top')
+            entetes.append(cellule)
+        ws.append(entetes)
+        for ligne in _lignes_par_blocs(df, taille_bloc):
+            ws.append(ligne)
+    classeur.save(chemin)
+    return chemin
@@ -0,0 +1,339 @@
+"""
+Validation des données - Dashboard Démographique Bénin
+Auteur: Freud GUEDOU
+
+Moteur de règles déclaratives vérifiant la cohérence des jeux de données :
+identités (urbaine + rurale = totale), plages de valeurs, tendances
+monotones, taux de croissance cohérents avec leur série, sommes de parts
+(100 %) et rapprochements entre jeux de données (départements et pyramide
+des âges face à la population nationale).
+
+Chaque règle est évaluée d'un bloc sur toutes les lignes (NumPy, groupby) ;
+les extraits au format long (colonnes Pays, Region) sont vérifiés série par
+série. Les violations sont rapportées avec leurs numéros de lignes. Seules
+les règles de niveau « erreur » bloquent le pipeline.
+"""
+
+import numpy as np
+import pandas as pd
+
+from cube_kpi import ANNEE_REFERENCE_DEPARTEMENTS
+from instrumentation import instrumenter
+from pays import DENSITE_URBAINE_KM2, URBANISATION_DENSE
+
+ERREUR = 'erreur'
+AVERTISSEMENT = 'avertissement'
+
+# Colonnes qui séparent les séries d'un extrait au format long
+COLONNES_GROUPE = ('Pays', 'Region')
+
+# Nombre de lignes en violation citées par règle dans le rapport
+LIGNES_RAPPORTEES = 10
+
+# Règles : nom -> paramètres (type de vérification, jeu de données, colonnes, niveau)
+REGLES = {
+    # Identités
+    'urbaine_plus_rurale': {'type': 'identite', 'dataset': 'population',
+                            'termes': ['Population_Urbaine', 'Population_Rurale'],
+                            'total': 'Population_Totale', 'niveau': ERREUR},
+    'hommes_plus_femmes': {'type': 'identite', 'dataset': 'structure_age',
+                           'termes': ['Hommes', 'Femmes'], 'total': 'Total', 'niveau': ERREUR},
+    'pct_urbain_coherent': {'type': 'proportion', 'dataset': 'population',
+                            'partie': 'Population_Urbaine', 'total': 'Population_Totale',
+                            'pourcentage': 'Pct_Urbain', 'precision': 0.1, 'niveau': ERREUR},
+    # Plages
+    'effectifs_positifs': {'type': 'plage', 'dataset': 'population', 'min': 0,
+                           'colonnes': ['Population_Totale', 'Population_Urbaine', 'Population_Rurale']},
+    'pourcentages_population': {'type': 'plage', 'dataset': 'population', 'min': 0, 'max': 100,
+                                'colonnes': ['Pct_Urbain']},
+    'taux_croissance': {'type': 'plage', 'dataset': 'population', 'min': -5, 'max': 10,
+                        'colonnes': ['Taux_Croissance_%']},
+    'esperance_vie': {'type': 'plage', 'dataset': 'population', 'min': 30, 'max': 90,
+                      'colonnes': ['Esperance_Vie_Ans']},
+    'fertilite': {'type': 'plage', 'dataset': 'population', 'min': 0.5, 'max': 10,
+                  'colonnes': ['Taux_Fertilite']},
+    'mortalite_infantile': {'type': 'plage', 'dataset': 'population', 'min': 0, 'max': 300,
+                            'colonnes': ['Mortalite_Infantile_pour_1000']},
+    'effectifs_par_age': {'type': 'plage', 'dataset': 'structure_age', 'min': 0,
+                          'colonnes': ['Hommes', 'Femmes', 'Total']},
+    'pourcentages_departements': {'type': 'plage', 'dataset': 'departements', 'min': 0, 'max': 100,
+                                  'colonnes': ['Pct_Population_Nationale', 'Taux_Urbanisation_%']},
+    'age_median_departements': {'type': 'plage', 'dataset': 'departements', 'min': 14, 'max': 30,
+                                'colonnes': ['Age_Median_Ans'], 'niveau': AVERTISSEMENT},
+    'pourcentages_sociaux': {'type': 'plage', 'dataset': 'indicateurs_sociaux', 'min': 0, 'max': 100,
+                             'colonnes': ['Taux_Alphabetisation_Hommes_%', 'Taux_Alphabetisation_Femmes_%',
+                                          'Acces_Eau_Potable_%', 'Acces_Electricite_%',
+                                          'Acces_Soins_Sante_%']},
+    # Les taux bruts de scolarisation peuvent dépasser 100 %
+    'scolarisation': {'type': 'plage', 'dataset': 'indicateurs_sociaux', 'min': 0, 'max': 150,
+                      'colonnes': ['Taux_Scolarisation_Primaire_%', 'Taux_Scolarisation_Secondaire_%']},
+    # Tendances et unicité des années
+    'annees_uniques': {'type': 'unique', 'dataset': 'population'},
+    'annees_sociales_uniques': {'type': 'unique', 'dataset': 'indicateurs_sociaux'},
+    'population_croissante': {'type': 'monotone', 'dataset': 'population',
+                              'colonne': 'Population_Totale', 'niveau': AVERTISSEMENT},
+    # Taux publié face à la variation effective (taux simple ou logarithmique, selon la source)
+    'croissance_coherente': {'type': 'croissance', 'dataset': 'population', 'serie': 'Population_Totale',
+                             'taux': 'Taux_Croissance_%', 'tolerance': 0.2, 'niveau': AVERTISSEMENT},
+    # Sommes de parts
+    'pct_total_age_100': {'type': 'somme', 'dataset': 'structure_age', 'colonne': 'Pct_Total',
+                          'attendu': 100, 'tolerance': 0.1},
+    'pct_departements_100': {'type': 'somme', 'dataset': 'departements',
+                             'colonne': 'Pct_Population_Nationale', 'attendu': 100, 'tolerance': 0.1},
+    # Rapprochements entre jeux de données
+    'departements_population_nationale': {
+        'type': 'rapprochement', 'dataset': 'departements', 'colonne': 'Population',
+        'reference': ('population', 'Population_Totale'), 'annee': ANNEE_REFERENCE_DEPARTEMENTS,
+        'tolerance': 0.02, 'niveau': AVERTISSEMENT},
+    'pyramide_population_nationale': {
+        'type': 'rapprochement', 'dataset': 'structure_age', 'colonne': 'Total',
+        'reference': ('population', 'Population_Totale'), 'annee': ANNEE_REFERENCE_DEPARTEMENTS,
+        'tolerance': 0.02, 'niveau': AVERTISSEMENT},
+    # Plausibilité : un département très dense est majoritairement urbain
+    'urbanisation_densite': {'type': 'expression', 'dataset': 'departements',
+                             'condition': f'Densite_km2 < {DENSITE_URBAINE_KM2} '
+                                          f'or `Taux_Urbanisation_%` >= {URBANISATION_DENSE[0]}',
+                             'niveau': AVERTISSEMENT},
+}
+
+def _valeurs(df, colonne):
+    """
+    Colonne en float64 (valeurs manquantes en NaN, y compris pour les entiers nullables)
+    """
+    return df[colonne].to_numpy(dtype=np.float64, na_value=np.nan)
+
+def _codes_groupes(df):
+    """
+    Numéro de série de chaque ligne (0 partout pour un jeu de données d'une seule série).
+    Les codes des colonnes de groupe (factorisées, immédiat pour une catégorie)
+    sont combinés arithmétiquement, sans groupby
+    """
+    groupes = [col for col in COLONNES_GROUPE if col in df.columns]
+    codes = np.zeros(len(df), dtype=np.int64)
+    for colonne in groupes:
+        codes_colonne, modalites = pd.factorize(df[colonne])
+        codes = codes * (len(modalites) + 1) + (codes_colonne + 1)
+    return codes, groupes
+
+def _ordre_series(df, codes):
+    """
+    Ordre des lignes par série puis par année, et clés (série, année) dans cet ordre.
+    Les extraits sont en général déjà triés : le tri n'est fait qu'à défaut
+    """
+    annees = df['Annee'].to_numpy(dtype=np.int64)
+    cles = codes * (annees.max() - annees.min() + 1) + (annees - annees.min())
+    if len(cles) < 2 or (np.diff(cles) >= 0).all():
+        return np.arange(len(cles)), cles
+    ordre = np.argsort(cles, kind='stable')
+    return ordre, cles[ordre]
+
+def _libelles_groupes(df, masque):
+    """
+    Séries (ex. Pays=BEN) concernées par les lignes en violation
+    """
+    groupes = [col for col in COLONNES_GROUPE if col in df.columns]
+    if not groupes or not masque.any():
+        return ''
+    lignes = df.loc[masque, groupes].drop_duplicates().head(LIGNES_RAPPORTEES)
+    return ', '.join('/'.join(f'{col}={ligne[col]}' for col in groupes)
+                     for _, ligne in lignes.iterrows())
+
+def verifier_identite(regle, df, datasets):
+    """
+    Somme des termes égale au total, à la tolérance près
+    """
+    somme = sum(_valeurs(df, col) for col in regle['termes'])
+    ecart = somme - _valeurs(df, regle['total'])
+    masque = np.abs(ecart) > regle.get('tolerance', 0)
+    detail = f"écart max {np.nanmax(np.abs(ecart[masque])):,.0f}" if masque.any() else ''
+    return masque, detail
+
+def verifier_proportion(regle, df, datasets):
+    """
+    Partie égale au pourcentage du total, à l'arrondi du pourcentage (précision)
+    et à la troncature des effectifs (une personne) près
+    """
+    total = _valeurs(df, regle['total'])
+    ecart = np.abs(_valeurs(df, regle['partie']) - total * _valeurs(df, regle['pourcentage']) / 100)
+    masque = ecart > total * regle['precision'] / 200 + 1
+    return masque, _libelles_groupes(df, masque)
+
+def verifier_plage(regle, df, datasets):
+    """
+    Valeurs des colonnes dans [min, max] (bornes facultatives)
+    """
+    masque = np.zeros(len(df), dtype=bool)
+    hors_plage = []
+    for colonne in regle['colonnes']:
+        valeurs = _valeurs(df, colonne)
+        fautives = np.zeros(len(df), dtype=bool)
+        if 'min' in regle:
+            fautives |= valeurs < regle['min']
+        if 'max' in regle:
+            fautives |= valeurs > regle['max']
+        if fautives.any():
+            hors_plage.append(f"{colonne} ∈ [{valeurs[fautives].min():g}, {valeurs[fautives].max():g}]")
+        masque |= fautives
+    return masque, ', '.join(hors_plage)
+
+def verifier_monotone(regle, df, datasets):
+    """
+    Série croissante (ou décroissante) d'une année à l'autre, dans chaque série
+    """
+    codes, _ = _codes_groupes(df)
+    ordre, _ = _ordre_series(df, codes)
+    valeurs, codes = _valeurs(df, regle['colonne'])[ordre], codes[ordre]
+    variations = np.diff(valeurs)
+    if regle.get('sens', 'croissant') == 'decroissant':
+        variations = -variations
+    fautives = (codes[1:] == codes[:-1]) & (variations < 0)
+    masque = np.zeros(len(df), dtype=bool)
+    masque[ordre[1:][fautives]] = True
+    return masque, _libelles_groupes(df, masque)
+
+def verifier_croissance(regle, df, datasets):
+    """
+    Taux de croissance égal, à la tolérance près (en points), à la variation de la série
+    depuis l'année précédente de la même série (annualisée si des années manquent)
+    """
+    codes, _ = _codes_groupes(df)
+    ordre, _ = _ordre_series(df, codes)
+    codes = codes[ordre]
+    serie, taux = _valeurs(df, regle['serie'])[ordre], _valeurs(df, regle['taux'])[ordre]
+    ecarts = np.diff(df['Annee'].to_numpy(dtype=np.float64)[ordre])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        calcule = ((serie[1:] / serie[:-1]) ** (1 / ecarts) - 1) * 100
+    fautives = (codes[1:] == codes[:-1]) & (np.abs(taux[1:] - calcule) > regle['tolerance'])
+    masque = np.zeros(len(df), dtype=bool)
+    masque[ordre[1:][fautives]] = True
+    return masque, _libelles_groupes(df, masque)
+
+def verifier_unique(regle, df, datasets):
+    """
+    Pas de doublon de l'année dans une même série (clés voisines égales une fois triées)
+    """
+    codes, _ = _codes_groupes(df)
+    ordre, cles = _ordre_series(df, codes)
+    masque = np.zeros(len(df), dtype=bool)
+    masque[ordre[1:][cles[1:] == cles[:-1]]] = True
+    return masque, _libelles_groupes(df, masque)
+
+def verifier_somme(regle, df, datasets):
+    """
+    Somme de la colonne, série par série, égale à la valeur attendue (ex. 100 %)
+    """
+    codes, _ = _codes_groupes(df)
+    sommes = np.bincount(codes, weights=np.nan_to_num(_valeurs(df, regle['colonne'])))
+    fautives = np.abs(sommes - regle['attendu']) > regle.get('tolerance', 0)
+    masque = fautives[codes]
+    detail = f"somme {', '.join(f'{s:g}' for s in sommes[fautives][:LIGNES_RAPPORTEES])}" if fautives.any() else ''
+    return masque, detail
+
+def verifier_rapprochement(regle, df, datasets):
+    """
+    Somme de la colonne, série par série, proche de la valeur de référence d'un autre
+    jeu de données pour une année (écart relatif inférieur à la tolérance)
+    """
+    nom_reference, colonne_reference = regle['reference']
+    reference = datasets[nom_reference]
+    annee = regle['annee'] if (reference['Annee'] == regle['annee']).any() else reference['Annee'].max()
+    reference = reference[reference['Annee'] == annee]
+    groupes = [col for col in COLONNES_GROUPE if col in df.columns and col in reference.columns]
+    if groupes:
+        sommes = df.groupby(groupes, observed=True)[regle['colonne']].sum()
+        attendues = reference.groupby(groupes, observed=True)[colonne_reference].sum()
+        ecarts = (sommes / attendues.reindex(sommes.index) - 1).to_numpy(dtype=np.float64)
+        fautives = np.abs(ecarts) > regle['tolerance']
+        masque = df.set_index(groupes).index.isin(sommes.index[fautives])
+        libelles = [f'{cle} ' for cle in sommes.index[fautives]]
+    else:
+        ecarts = np.array([_valeurs(df, regle['colonne']).sum() / _valeurs(reference, colonne_reference).sum() - 1])
+        fautives = np.abs(ecarts) > regle['tolerance']
+        masque = np.full(len(df), fautives[0])
+        libelles = ['']
+    detail = ', '.join(f'{libelle}{ecart:+.1%}' for libelle, ecart
+                       in zip(libelles[:LIGNES_RAPPORTEES], ecarts[fautives]))
+    if detail:
+        detail = f"écart {detail} avec {nom_reference}.{colonne_reference} ({annee})"
+    return masque, detail
+
+def verifier_expression(regle, df, datasets):
+    """
+    Condition vraie sur chaque ligne (expression DataFrame.eval, colonnes à % entre `...`)
+    """
+    masque = ~df.eval(regle['condition']).to_numpy(dtype=bool)
+    return masque, _libelles_groupes(df, masque)
+
+# Type de règle -> fonction de vérification (retourne le masque des lignes en violation)
+VERIFICATIONS = {
+    'identite': verifier_identite,
+    'proportion': verifier_proportion,
+    'plage': verifier_plage,
+    'monotone': verifier_monotone,
+    'croissance': verifier_croissance,
+    'unique': verifier_unique,
+    'somme': verifier_somme,
+    'rapprochement': verifier_rapprochement,
+    'expression': verifier_expression,
+}
+
+def _applicable(regle, datasets):
+    """
+    Vrai si les jeux de données de la règle sont présents (ex. pas de départements hors Bénin)
+    """
+    requis = [regle['dataset']]
+    if 'reference' in regle:
+        requis.append(regle['reference'][0])
+    return all(nom in datasets for nom in requis)
+
+@instrumenter
+def valider(datasets, regles=None):
+    """
+    Évalue les règles sur les jeux de données présents et retourne le rapport :
+    un DataFrame avec une ligne par règle en violation (Regle, Niveau, Dataset,
+    Violations, Lignes, Detail), vide si tout est cohérent
+    """
+    violations = []
+    for nom, regle in (regles or REGLES).items():
+        if not _applicable(regle, datasets):
+            continue
+        df = datasets[regle['dataset']]
+        masque, detail = VERIFICATIONS[regle['type']](regle, df, datasets)
+        if masque.any():
+            lignes = np.flatnonzero(masque)
+            violations.append({
+                'Regle': nom,
+                'Niveau': regle.get('niveau', ERREUR),
+                'Dataset': regle['dataset'],
+                'Violations': len(lignes),
+                'Lignes': df.index[lignes[:LIGNES_RAPPORTEES]].tolist(),
+                'Detail': detail,
+            })
+    return pd.DataFrame(violations, columns=['Regle', 'Niveau', 'Dataset', 'Violations', 'Lignes', 'Detail'])
+
+def afficher_violations(rapport, n_regles=None):
+    """
+    Affiche le rapport de validation
+    """
+    if rapport.empty:
+        print(f"🔎 Validation : {n_regles or len(REGLES)} règles vérifiées, aucune violation\n")
+        return
+    print(f"🔎 Validation : {len(rapport)} règle(s) en violation")
+    for _, ligne in rapport.iterrows():
+        icone = '❌' if ligne['Niveau'] == ERREUR else '⚠️ '
+        suite = '…' if ligne['Violations'] > len(ligne['Lignes']) else ''
+        print(f"   {icone} {ligne['Regle']} ({ligne['Dataset']}) : {ligne['Violations']} ligne(s) "
+              f"{ligne['Lignes']}{suite}" + (f" — {ligne['Detail']}" if ligne['Detail'] else ''))
+    print()
+
+def controler(datasets, regles=None):
+    """
+    Valide les jeux de données, affiche le rapport et lève ValueError
+    si une règle de niveau « erreur » est violée. Retourne le rapport
+    """
+    rapport = valider(datasets, regles)
+    afficher_violations(rapport, len(regles or REGLES))
+    erreurs = rapport[rapport['Niveau'] == ERREUR]
+    if len(erreurs):
+        raise ValueError(f"données incohérentes : {', '.join(erreurs['Regle'])}")
+    return rapport